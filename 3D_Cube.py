@@ -1,48 +1,28 @@
+import struct
 import time
 import math
-import board
+from array import array
 import displayio
-import framebufferio
-import rgbmatrix
+import bitmaps
+import panel
+from framecache import FrameCache
+from warmstart import WarmStart
 
 class RotatingCube:
-    def __init__(self):
-        # Release any resources currently in use.
-        displayio.release_displays()
-
+    def __init__(self, cache=None, size=None, warm_start=None):
         # Display configuration.
-        self.WIDTH = 64
-        self.HEIGHT = 32
-        self.BITMAP_COLORS = 256
+        self.WIDTH, self.HEIGHT = size or (panel.PANEL_WIDTH, panel.PANEL_HEIGHT)
+        self.BITMAP_COLORS = 2  # Background and lines: one bit per pixel.
 
         # Initialize the RGB matrix display.
-        self.matrix = rgbmatrix.RGBMatrix(
-            width=self.WIDTH,
-            height=self.HEIGHT,
-            bit_depth=6,
-            rgb_pins=[
-                board.MTX_R1, board.MTX_G1, board.MTX_B1,
-                board.MTX_R2, board.MTX_G2, board.MTX_B2
-            ],
-            addr_pins=[
-                board.MTX_ADDRA, board.MTX_ADDRB, board.MTX_ADDRC, board.MTX_ADDRD
-            ],
-            clock_pin=board.MTX_CLK,
-            latch_pin=board.MTX_LAT,
-            output_enable_pin=board.MTX_OE,
-            tile=1,
-            serpentine=True,
-            doublebuffer=True,
-        )
-        self.display = framebufferio.FramebufferDisplay(self.matrix, auto_refresh=False)
+        self.matrix, self.display = panel.create_display(self.WIDTH, self.HEIGHT)
 
         # Create a display group and attach a TileGrid.
         self.group = displayio.Group()
         self.display.root_group = self.group
 
         # Create the bitmap and palette.
-        self.bitmap = displayio.Bitmap(self.WIDTH, self.HEIGHT, self.BITMAP_COLORS)
-        self.palette = displayio.Palette(self.BITMAP_COLORS)
+        self.bitmap, self.palette = bitmaps.indexed(self.WIDTH, self.HEIGHT, self.BITMAP_COLORS)
         self.palette[0] = 0x000000  # Black background.
         self.palette[1] = 0xFFFFFF  # White for cube lines.
 
@@ -76,9 +56,22 @@ class RotatingCube:
         self.angle_x = 0.0
         self.angle_y = 0.0
         self.angle_z = 0.0
+        # The animation loops every LOOP_FRAMES frames: each axis makes a whole number
+        # of turns per loop (about 0.03, 0.04 and 0.02 radians per frame), so frames repeat
+        # exactly and can be replayed from a FrameCache instead of being redrawn.
+        self.LOOP_FRAMES = 630
+        self.TURNS = (3, 4, 2)
+        self.frame = 0
+        self.cache = cache
+        self.cache_name = "cube %dx%d" % (self.WIDTH, self.HEIGHT)
+        self.lit = []  # Offsets of the pixels drawn this frame.
+        # Start from the angles shown before a reset, if a snapshot was saved.
+        self.warm_start = warm_start
+        if warm_start:
+            self.resume(warm_start.load())
 
         # Projection parameters.
-        self.scale = 20    # Scaling factor for projection.
+        self.scale = 20 * panel.geometry_scale(self.WIDTH, self.HEIGHT)  # Scaling factor for projection.
         self.distance = 4  # Distance to shift the cube along z-axis.
 
     def rotate_point(self, x, y, z, ax, ay, az):
@@ -120,6 +113,7 @@ class RotatingCube:
         while True:
             if 0 <= x0 < self.WIDTH and 0 <= y0 < self.HEIGHT:
                 self.bitmap[x0, y0] = color
+                self.lit.append(y0 * self.WIDTH + x0)
             if x0 == x1 and y0 == y1:
                 break
             e2 = 2 * err
@@ -130,13 +124,8 @@ class RotatingCube:
                 err += dx
                 y0 += sy
 
-    def update(self):
-        """Clear the screen, update cube rotation, and draw the cube."""
-        # Clear the screen.
-        for x in range(self.WIDTH):
-            for y in range(self.HEIGHT):
-                self.bitmap[x, y] = 0
-
+    def draw_cube(self):
+        """Rotate, project and draw the cube at the current angles."""
         # Rotate and project each cube vertex.
         projected = []
         for vertex in self.cube_vertices:
@@ -151,10 +140,44 @@ class RotatingCube:
             x1, y1 = projected[end]
             self.draw_line(x0, y0, x1, y1, 1)
 
+    def update(self):
+        """Clear the screen, draw (or replay) the cube, and advance the rotation."""
+        # Clear the screen.
+        self.bitmap.fill(0)
+
+        lit = self.cache.get(self.cache_name, self.frame) if self.cache else None
+        if lit is None:
+            self.lit = []
+            self.draw_cube()
+            if self.cache is not None:
+                lit = array("H", sorted(set(self.lit)))
+                self.cache.put(self.cache_name, self.frame, lit, 2 * len(lit))
+        else:
+            # Replay a baked frame: only its lit pixels are written.
+            for i in lit:
+                self.bitmap[i] = 1
+
         # Update rotation angles for continuous rotation.
-        self.angle_x += 0.03
-        self.angle_y += 0.04
-        self.angle_z += 0.02
+        self.set_frame(self.frame + 1)
+
+    def set_frame(self, frame):
+        """Jump to frame of the loop and set the rotation angles for it."""
+        self.frame = frame % self.LOOP_FRAMES
+        turn = 2 * math.pi * self.frame / self.LOOP_FRAMES
+        self.angle_x = self.TURNS[0] * turn
+        self.angle_y = self.TURNS[1] * turn
+        self.angle_z = self.TURNS[2] * turn
+
+    def state(self):
+        """The frame of the loop as bytes, for a WarmStart snapshot."""
+        return struct.pack("<H", self.frame)
+
+    def resume(self, data):
+        """Restore the frame saved by state(); False if data is missing."""
+        if data is None or len(data) != 2:
+            return False
+        self.set_frame(struct.unpack("<H", data)[0])
+        return True
 
     def run(self):
         """Main loop to run the animation."""
@@ -162,7 +185,10 @@ class RotatingCube:
             self.update()
             self.display.refresh(minimum_frames_per_second=60)
             time.sleep(0.02)  # Roughly 50 FPS
+            if self.warm_start:
+                self.warm_start.save_due(self.state)
 
 if __name__ == "__main__":
-    cube = RotatingCube()
+    # Each baked frame takes about 230 bytes with its entry, so the whole loop fits.
+    cube = RotatingCube(warm_start=WarmStart("cube"), cache=FrameCache(160 * 1024))
     cube.run()
@@ -1,113 +1,105 @@
 import time
-import random
-import board
 import displayio
-import framebufferio
-import rgbmatrix
+import bitmaps
+import palettes
+import panel
+from perf import PerfMonitor
+from automaton import Automaton, FireRule
+from dither import TemporalDither
 
 class Fireplace:
-    def __init__(self):
-        # Release any resources currently in use.
-        displayio.release_displays()
-        
+    def __init__(self, render_size=None, size=None, direct=False, bit_depth=6, dither=False):
         # Display configuration.
-        self.WIDTH = 64
-        self.HEIGHT = 32
-        self.BITMAP_COLORS = 256
-
-        # Initialize the RGB matrix display.
-        self.matrix = rgbmatrix.RGBMatrix(
-            width=self.WIDTH,
-            height=self.HEIGHT,
-            bit_depth=6,
-            rgb_pins=[
-                board.MTX_R1, board.MTX_G1, board.MTX_B1,
-                board.MTX_R2, board.MTX_G2, board.MTX_B2,
-            ],
-            addr_pins=[
-                board.MTX_ADDRA, board.MTX_ADDRB, board.MTX_ADDRC, board.MTX_ADDRD,
-            ],
-            clock_pin=board.MTX_CLK,
-            latch_pin=board.MTX_LAT,
-            output_enable_pin=board.MTX_OE,
-            tile=1,
-            serpentine=True,
-            doublebuffer=True,
-        )
-        self.display = framebufferio.FramebufferDisplay(self.matrix, auto_refresh=False)
-        
-        # Create a bitmap and a palette.
-        self.bitmap = displayio.Bitmap(self.WIDTH, self.HEIGHT, self.BITMAP_COLORS)
-        self.palette = displayio.Palette(self.BITMAP_COLORS)
+        self.WIDTH, self.HEIGHT = size or (panel.PANEL_WIDTH, panel.PANEL_HEIGHT)
         # We'll use a fire intensity range of 0 (off) to max_intensity (brightest)
         self.max_intensity = 36
-        
+        self.BITMAP_COLORS = self.max_intensity + 1
+        # The fire is simulated at this resolution and stretched to fill the panel,
+        # e.g. (64, 16) or (32, 16) compute 2x or 4x fewer cells per frame.
+        self.RENDER_WIDTH, self.RENDER_HEIGHT = render_size or (self.WIDTH, self.HEIGHT)
+
+        if direct:
+            # Write the fire straight into the matrix's framebuffer, which also
+            # takes the palette (as native colors) and the display's refresh.
+            self.direct = panel.DirectFramebuffer(
+                self.WIDTH, self.HEIGHT, self.BITMAP_COLORS, bit_depth=bit_depth)
+            self.matrix = self.direct.matrix
+            self.display = self.palette = self.direct
+            self.bitmap = None
+        else:
+            # Initialize the RGB matrix display.
+            self.direct = None
+            self.matrix, self.display = panel.create_display(self.WIDTH, self.HEIGHT, bit_depth=bit_depth)
+
+            # Create a bitmap and a palette.
+            self.bitmap, self.palette = bitmaps.indexed(
+                self.RENDER_WIDTH, self.RENDER_HEIGHT, self.BITMAP_COLORS)
+
+        # At a low bit depth the ramp can be dithered over a few refreshes to look
+        # like 6 bits; colors then go through the dither stage into the palette.
+        self.dither = None
+        colors = self.palette
+        if dither and bit_depth < 6:
+            if direct:
+                raise ValueError("dithering needs the displayio palette")
+            self.dither = colors = TemporalDither(self.palette, bit_depth)
+
         # Build a fire palette:
-        # Map intensity values to colors ranging from black -> deep red -> red -> orange -> yellow -> white.
-        for i in range(self.max_intensity + 1):
-            f = i / self.max_intensity
-            if f <= 0.33:
-                # Ramp red from 0 to 255.
-                r = int(255 * (f / 0.33))
-                g = 0
-                b = 0
-            elif f <= 0.66:
-                # Red is max; ramp green from 0 to 255.
-                r = 255
-                g = int(255 * ((f - 0.33) / 0.33))
-                b = 0
-            else:
-                # Red and green max; ramp blue from 0 to 255.
-                r = 255
-                g = 255
-                b = int(255 * ((f - 0.66) / 0.34))
-            self.palette[i] = (r << 16) | (g << 8) | b
+        # Map intensity values to colors ranging from black -> deep red -> red -> orange -> yellow -> white,
+        # gamma corrected so the dim embers stay dark on the panel.
+        ramp = palettes.ramp(
+            [(0.0, 0x000000), (0.33, 0xFF0000), (0.66, 0xFFFF00), (1.0, 0xFFFFFF)],
+            self.max_intensity + 1)
+        for i, color in enumerate(ramp):
+            colors[i] = color
 
         # Ensure the background (intensity 0) is black.
-        self.palette[0] = 0x000000
+        colors[0] = 0x000000
 
-        # Create a TileGrid for the bitmap and add it to a group.
-        self.tile_grid = displayio.TileGrid(self.bitmap, pixel_shader=self.palette)
-        self.group = displayio.Group()
-        self.group.append(self.tile_grid)
-        self.display.root_group = self.group
+        if not direct:
+            # Create a TileGrid that stretches the bitmap over the panel and add it to a group.
+            self.tile_grid, layer = panel.scaled_group(self.bitmap, self.palette, self.WIDTH, self.HEIGHT)
+            self.group = displayio.Group()
+            self.group.append(layer)
+            self.display.root_group = self.group
 
-        # Create the fire buffer (a 2D list) to hold intensity values.
-        self.fire_buffer = [[0 for _ in range(self.HEIGHT)] for _ in range(self.WIDTH)]
+        # The fire simulation: a grid of intensity values, one per bitmap pixel.
+        self.fire = Automaton(self.RENDER_WIDTH, self.RENDER_HEIGHT, FireRule(self.max_intensity))
 
     def update_fire(self):
-        # Randomize the bottom row to act as the flame source.
-        for x in range(self.WIDTH):
-            # With some randomness, light up the bottom row at full intensity
-            self.fire_buffer[x][self.HEIGHT - 1] = self.max_intensity if random.random() > 0.3 else int(self.max_intensity / 2)
-        
-        # Propagate the fire upward.
-        for y in range(self.HEIGHT - 2, -1, -1):
-            for x in range(self.WIDTH):
-                # Use three pixels from the row below (with wrap-around for horizontal boundaries).
-                left = self.fire_buffer[(x - 1) % self.WIDTH][y + 1]
-                down = self.fire_buffer[x][y + 1]
-                right = self.fire_buffer[(x + 1) % self.WIDTH][y + 1]
-                avg = (left + down + right) // 3
-                decay = random.randint(0, 2)  # Random decay factor.
-                new_intensity = avg - decay
-                if new_intensity < 0:
-                    new_intensity = 0
-                self.fire_buffer[x][y] = new_intensity
+        # Light the bottom row and propagate the fire upward.
+        self.fire.step()
 
     def update_bitmap(self):
-        # Update the display bitmap with the current fire buffer intensities.
-        for x in range(self.WIDTH):
-            for y in range(self.HEIGHT):
-                self.bitmap[x, y] = self.fire_buffer[x][y]
+        # Update the display bitmap with the current fire intensities.
+        if self.direct:
+            self.direct.draw(self.fire.pixels(), self.RENDER_WIDTH, self.RENDER_HEIGHT)
+        else:
+            self.fire.draw(self.bitmap)
+
+    def update(self):
+        """Advance the fire by one frame and copy it to the bitmap."""
+        self.update_fire()
+        self.update_bitmap()
 
     def run(self):
         while True:
-            self.update_fire()
-            self.update_bitmap()
-            self.display.refresh(minimum_frames_per_second=60)
-            time.sleep(0.05)  # About 20 FPS
+            self.update()
+            if self.dither:
+                # Show every frame of the dither cycle within the fire's frame.
+                for _ in range(self.dither.phases):
+                    self.dither.step()
+                    self.display.refresh(minimum_frames_per_second=0)
+                    time.sleep(0.05 / self.dither.phases)
+            else:
+                self.display.refresh(minimum_frames_per_second=60)
+                time.sleep(0.05)  # About 20 FPS
+
+# Show the frame-rate overlay and print per-second timing over serial.
+SHOW_PERF = False
 
 if __name__ == "__main__":
     fire = Fireplace()
+    if SHOW_PERF:
+        fire.display = PerfMonitor(fire.display, deadline_ms=75)
     fire.run()
@@ -0,0 +1,106 @@
+import gc
+import os
+import time
+import displayio
+import gifio
+import panel
+from scheduler import Scheduler, NS_PER_SECOND
+
+class Gallery:
+    def __init__(self, folder="/images", seconds=30, size=None, clock=time.monotonic_ns):
+        # Display configuration.
+        self.WIDTH, self.HEIGHT = size or (panel.PANEL_WIDTH, panel.PANEL_HEIGHT)
+        # Shortest time a GIF frame is shown: many GIFs give a delay of 0,
+        # and decoding a full 64x32 frame takes a few milliseconds anyway.
+        self.MIN_DELAY = 0.02
+
+        # Show every .gif and .bmp in folder in turn, seconds each.
+        self.folder = folder
+        self.files = sorted(name for name in os.listdir(folder)
+                            if name.lower().endswith((".gif", ".bmp")) and not name.startswith("."))
+        if not self.files:
+            raise OSError("no .gif or .bmp files in " + folder)
+        self.seconds = seconds
+
+        # Initialize the RGB matrix display.
+        self.matrix, self.display = panel.create_display(self.WIDTH, self.HEIGHT)
+        self.group = displayio.Group()
+        self.display.root_group = self.group
+
+        # GIF frames and image changes are timed by the scheduler, and the
+        # panel is only refreshed when one of them has changed the picture.
+        self.clock = clock
+        self.scheduler = Scheduler(clock)
+        self.gif = None
+        self.frame_task = None
+        self.frame_due_ns = 0
+        self.changed = False
+        self.show(0)
+        self.scheduler.every(seconds, self.next_image, start=seconds)
+
+    def show(self, position):
+        """Replace the image on the panel with files[position]."""
+        self.position = position % len(self.files)
+        path = self.folder + "/" + self.files[self.position]
+        if self.frame_task:
+            self.frame_task.cancel()
+            self.frame_task = None
+        while len(self.group):
+            self.group.pop()
+        if self.gif:
+            self.gif.deinit()
+            self.gif = None
+        gc.collect()
+
+        # Neither reader loads the image into RAM: OnDiskBitmap reads pixels
+        # from flash as the display draws them, and OnDiskGif decodes one
+        # frame at a time, row by row, into a single RGB565 bitmap, writing
+        # only the region each frame covers.
+        if path.lower().endswith(".gif"):
+            self.gif = gifio.OnDiskGif(path)
+            bitmap = self.gif.bitmap
+            shader = displayio.ColorConverter(input_colorspace=displayio.Colorspace.RGB565_SWAPPED)
+        else:
+            bitmap = displayio.OnDiskBitmap(path)
+            shader = bitmap.pixel_shader
+        # Centered; larger images are cropped by the panel edges.
+        self.group.append(displayio.TileGrid(
+            bitmap, pixel_shader=shader,
+            x=(self.WIDTH - bitmap.width) // 2, y=(self.HEIGHT - bitmap.height) // 2))
+        if self.gif:
+            self.frame_due_ns = self.clock()
+            self.next_gif_frame()
+        self.changed = True
+
+    def next_image(self):
+        self.show(self.position + 1)
+
+    def next_gif_frame(self):
+        """Decode the next GIF frame and schedule the one after for when its delay is up."""
+        delay = self.gif.next_frame()
+        self.changed = True
+        # Delays are counted from when the frame was due, so decode time
+        # doesn't stretch the animation; if it fell behind, don't catch up.
+        self.frame_due_ns += int(max(delay, self.MIN_DELAY) * NS_PER_SECOND)
+        wait = self.frame_due_ns - self.clock()
+        if wait < 0:
+            self.frame_due_ns -= wait
+            wait = 0
+        self.frame_task = self.scheduler.after(wait / NS_PER_SECOND, self.next_gif_frame)
+
+    def update(self):
+        """Run the due frame and image changes; refresh the panel if the picture changed."""
+        self.scheduler.run_pending()
+        if self.changed:
+            self.changed = False
+            self.display.refresh(minimum_frames_per_second=0)
+
+    def run(self):
+        """Main loop: sleep until the next frame or image is due."""
+        while True:
+            self.update()
+            self.scheduler.sleep_until_next()
+
+if __name__ == "__main__":
+    gallery = Gallery()
+    gallery.run()
@@ -1,12 +1,8 @@
-import board
-import busio
+import i2cbus
 
-i2c = busio.I2C(board.SCL, board.SDA)
+# The shared bus is scanned once when it is first taken; the result is cached.
+bus = i2cbus.shared()
 
-while not i2c.try_lock():
-    pass
-
-try:
-    print("I2C addresses found:", [hex(device_address) for device_address in i2c.scan()])
-finally:
-    i2c.unlock()
+print("I2C addresses found:", [hex(device_address) for device_address in bus.addresses])
+for device_address, device in sorted(bus.devices.items()):
+    print("  %s: %s" % (hex(device_address), device.NAME))
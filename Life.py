@@ -0,0 +1,54 @@
+import time
+import displayio
+import panel
+from automaton import Automaton, LifeRule
+
+class GameOfLife:
+    def __init__(self, size=None):
+        # Display configuration.
+        self.WIDTH, self.HEIGHT = size or (panel.PANEL_WIDTH, panel.PANEL_HEIGHT)
+        self.BITMAP_COLORS = 2
+
+        # Initialize the RGB matrix display.
+        self.matrix, self.display = panel.create_display(self.WIDTH, self.HEIGHT)
+
+        # Create a bitmap and palette.
+        self.bitmap = displayio.Bitmap(self.WIDTH, self.HEIGHT, self.BITMAP_COLORS)
+        self.palette = displayio.Palette(self.BITMAP_COLORS)
+        self.palette[0] = 0x000000  # Dead cells: black.
+        self.palette[1] = 0x00FF40  # Live cells: green.
+
+        self.tile_grid = displayio.TileGrid(self.bitmap, pixel_shader=self.palette)
+        self.group = displayio.Group()
+        self.group.append(self.tile_grid)
+        self.display.root_group = self.group
+
+        # The Life grid, one bit per cell, on a wrapping board.
+        self.life = Automaton(self.WIDTH, self.HEIGHT, LifeRule())
+        self.MAX_GENERATIONS = 1000  # Start over after this many generations.
+        self.reseed()
+
+    def reseed(self):
+        """Start a new random board."""
+        self.life.rule.randomize(self.life.cells, density=0.3)
+        self.generation = 0
+
+    def update(self):
+        """Advance one generation, starting over once the board stops changing."""
+        self.life.step()
+        self.generation += 1
+        # A board that stopped changing has settled; oscillators run out the clock.
+        if self.life.cells == self.life.back or self.generation >= self.MAX_GENERATIONS:
+            self.reseed()
+        self.life.draw(self.bitmap)
+
+    def run(self):
+        """Main loop: step the board and refresh the display."""
+        while True:
+            self.update()
+            self.display.refresh(minimum_frames_per_second=60)
+            time.sleep(0.05)  # About 20 FPS
+
+if __name__ == "__main__":
+    life = GameOfLife()
+    life.run()
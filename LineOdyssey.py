@@ -1,56 +1,61 @@
+import struct
 import time
 import math
-import board
+from array import array
 import displayio
-import framebufferio
-import rgbmatrix
+import bitmaps
+import palettes
+import panel
+from framecache import FrameCache
+from warmstart import WarmStart
+
+# The wave surface is computed with array math when ulab (on the board) or
+# NumPy (on a desktop) is available, and from sine tables otherwise.
+try:
+    from ulab import numpy as np
+except ImportError:
+    try:
+        import numpy as np
+    except ImportError:
+        np = None
 
 class LineOdyssey:
-    def __init__(self):
-        # Release any resources currently in use.
-        displayio.release_displays()
-        
+    def __init__(self, cache=None, size=None, warm_start=None, wave=False, grid=8, vectorized=None):
         # Display configuration.
-        self.WIDTH = 64
-        self.HEIGHT = 32
-        self.BITMAP_COLORS = 256
+        self.WIDTH, self.HEIGHT = size or (panel.PANEL_WIDTH, panel.PANEL_HEIGHT)
+        # With wave=True the grid becomes a rippling surface, its lines shaded
+        # from dim (far) to bright (near) through DEPTH_LEVELS colors.
+        self.wave = wave
+        self.DEPTH_LEVELS = 7
+        if wave:
+            if cache is not None:
+                raise ValueError("the frame cache only holds the flat grid")
+            self.BITMAP_COLORS = self.DEPTH_LEVELS + 1
+        else:
+            self.BITMAP_COLORS = 2  # Background and lines: one bit per pixel.
 
         # Initialize the RGB matrix display.
-        self.matrix = rgbmatrix.RGBMatrix(
-            width=self.WIDTH,
-            height=self.HEIGHT,
-            bit_depth=6,
-            rgb_pins=[
-                board.MTX_R1, board.MTX_G1, board.MTX_B1,
-                board.MTX_R2, board.MTX_G2, board.MTX_B2
-            ],
-            addr_pins=[
-                board.MTX_ADDRA, board.MTX_ADDRB, board.MTX_ADDRC, board.MTX_ADDRD
-            ],
-            clock_pin=board.MTX_CLK,
-            latch_pin=board.MTX_LAT,
-            output_enable_pin=board.MTX_OE,
-            tile=1,
-            serpentine=True,
-            doublebuffer=True,
-        )
-        self.display = framebufferio.FramebufferDisplay(self.matrix, auto_refresh=False)
+        self.matrix, self.display = panel.create_display(self.WIDTH, self.HEIGHT)
         
         # Create a bitmap and palette.
-        self.bitmap = displayio.Bitmap(self.WIDTH, self.HEIGHT, self.BITMAP_COLORS)
-        self.palette = displayio.Palette(self.BITMAP_COLORS)
+        self.bitmap, self.palette = bitmaps.indexed(self.WIDTH, self.HEIGHT, self.BITMAP_COLORS)
         self.palette[0] = 0x000000  # Black background.
         self.palette[1] = 0xFFFFFF  # White for the lines.
+        if wave:
+            ramp = palettes.ramp([(0.0, 0x002060), (0.6, 0x00A0FF), (1.0, 0xFFFFFF)], self.DEPTH_LEVELS)
+            for i, color in enumerate(ramp):
+                self.palette[i + 1] = color
 
         self.tile_grid = displayio.TileGrid(self.bitmap, pixel_shader=self.palette)
         self.group = displayio.Group()
         self.group.append(self.tile_grid)
         self.display.root_group = self.group
 
-        # Create a grid of 3D points.
-        # We'll use an 8x8 grid.
-        self.rows = 8
-        self.cols = 8
+        # Create a grid of 3D points: grid x grid of them, 8x8 by default.
+        if not 2 <= grid <= 32:
+            raise ValueError("grid must be 2 to 32 points across")
+        self.rows = grid
+        self.cols = grid
         # Define the grid dimensions in 3D space.
         self.grid_width = 8   # x spans from -grid_width/2 to grid_width/2
         self.grid_height = 8  # y spans similarly
@@ -59,19 +64,32 @@ class LineOdyssey:
         # The grid initially lies on the z=0 plane.
         
         # Projection parameters.
-        self.scale = 30       # Scaling factor for projection.
+        self.scale = 30 * panel.geometry_scale(self.WIDTH, self.HEIGHT)  # Scaling factor for projection.
         self.distance = 10    # Translate z to avoid division by zero.
 
         # Initial rotation angles.
         self.angle_x = 0.0
         self.angle_y = 0.0
         self.angle_z = 0.0
+        # The animation loops every LOOP_FRAMES frames: each axis makes a whole number
+        # of turns per loop (about 0.03, 0.02 and 0.01 radians per frame), so frames repeat
+        # exactly and can be replayed from a FrameCache instead of being redrawn.
+        self.LOOP_FRAMES = 630
+        self.TURNS = (3, 2, 1)
+        self.frame = 0
+        self.cache = cache
+        self.cache_name = "odyssey %dx%d" % (self.WIDTH, self.HEIGHT)
+        self.lit = []  # Offsets of the pixels drawn this frame.
+        if wave:
+            self.setup_wave(np is not None if vectorized is None else vectorized)
+        # Start from the angles shown before a reset, if a snapshot was saved.
+        self.warm_start = warm_start
+        if warm_start:
+            self.resume(warm_start.load())
 
     def clear_bitmap(self):
         """Clear the entire bitmap to the background color."""
-        for x in range(self.WIDTH):
-            for y in range(self.HEIGHT):
-                self.bitmap[x, y] = 0
+        self.bitmap.fill(0)
 
     def rotate_point(self, x, y, z, ax, ay, az):
         """Rotate a 3D point (x, y, z) around the x, y, and z axes."""
@@ -110,8 +128,10 @@ class LineOdyssey:
         sy = 1 if y0 < y1 else -1
         err = dx + dy
         while True:
-            if 0 <= x0 < self.WIDTH and 0 <= y0 < self.HEIGHT:
+            # Where lines cross, the brighter (on the surface, nearer) one stays on top.
+            if 0 <= x0 < self.WIDTH and 0 <= y0 < self.HEIGHT and color > self.bitmap[x0, y0]:
                 self.bitmap[x0, y0] = color
+                self.lit.append(y0 * self.WIDTH + x0)
             if x0 == x1 and y0 == y1:
                 break
             e2 = 2 * err
@@ -122,10 +142,8 @@ class LineOdyssey:
                 err += dx
                 y0 += sy
 
-    def update(self):
-        """Update the grid's rotation and redraw the wireframe grid."""
-        self.clear_bitmap()
-        
+    def draw_grid(self):
+        """Rotate, project and draw the wireframe grid at the current angles."""
         # Create a 2D array to hold the projected points.
         points = [[None for _ in range(self.cols)] for _ in range(self.rows)]
         
@@ -155,11 +173,173 @@ class LineOdyssey:
                 x0, y0 = points[i][j]
                 x1, y1 = points[i + 1][j]
                 self.draw_line(x0, y0, x1, y1)
-        
-        # Increment rotation angles for continuous animation.
-        self.angle_x += 0.03
-        self.angle_y += 0.02
-        self.angle_z += 0.01
+
+    def setup_wave(self, vectorized):
+        """Precompute what the wave surface needs each frame: sine tables, or arrays if vectorized."""
+        if vectorized and np is None:
+            raise ValueError("vectorized needs ulab or NumPy")
+        self.vectorized = vectorized
+        # The height of each point is the sum of three sine waves, running
+        # along x, along y and diagonally. A wave's value at a point is
+        # sine(step of the point + phase), with steps counted in 1/SINE_STEPS
+        # of a cycle: the point's step is fixed by its position and the
+        # phase by the frame. Each wave makes a whole number of cycles per
+        # loop, so the surface loops with the rotation.
+        self.SINE_STEPS = 256
+        self.WAVE_HEIGHT = 0.5          # Of each wave, in grid units.
+        self.WAVE_STEPS = (40, 56, 28)  # Steps per grid unit along x, y and the diagonal.
+        self.WAVE_TURNS = (5, -4, 3)    # Cycles of each wave per loop.
+        # Farthest a point can be from the center, for the depth shading.
+        self.reach = math.sqrt((self.grid_width / 2) ** 2 + (self.grid_height / 2) ** 2) + 3 * self.WAVE_HEIGHT
+        n = self.cols
+        self.xs = [-self.grid_width / 2 + j * self.x_spacing for j in range(n)]
+        self.ys = [-self.grid_height / 2 + i * self.y_spacing for i in range(n)]
+        kx, ky, kd = self.WAVE_STEPS
+        self.x_steps = [round(x * kx) for x in self.xs]
+        self.y_steps = [round(y * ky) for y in self.ys]
+        # x + y is the same along each diagonal (i + j) of the square grid.
+        self.diagonal_steps = [round((self.xs[0] + self.ys[0] + k * self.x_spacing) * kd)
+                               for k in range(2 * n - 1)]
+        # Projected points and their depth level (1 far to DEPTH_LEVELS near), row by row.
+        self.px = [0] * (n * n)
+        self.py = [0] * (n * n)
+        self.level = [0] * (n * n)
+        if vectorized:
+            # Every point's position and steps as flat arrays, row by row.
+            self.grid_x = np.array([x for _ in self.ys for x in self.xs])
+            self.grid_y = np.array([y for y in self.ys for _ in self.xs])
+            self.grid_x_steps = np.array([s for _ in self.ys for s in self.x_steps])
+            self.grid_y_steps = np.array([s for s in self.y_steps for _ in self.xs])
+            self.grid_diagonal_steps = np.array(
+                [self.diagonal_steps[i + j] for i in range(n) for j in range(n)])
+        else:
+            self.sine = array("f", [self.WAVE_HEIGHT * math.sin(2 * math.pi * k / self.SINE_STEPS)
+                                    for k in range(self.SINE_STEPS)])
+
+    def wave_phases(self):
+        """The phase, in sine steps, of each wave at the current frame."""
+        return [turns * self.frame * self.SINE_STEPS // self.LOOP_FRAMES for turns in self.WAVE_TURNS]
+
+    def rotation(self):
+        """The rotation matrix for the current angles, as columns: where x, y and z end up."""
+        return (self.rotate_point(1, 0, 0, self.angle_x, self.angle_y, self.angle_z),
+                self.rotate_point(0, 1, 0, self.angle_x, self.angle_y, self.angle_z),
+                self.rotate_point(0, 0, 1, self.angle_x, self.angle_y, self.angle_z))
+
+    def surface_from_tables(self):
+        """Rotate and project the surface's points, with heights from the sine tables."""
+        (m00, m10, m20), (m01, m11, m21), (m02, m12, m22) = self.rotation()
+        mask = self.SINE_STEPS - 1
+        sine = self.sine
+        phase_x, phase_y, phase_diagonal = self.wave_phases()
+        # The three waves only vary along a column, a row or a diagonal, and
+        # the rotation of x and y only along a column or a row, so each is
+        # computed once per line of points, not once per point.
+        column_z = [sine[(s + phase_x) & mask] for s in self.x_steps]
+        row_z = [sine[(s + phase_y) & mask] for s in self.y_steps]
+        diagonal_z = [sine[(s + phase_diagonal) & mask] for s in self.diagonal_steps]
+        column_x = [m00 * x for x in self.xs]
+        column_y = [m10 * x for x in self.xs]
+        column_depth = [m20 * x for x in self.xs]
+        half_width = self.WIDTH / 2
+        half_height = self.HEIGHT / 2
+        scale = self.scale
+        distance = self.distance
+        reach = self.reach
+        levels = self.DEPTH_LEVELS
+        level_scale = levels / (2 * reach)
+        px, py, level = self.px, self.py, self.level
+        n = self.cols
+        k = 0
+        for i in range(n):
+            y = self.ys[i]
+            row_x, row_y, row_depth = m01 * y, m11 * y, m21 * y
+            height = row_z[i]
+            for j in range(n):
+                z = column_z[j] + height + diagonal_z[i + j]
+                depth = column_depth[j] + row_depth + m22 * z
+                factor = scale / (depth + distance)
+                px[k] = int((column_x[j] + row_x + m02 * z) * factor + half_width)
+                py[k] = int(-(column_y[j] + row_y + m12 * z) * factor + half_height)
+                shade = int((reach - depth) * level_scale) + 1
+                level[k] = shade if shade < levels else levels
+                k += 1
+
+    def surface_vectorized(self):
+        """Rotate and project the surface's points as whole arrays with ulab or NumPy."""
+        (m00, m10, m20), (m01, m11, m21), (m02, m12, m22) = self.rotation()
+        phase_x, phase_y, phase_diagonal = self.wave_phases()
+        step = 2 * math.pi / self.SINE_STEPS
+        z = (np.sin((self.grid_x_steps + phase_x) * step)
+             + np.sin((self.grid_y_steps + phase_y) * step)
+             + np.sin((self.grid_diagonal_steps + phase_diagonal) * step)) * self.WAVE_HEIGHT
+        x, y = self.grid_x, self.grid_y
+        depth = x * m20 + y * m21 + z * m22
+        factor = self.scale / (depth + self.distance)
+        self.px = np.array((x * m00 + y * m01 + z * m02) * factor + self.WIDTH / 2, dtype=np.int16).tolist()
+        self.py = np.array(self.HEIGHT / 2 - (x * m10 + y * m11 + z * m12) * factor, dtype=np.int16).tolist()
+        shade = (self.reach - depth) * (self.DEPTH_LEVELS / (2 * self.reach)) + 1
+        self.level = np.array(np.clip(shade, 1, self.DEPTH_LEVELS), dtype=np.uint8).tolist()
+
+    def draw_surface(self):
+        """Compute the wave surface at the current frame and draw it, shaded by depth."""
+        if self.vectorized:
+            self.surface_vectorized()
+        else:
+            self.surface_from_tables()
+        px, py, level = self.px, self.py, self.level
+        n = self.cols
+        for i in range(n):
+            for j in range(n):
+                a = i * n + j
+                if j < n - 1:
+                    self.draw_line(px[a], py[a], px[a + 1], py[a + 1], (level[a] + level[a + 1] + 1) >> 1)
+                if i < n - 1:
+                    self.draw_line(px[a], py[a], px[a + n], py[a + n], (level[a] + level[a + n] + 1) >> 1)
+
+    def update(self):
+        """Update the grid's rotation and redraw (or replay) the wireframe grid."""
+        self.clear_bitmap()
+
+        if self.wave:
+            self.lit = []
+            self.draw_surface()
+            self.set_frame(self.frame + 1)
+            return
+
+        lit = self.cache.get(self.cache_name, self.frame) if self.cache else None
+        if lit is None:
+            self.lit = []
+            self.draw_grid()
+            if self.cache is not None:
+                lit = array("H", sorted(set(self.lit)))
+                self.cache.put(self.cache_name, self.frame, lit, 2 * len(lit))
+        else:
+            # Replay a baked frame: only its lit pixels are written.
+            for i in lit:
+                self.bitmap[i] = 1
+
+        # Advance the rotation angles for continuous animation.
+        self.set_frame(self.frame + 1)
+
+    def set_frame(self, frame):
+        """Jump to frame of the loop and set the rotation angles for it."""
+        self.frame = frame % self.LOOP_FRAMES
+        turn = 2 * math.pi * self.frame / self.LOOP_FRAMES
+        self.angle_x = self.TURNS[0] * turn
+        self.angle_y = self.TURNS[1] * turn
+        self.angle_z = self.TURNS[2] * turn
+
+    def state(self):
+        """The frame of the loop as bytes, for a WarmStart snapshot."""
+        return struct.pack("<H", self.frame)
+
+    def resume(self, data):
+        """Restore the frame saved by state(); False if data is missing."""
+        if data is None or len(data) != 2:
+            return False
+        self.set_frame(struct.unpack("<H", data)[0])
+        return True
 
     def run(self):
         """Main loop: update the grid and refresh the display."""
@@ -167,7 +347,16 @@ class LineOdyssey:
             self.update()
             self.display.refresh(minimum_frames_per_second=60)
             time.sleep(0.02)  # Roughly 50 FPS
+            if self.warm_start:
+                self.warm_start.save_due(self.state)
+
+# Show the rippling, depth-shaded surface instead of the flat grid.
+WAVES = False
 
 if __name__ == "__main__":
-    odyssey = LineOdyssey()
+    if WAVES:
+        odyssey = LineOdyssey(warm_start=WarmStart("odyssey"), wave=True, grid=16)
+    else:
+        # Each baked frame takes about 460 bytes with its entry, so the whole loop fits.
+        odyssey = LineOdyssey(warm_start=WarmStart("odyssey"), cache=FrameCache(320 * 1024))
     odyssey.run()
@@ -1,22 +1,39 @@
 # Temperature Display with Degree Circle on MatrixPortal S3
 # This program reads the temperature from the MCP9808 sensor and displays
 # it in Fahrenheit on a 64x32 RGB matrix. A small degree circle (°) is
-# drawn next to the last digit. The display is rotated 180 degrees, and
-# the program updates the temperature every second.
+# shown next to the last digit, and a trend graph of the last 16 minutes
+# scrolls along the bottom of the panel. The display is rotated 180 degrees.
 
-import time
 import displayio
-import board
-import busio
 from adafruit_matrixportal.matrix import Matrix
 from adafruit_display_text import label
 import terminalio
-import adafruit_mcp9808
+import i2cbus
+from ringbuffer import SampleRing
+from scheduler import Scheduler
+from sparkline import Sparkline
+from sprites import Sprite
 
 # About:
 # - The MatrixPortal S3 is used to display the temperature in Fahrenheit.
-# - A degree symbol is manually drawn as a small circle next to the temperature.
-# - The program updates the temperature from the MCP9808 sensor every second.
+# - A degree symbol is drawn once as a small circle sprite and moved next to
+#   the temperature, so the old circle never has to be erased.
+# - The label is only changed when the shown text changes, and the panel is
+#   only refreshed after something on it changed.
+# - The sensor is read once a second by a scheduled task; the main loop never
+#   blocks on the sensor, so other tasks (like the optional blink of the newest
+#   graph point) run in between.
+# - The sensor is found and read through the shared I2C bus (i2cbus.py), in one
+#   batch with any other sensors on the bus.
+# - Readings go into fixed-size ring buffers, so memory use never grows.
+
+# Timing
+SAMPLE_SECONDS = 1                          # How often the sensor is read
+GRAPH_MINUTES = 16                          # Time span of the trend graph
+GRAPH_WIDTH = 64
+COLUMN_SECONDS = GRAPH_MINUTES * 60 // GRAPH_WIDTH  # Readings averaged per graph column
+BLINK_SECONDS = 0                           # Blink rate of the newest graph point (0 for none; each blink is a refresh)
+DEGREE_RADIUS = 2                           # Radius of the degree circle
 
 # Initialize the matrix and display
 matrix = Matrix(width=64, height=32, bit_depth=4)
@@ -25,61 +42,125 @@ display = matrix.display
 # Set rotation to 180 degrees for proper orientation
 display.rotation = 180
 
-# Create a bitmap for the screen (64x32 resolution, 2 color options)
-bitmap = displayio.Bitmap(64, 32, 2)
+# Refresh only when something changed (see refresh_if_changed)
+display.auto_refresh = False
 
-# Create a palette with two colors: black (background) and white (text/circle)
+# Create a palette with two colors: transparent (around the circle) and white
 palette = displayio.Palette(2)
-palette[0] = 0x000000  # Black background
-palette[1] = 0xFFFFFF  # White text and degree circle
+palette[0] = 0x000000
+palette.make_transparent(0)
+palette[1] = 0xFFFFFF  # White degree circle
 
-# Create TileGrid to display the bitmap and add it to the display group
-tile_grid = displayio.TileGrid(bitmap, pixel_shader=palette)
 group = displayio.Group()
-group.append(tile_grid)
 display.root_group = group  # Set the group as the root display group
 
-# Initialize I2C and MCP9808 temperature sensor
-i2c = busio.I2C(board.SCL, board.SDA)
-mcp9808 = adafruit_mcp9808.MCP9808(i2c)
+# Find the MCP9808 temperature sensor on the shared I2C bus
+bus = i2cbus.shared()
+mcp9808 = bus.device("MCP9808")
+if mcp9808 is None:
+    raise RuntimeError("No MCP9808 found; I2C addresses: %s" % [hex(a) for a in bus.addresses])
 
-# Label to display the temperature in Fahrenheit
-temp_label = label.Label(terminalio.FONT, text="00.0", color=0xFFFFFF, scale=2, x=0, y=16)
+# Label to display the temperature in Fahrenheit (top part of the panel)
+temp_label = label.Label(terminalio.FONT, text="00.0", color=0xFFFFFF, scale=2, x=0, y=10)
 
 # Add the temperature label to the display group
 group.append(temp_label)
 
-def draw_degree_circle(x, y):
-    """Draw a small degree circle (°) next to the temperature."""
-    radius = 2  # Set the radius of the degree circle
-    for x_offset in range(-radius, radius + 1):
-        for y_offset in range(-radius, radius + 1):
-            # Ensure the pixel falls within the circle radius
-            if x_offset ** 2 + y_offset ** 2 <= radius ** 2:
-                # Draw the circle only if the coordinates are within display bounds
-                if 0 <= x + x_offset < 64 and 0 <= y + y_offset < 32:
-                    bitmap[x + x_offset, y + y_offset] = 1  # Draw white circle
-
-def update_temperature():
-    """Read the temperature from the MCP9808 sensor and display it in Fahrenheit."""
-    # Read temperature in Celsius and convert to Fahrenheit
-    temp_celsius = mcp9808.temperature
-    temp_fahrenheit = temp_celsius * 9 / 5 + 32
+def degree_circle_rows(radius):
+    """Rows of palette indices for a small filled degree circle (°)."""
+    size = 2 * radius + 1
+    return [
+        [1 if (x - radius) ** 2 + (y - radius) ** 2 <= radius ** 2 else 0 for x in range(size)]
+        for y in range(size)
+    ]
+
+# Degree circle sprite, drawn once and moved along with the text
+degree = Sprite(palette, rows=degree_circle_rows(DEGREE_RADIUS))
+group.append(degree.tile_grid)
+
+# Trend graph along the bottom rows: one column per COLUMN_SECONDS of readings
+graph = Sparkline(GRAPH_WIDTH, 9, y=23)
+group.append(graph.group)
+
+# Readings of the graph column being built; their moving average becomes the column
+recent = SampleRing(COLUMN_SECONDS // SAMPLE_SECONDS)
+
+# Text currently on the label, and whether the panel needs a refresh
+shown_text = None
+needs_refresh = True
+
+def read_temperature(readings):
+    """The MCP9808's temperature in Fahrenheit from a batch of bus readings, or None if it failed."""
+    temp_celsius = readings.get(mcp9808.address)
+    if temp_celsius is None:
+        return None
+    return temp_celsius * 9 / 5 + 32
+
+def update_temperature(temp_fahrenheit):
+    """Display a temperature in Fahrenheit; readings that look the same cost nothing."""
+    global shown_text, needs_refresh
     # Format the temperature string without the degree symbol
     temp_text = f"{temp_fahrenheit:.1f}"
+    if temp_text == shown_text:
+        return
+    shown_text = temp_text
     # Update the label with the new temperature text
     temp_label.text = temp_text
 
-    # Center the temperature text horizontally
-    temp_label.x = (64 - len(temp_text) * 12) // 2
+    # Center the temperature text horizontally; it only moves when its length changes
+    text_x = (64 - len(temp_text) * 12) // 2
+    if temp_label.x != text_x:
+        temp_label.x = text_x
+
+    # Keep the degree circle next to the last digit of the temperature
+    circle_x = text_x + len(temp_text) * 12 + 4  # Slightly to the right of the last digit
+    circle_y = temp_label.y - 8  # Slightly above the temperature text
+    degree.move_to(circle_x - DEGREE_RADIUS, circle_y - DEGREE_RADIUS)
+    needs_refresh = True
+
+def sample_temperature(readings):
+    """Called after each batch of bus reads: remember the reading and show it."""
+    temp_fahrenheit = read_temperature(readings)
+    if temp_fahrenheit is None:
+        return  # The read failed; skip this sample rather than repeat an old one.
+    recent.append(temp_fahrenheit)
+    update_temperature(temp_fahrenheit)
+
+def add_graph_column():
+    """Scheduled task: add the average of the latest readings to the graph."""
+    global needs_refresh
+    if len(recent):
+        graph.push(recent.mean)
+        needs_refresh = True
+
+def blink_newest_point():
+    """Scheduled task: blink the newest point of the graph."""
+    global needs_refresh
+    graph.palette[3] = 0x404040 if graph.palette[3] == 0xFFFFFF else 0xFFFFFF
+    needs_refresh = True
+
+def refresh_if_changed():
+    """Refresh the panel if anything on it changed since the last refresh."""
+    global needs_refresh
+    if needs_refresh:
+        display.refresh()
+        needs_refresh = False
+
+def start_tasks(scheduler):
+    """Register the sensor, graph and blink tasks with a scheduler."""
+    bus.read_every(scheduler, SAMPLE_SECONDS, sample_temperature)
+    scheduler.every(COLUMN_SECONDS, add_graph_column, start=COLUMN_SECONDS)
+    if BLINK_SECONDS:
+        scheduler.every(BLINK_SECONDS, blink_newest_point)
 
-    # Draw the degree circle next to the last digit of the temperature
-    circle_x = temp_label.x + len(temp_text) * 12 + 4  # Place the circle slightly to the right of the last digit
-    circle_y = temp_label.y - 8  # Position the circle slightly above the temperature text
-    draw_degree_circle(circle_x, circle_y)
+def main():
+    scheduler = Scheduler()
+    start_tasks(scheduler)
+    # Main loop: run whatever is due, refresh if needed, and sleep until the next task
+    while True:
+        scheduler.run_pending()
+        refresh_if_changed()
+        scheduler.sleep_until_next()
 
-# Main loop: Update the temperature and refresh the display every second
-while True:
-    update_temperature()  # Read and display the updated temperature
-    display.refresh()     # Refresh the display to show the updated content
-    time.sleep(1)         # Wait for 1 second before the next update
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+import displayio
+import usb_cdc
+import panel
+from framelink import FrameReceiver
+
+# Shows frames rendered on a host and streamed with host/offload.py.
+# The frames arrive on the second USB serial channel, which CircuitPython only
+# creates when boot.py asks for it:
+#     import usb_cdc
+#     usb_cdc.enable(console=True, data=True)
+
+class Offload:
+    def __init__(self, port=None, size=None):
+        # Display configuration.
+        self.WIDTH, self.HEIGHT = size or (panel.PANEL_WIDTH, panel.PANEL_HEIGHT)
+        self.BITMAP_COLORS = 256
+
+        # Initialize the RGB matrix display.
+        self.matrix, self.display = panel.create_display(self.WIDTH, self.HEIGHT)
+        self.group = displayio.Group()
+        self.display.root_group = self.group
+
+        if port is None:
+            port = usb_cdc.data
+            if port is None:
+                raise RuntimeError("enable the usb_cdc data channel in boot.py")
+            port.timeout = 0  # Never block waiting for a frame.
+        self.receiver = FrameReceiver(port, self.resize, (self.WIDTH, self.HEIGHT))
+
+    def resize(self, width, height):
+        """Start a blank bitmap for width x height frames, stretched to fill the panel."""
+        while len(self.group):
+            self.group.pop()
+        self.bitmap = None  # Free the old bitmap before allocating the new one.
+        bitmap = displayio.Bitmap(width, height, self.BITMAP_COLORS)
+        palette = displayio.Palette(self.BITMAP_COLORS)
+        self.tile_grid, layer = panel.scaled_group(bitmap, palette, self.WIDTH, self.HEIGHT)
+        self.group.append(layer)
+        self.bitmap = bitmap
+        return bitmap, palette
+
+    def update(self):
+        """Apply every frame that has arrived; True when there is a new frame to show."""
+        return self.receiver.poll()
+
+    def run(self):
+        """Main loop: show the newest frame as soon as it is complete."""
+        while True:
+            if self.update():
+                self.display.refresh(minimum_frames_per_second=0)
+
+if __name__ == "__main__":
+    offload = Offload()
+    offload.run()
@@ -0,0 +1,48 @@
+import time
+import displayio
+import panel
+from framestream import FramePlayer, stream_size
+
+class Playback:
+    def __init__(self, path="cube.frs", size=None):
+        # Display configuration.
+        self.WIDTH, self.HEIGHT = size or (panel.PANEL_WIDTH, panel.PANEL_HEIGHT)
+        self.BITMAP_COLORS = 256
+        # Recorded with host/recorder.py; reduced-resolution recordings are stretched.
+        self.RENDER_WIDTH, self.RENDER_HEIGHT = stream_size(path)
+
+        # Initialize the RGB matrix display.
+        self.matrix, self.display = panel.create_display(self.WIDTH, self.HEIGHT)
+
+        # Create a bitmap and palette; the stream sets the colors itself.
+        self.bitmap = displayio.Bitmap(self.RENDER_WIDTH, self.RENDER_HEIGHT, self.BITMAP_COLORS)
+        self.palette = displayio.Palette(self.BITMAP_COLORS)
+
+        self.tile_grid, layer = panel.scaled_group(self.bitmap, self.palette, self.WIDTH, self.HEIGHT)
+        self.group = displayio.Group()
+        self.group.append(layer)
+        self.display.root_group = self.group
+
+        # Frames are read from flash one at a time, and only changed pixels are written.
+        self.player = FramePlayer(path, self.bitmap, self.palette)
+
+    def update(self):
+        """Show the next recorded frame; False once a non-looping stream ends."""
+        return self.player.next_frame()
+
+    def run(self):
+        """Main loop: play frames at the rate they were recorded at."""
+        frame_ns = self.player.frame_ms * 1000000
+        next_ns = time.monotonic_ns()
+        while self.update():
+            self.display.refresh(minimum_frames_per_second=0)
+            next_ns += frame_ns
+            wait = next_ns - time.monotonic_ns()
+            if wait > 0:
+                time.sleep(wait / 1000000000)
+            else:
+                next_ns = time.monotonic_ns()  # Running late: don't try to catch up.
+
+if __name__ == "__main__":
+    playback = Playback()
+    playback.run()
@@ -0,0 +1,97 @@
+import gc
+import time
+import buttons
+from scheduler import Scheduler, NS_PER_SECOND
+
+
+def step_update(scene, seconds):
+    scene.update()
+
+
+def step_wanderers(scene, seconds):
+    scene.update_particles()
+    scene.draw_particles()
+
+
+def step_pong(scene, seconds):
+    scene.step()
+    scene.draw_paddles()
+    scene.draw_ball()
+
+
+# module, class, seconds per frame, step(scene, seconds shown) for one frame.
+SCENES = (
+    ("FirePlace", "Fireplace", 0.05, step_update),
+    ("Ripple", "WaterRipples", 0.02, step_update),
+    ("3D_Cube", "RotatingCube", 0.02, step_update),
+    ("LineOdyssey", "LineOdyssey", 0.02, step_update),
+    ("Solar", "SolarSystemSimulator", 0.02, step_update),
+    ("Wanderers", "CosmicWanderers", 0.02, step_wanderers),
+    ("Pong", "PongGame", 0.02, step_pong),
+    ("Life", "GameOfLife", 0.05, step_update),
+)
+
+class Playlist:
+    def __init__(self, scenes=SCENES, seconds=60, controls=None, clock=time.monotonic_ns):
+        # Show each scene for seconds, then the next. DOWN skips to the next
+        # scene and UP goes back one; either restarts the countdown.
+        self.scenes = scenes
+        self.seconds = seconds
+        self.controls = controls if controls is not None else buttons.Buttons()
+        self.clock = clock
+        self.scheduler = Scheduler(clock)
+        self.scene = None
+        self.position = 0
+        self.show(0)
+        self.advance = self.scheduler.every(seconds, self.next_scene, start=seconds)
+
+    def show(self, position):
+        """Replace the scene on the panel with scenes[position]."""
+        self.position = position % len(self.scenes)
+        module, name, frame_seconds, step = self.scenes[self.position]
+        # Free the old scene's bitmaps before the new one allocates its own;
+        # the new scene's display releases the old one.
+        self.scene = None
+        gc.collect()
+        self.scene = getattr(__import__(module), name)()
+        self.frame_ns = int(frame_seconds * NS_PER_SECOND)
+        self.step = step
+        self.shown_ns = self.clock()
+
+    def next_scene(self):
+        self.show(self.position + 1)
+
+    def handle_buttons(self):
+        """Switch scenes for the buttons pressed since the last frame."""
+        pressed = self.controls.poll()
+        if not pressed:
+            return
+        if pressed & (1 << buttons.DOWN):
+            self.show(self.position + 1)
+        else:
+            self.show(self.position - 1)
+        self.advance.cancel()
+        self.advance = self.scheduler.every(self.seconds, self.next_scene, start=self.seconds)
+
+    def frame(self):
+        """Handle input and timers, then draw and show one frame of the current scene."""
+        self.handle_buttons()
+        self.scheduler.run_pending()
+        self.step(self.scene, (self.clock() - self.shown_ns) / NS_PER_SECOND)
+        self.scene.display.refresh(minimum_frames_per_second=0)
+
+    def run(self):
+        """Main loop: one frame per scene frame time, sleeping in between."""
+        next_ns = self.clock()
+        while True:
+            self.frame()
+            next_ns += self.frame_ns
+            wait = next_ns - self.clock()
+            if wait > 0:
+                time.sleep(wait / NS_PER_SECOND)
+            else:
+                next_ns = self.clock()  # Running behind: don't try to catch up.
+
+if __name__ == "__main__":
+    playlist = Playlist()
+    playlist.run()
@@ -1,51 +1,36 @@
+import struct
 import time
-import random
-import board
-import displayio
-import framebufferio
-import rgbmatrix
+import fastrand
+from warmstart import WarmStart
+
+try:
+    import displayio
+    import bitmaps
+    import panel
+    from sprites import Sprite, SpriteLayer
+    import buttons
+except ImportError:
+    # The panel modules only exist on CircuitPython. The game rules still
+    # import on a host so matches can be simulated headless.
+    displayio = bitmaps = panel = buttons = None
 
 class PongGame:
-    def __init__(self):
-        # Release any resources currently in use
-        displayio.release_displays()
-        
+    def __init__(self, headless=False, rng=None, size=None, warm_start=None, controls=None):
+        # Headless games only run the rules: no panel, bitmap or refresh.
+        self.headless = headless
+        # Source of randomness; pass a seeded fastrand.XorShift or random.Random for repeatable matches.
+        self.rng = rng or fastrand.shared
+
         # Configuration for display size and colors
-        self.WIDTH = 64
-        self.HEIGHT = 32
-        self.BITMAP_COLORS = 256
-        
-        # Setup the RGB matrix display
-        self.matrix = rgbmatrix.RGBMatrix(
-            width=self.WIDTH,
-            height=self.HEIGHT,
-            bit_depth=6,
-            rgb_pins=[
-                board.MTX_R1, board.MTX_G1, board.MTX_B1,
-                board.MTX_R2, board.MTX_G2, board.MTX_B2
-            ],
-            addr_pins=[
-                board.MTX_ADDRA, board.MTX_ADDRB, board.MTX_ADDRC, board.MTX_ADDRD
-            ],
-            clock_pin=board.MTX_CLK,
-            latch_pin=board.MTX_LAT,
-            output_enable_pin=board.MTX_OE,
-            tile=1,
-            serpentine=True,
-            doublebuffer=True,
-        )
-        self.display = framebufferio.FramebufferDisplay(self.matrix, auto_refresh=False)
-        
-        # Create a display group and attach a TileGrid for the bitmap
-        self.group = displayio.Group()
-        self.display.root_group = self.group
-        
-        # Create bitmap and palette
-        self.bitmap = displayio.Bitmap(self.WIDTH, self.HEIGHT, self.BITMAP_COLORS)
-        self.palette = displayio.Palette(self.BITMAP_COLORS)
-        self.palette[0] = 0x000000  # Black background
-        self.palette[4] = 0x0000FF  # Blue border
-        
+        self.WIDTH, self.HEIGHT = size or (64, 32)
+        self.BITMAP_COLORS = 5  # Background, ball, two paddles and border.
+
+        if headless:
+            # Palette writes are kept in a plain list so the rules run unchanged.
+            self.palette = [0] * self.BITMAP_COLORS
+        else:
+            self.init_display()
+
         # Define bright colors for ball and players
         self.BRIGHT_COLORS = [
             0xFF0000,  # Red
@@ -68,19 +53,15 @@ class PongGame:
         self.paddle2_color_index = 0
         self.palette[3] = self.player_colors[self.paddle2_color_index]
         
-        # Attach the tile grid to the group
-        self.tile_grid = displayio.TileGrid(self.bitmap, pixel_shader=self.palette)
-        self.group.append(self.tile_grid)
-        
         # Game variables
         self.ball_x = self.WIDTH // 2
         self.ball_y = self.HEIGHT // 2
         self.ball_speed = 1.6
-        self.ball_dx = random.choice([-self.ball_speed, self.ball_speed])
-        self.ball_dy = random.choice([-self.ball_speed, self.ball_speed])
+        self.ball_dx = self.rng.choice([-self.ball_speed, self.ball_speed])
+        self.ball_dy = self.rng.choice([-self.ball_speed, self.ball_speed])
         
         # Paddle settings
-        self.PADDLE_HEIGHT = 5
+        self.PADDLE_HEIGHT = 5 * self.HEIGHT // 32  # 5 pixels on one 64x32 panel
         self.PADDLE_WIDTH = 2
         self.PADDLE_OFFSET = 6  # Inset from the edge
         self.paddle1_x = self.PADDLE_OFFSET
@@ -95,50 +76,78 @@ class PongGame:
         # Player speed settings (dynamic abilities)
         self.MAX_PLAYER_SPEED = 4.3  # Maximum paddle speed
         self.MIN_PLAYER_SPEED = 1    # Minimum paddle speed
+        self.HIT_SPEED_BONUS = 0.2   # Paddle speed gained per consecutive hit
+        self.PADDLE_JITTER = 0.1     # Random error added to each paddle move
+
+        # A buttons.Buttons to play the left paddle with. The AI keeps playing
+        # it until a button is pressed.
+        self.controls = controls
+        self.human = False
+        self.HUMAN_SPEED = 2  # Pixels per frame while a button is held
+
         # Dynamic speed starts at the minimum and increases with consecutive hits
         self.paddle1_speed = self.MIN_PLAYER_SPEED
         self.paddle2_speed = self.MIN_PLAYER_SPEED
         self.paddle1_hit_count = 0
         self.paddle2_hit_count = 0
+
+        # Match statistics
+        self.score1 = 0
+        self.score2 = 0
+        self.rally_hits = 0       # Paddle hits in the rally being played
+        self.last_rally_hits = 0  # Paddle hits in the most recently finished rally
+
+        # Carry on the match that was playing before a reset, if a snapshot was saved.
+        self.warm_start = warm_start
+        if warm_start:
+            self.resume(warm_start.load())
+        
+        if not headless:
+            # Draw the static border once; the border layer is never touched again
+            self.draw_border()
+            self.init_sprites()
+            self.update_display()
+
+    def init_display(self):
+        """Set up the RGB matrix, bitmap, palette and display group."""
+        # Setup the RGB matrix display
+        self.matrix, self.display = panel.create_display(self.WIDTH, self.HEIGHT)
         
-        # Draw the static border once
-        self.draw_border()
-        self.update_display()
-    
+        # Create a display group and attach a TileGrid for the bitmap
+        self.group = displayio.Group()
+        self.display.root_group = self.group
+        
+        # Create bitmap and palette
+        self.bitmap, self.palette = bitmaps.indexed(self.WIDTH, self.HEIGHT, self.BITMAP_COLORS)
+        self.palette[0] = 0x000000  # Black background
+        self.palette[4] = 0x0000FF  # Blue border
+
+        # Attach the tile grid to the group; it only holds the static border
+        self.tile_grid = displayio.TileGrid(self.bitmap, pixel_shader=self.palette)
+        self.group.append(self.tile_grid)
+
+    def init_sprites(self):
+        """Create the paddle and ball sprites in a layer above the border."""
+        self.sprites = SpriteLayer(self.group)
+        self.paddle1_sprite = self.sprites.add(Sprite(
+            self.palette, self.PADDLE_WIDTH, self.PADDLE_HEIGHT, 2, self.paddle1_x, self.paddle1_y))
+        self.paddle2_sprite = self.sprites.add(Sprite(
+            self.palette, self.PADDLE_WIDTH, self.PADDLE_HEIGHT, 3, self.paddle2_x, self.paddle2_y))
+        self.ball_sprite = self.sprites.add(Sprite(self.palette, 1, 1, 1, self.ball_x, self.ball_y))
+
     def draw_border(self):
         """Draw static borders around the display edges."""
         for x in range(self.WIDTH):
             self.bitmap[x, 0] = 4               # Top border
             self.bitmap[x, self.HEIGHT - 1] = 4   # Bottom border
 
-    def clear_paddles(self):
-        """Clear the paddle areas by setting them to the background color."""
-        for y in range(self.HEIGHT):
-            for x in range(self.PADDLE_WIDTH):
-                self.bitmap[self.paddle1_x + x, y] = 0
-                self.bitmap[self.paddle2_x + x, y] = 0
-
     def draw_paddles(self):
-        """Draw both paddles on the screen."""
-        self.clear_paddles()
-        # Draw paddle 1
-        for y in range(int(self.paddle1_y), int(self.paddle1_y + self.PADDLE_HEIGHT)):
-            if 0 <= y < self.HEIGHT:
-                for x in range(self.PADDLE_WIDTH):
-                    self.bitmap[self.paddle1_x + x, y] = 2
-        # Draw paddle 2
-        for y in range(int(self.paddle2_y), int(self.paddle2_y + self.PADDLE_HEIGHT)):
-            if 0 <= y < self.HEIGHT:
-                for x in range(self.PADDLE_WIDTH):
-                    self.bitmap[self.paddle2_x + x, y] = 3
-
-    def draw_ball(self):
-        """Update the ball's position, handle collisions, and draw it."""
-        # Erase previous ball pixel
-        prev_x, prev_y = int(self.ball_x), int(self.ball_y)
-        if 0 <= prev_x < self.WIDTH and 0 <= prev_y < self.HEIGHT:
-            self.bitmap[prev_x, prev_y] = 0
+        """Move both paddle sprites to the current paddle positions."""
+        self.paddle1_sprite.move_to(self.paddle1_x, self.paddle1_y)
+        self.paddle2_sprite.move_to(self.paddle2_x, self.paddle2_y)
 
+    def move_ball(self):
+        """Update the ball's position and handle collisions and scoring."""
         # Update ball position based on its velocity
         self.ball_x += self.ball_dx
         self.ball_y += self.ball_dy
@@ -159,7 +168,8 @@ class PongGame:
                 self.ball_x = self.paddle1_x + self.PADDLE_WIDTH
                 # Increase player 1's dynamic ability
                 self.paddle1_hit_count += 1
-                self.paddle1_speed = min(self.MAX_PLAYER_SPEED, self.MIN_PLAYER_SPEED + self.paddle1_hit_count * 0.2)
+                self.rally_hits += 1
+                self.paddle1_speed = min(self.MAX_PLAYER_SPEED, self.MIN_PLAYER_SPEED + self.paddle1_hit_count * self.HIT_SPEED_BONUS)
                 self.change_ball_properties()
                 self.paddle1_can_move = False
                 self.paddle2_can_move = True
@@ -173,7 +183,8 @@ class PongGame:
                 self.ball_x = self.paddle2_x
                 # Increase player 2's dynamic ability
                 self.paddle2_hit_count += 1
-                self.paddle2_speed = min(self.MAX_PLAYER_SPEED, self.MIN_PLAYER_SPEED + self.paddle2_hit_count * 0.2)
+                self.rally_hits += 1
+                self.paddle2_speed = min(self.MAX_PLAYER_SPEED, self.MIN_PLAYER_SPEED + self.paddle2_hit_count * self.HIT_SPEED_BONUS)
                 self.change_ball_properties()
                 self.paddle1_can_move = True
                 self.paddle2_can_move = False
@@ -181,38 +192,40 @@ class PongGame:
                 # Player 1 scores
                 self.reset_ball(winner=1)
 
-        # Draw the ball at its new position
-        current_x, current_y = int(self.ball_x), int(self.ball_y)
-        if 0 <= current_x < self.WIDTH and 0 <= current_y < self.HEIGHT:
-            self.bitmap[current_x, current_y] = 1
+    def draw_ball(self):
+        """Move the ball sprite to the ball's current position."""
+        self.ball_sprite.move_to(self.ball_x, self.ball_y)
 
     def change_ball_properties(self):
         """Increase ball speed with a slight random factor, update direction, and cycle its color."""
         if self.ball_speed < 3.8:
             # Add a base increase with a random jitter
-            self.ball_speed += 0.1 + random.uniform(-0.05, 0.05)
+            self.ball_speed += 0.1 + self.rng.uniform(-0.05, 0.05)
             self.ball_speed = max(1.0, min(self.ball_speed, 3.8))
         # Preserve the horizontal direction while updating the speed
         self.ball_dx = self.ball_speed if self.ball_dx > 0 else -self.ball_speed
         # Update vertical speed with a random choice for bounce effect
-        self.ball_dy = random.choice([-self.ball_speed, self.ball_speed])
+        self.ball_dy = self.rng.choice([-self.ball_speed, self.ball_speed])
         # Cycle the ball color
         self.ball_color_index = (self.ball_color_index + 1) % len(self.ball_colors)
         self.palette[1] = self.ball_colors[self.ball_color_index]
 
     def reset_ball(self, winner):
         """Reset ball position and update game state after a score."""
-        # Erase the current ball position
-        prev_x, prev_y = int(self.ball_x), int(self.ball_y)
-        if 0 <= prev_x < self.WIDTH and 0 <= prev_y < self.HEIGHT:
-            self.bitmap[prev_x, prev_y] = 0
+        # Record the finished rally
+        self.last_rally_hits = self.rally_hits
+        self.rally_hits = 0
+        if winner == 1:
+            self.score1 += 1
+        elif winner == 2:
+            self.score2 += 1
 
         # Reset ball position and speed
         self.ball_x = self.WIDTH // 2
         self.ball_y = self.HEIGHT // 2
         self.ball_speed = 1.0
-        self.ball_dx = random.choice([-self.ball_speed, self.ball_speed])
-        self.ball_dy = random.choice([-self.ball_speed, self.ball_speed])
+        self.ball_dx = self.rng.choice([-self.ball_speed, self.ball_speed])
+        self.ball_dy = self.rng.choice([-self.ball_speed, self.ball_speed])
 
         # Determine which paddle is allowed to move based on ball direction
         if self.ball_dx < 0:
@@ -238,9 +251,9 @@ class PongGame:
 
     def ai_move_paddles(self):
         """Move the allowed paddle toward the ball using dynamic speeds and a slight random jitter."""
-        # Paddle 1 movement (if allowed)
-        if self.paddle1_can_move:
-            jitter = random.uniform(-0.1, 0.1)
+        # Paddle 1 movement (if allowed and not played by a human)
+        if self.paddle1_can_move and not self.human:
+            jitter = self.rng.uniform(-self.PADDLE_JITTER, self.PADDLE_JITTER)
             if self.paddle1_y + self.PADDLE_HEIGHT / 2 < self.ball_y:
                 self.paddle1_y += self.paddle1_speed + jitter
             elif self.paddle1_y + self.PADDLE_HEIGHT / 2 > self.ball_y:
@@ -249,13 +262,69 @@ class PongGame:
         
         # Paddle 2 movement (if allowed)
         if self.paddle2_can_move:
-            jitter = random.uniform(-0.1, 0.1)
+            jitter = self.rng.uniform(-self.PADDLE_JITTER, self.PADDLE_JITTER)
             if self.paddle2_y + self.PADDLE_HEIGHT / 2 < self.ball_y:
                 self.paddle2_y += self.paddle2_speed + jitter
             elif self.paddle2_y + self.PADDLE_HEIGHT / 2 > self.ball_y:
                 self.paddle2_y -= self.paddle2_speed + jitter
             self.paddle2_y = max(1, min(self.paddle2_y, self.HEIGHT - self.PADDLE_HEIGHT - 1))
 
+    def human_move_paddle(self):
+        """Move the left paddle up or down while UP or DOWN is held (or was tapped this frame)."""
+        held = self.controls.held
+        pressed = self.controls.pressed
+        if held[buttons.UP] or pressed & (1 << buttons.UP):
+            self.paddle1_y -= self.HUMAN_SPEED
+        elif held[buttons.DOWN] or pressed & (1 << buttons.DOWN):
+            self.paddle1_y += self.HUMAN_SPEED
+        self.paddle1_y = max(1, min(self.paddle1_y, self.HEIGHT - self.PADDLE_HEIGHT - 1))
+
+    def step(self):
+        """Advance the game by one frame without drawing anything."""
+        if self.controls is not None:
+            # The button events queued since the last frame, drained once.
+            if self.controls.poll():
+                self.human = True
+            if self.human:
+                self.human_move_paddle()
+        self.ai_move_paddles()
+        self.move_ball()
+
+    # Size, then the float and integer state fields, then the two move flags.
+    STATE_FORMAT = "<HH9f9H2B"
+    STATE_FLOATS = ("ball_x", "ball_y", "ball_dx", "ball_dy", "ball_speed",
+                    "paddle1_y", "paddle2_y", "paddle1_speed", "paddle2_speed")
+    STATE_INTS = ("ball_color_index", "paddle1_color_index", "paddle2_color_index",
+                  "paddle1_hit_count", "paddle2_hit_count", "score1", "score2",
+                  "rally_hits", "last_rally_hits")
+
+    def state(self):
+        """The match in progress as bytes, for a WarmStart snapshot."""
+        values = [self.WIDTH, self.HEIGHT]
+        values += [getattr(self, name) for name in self.STATE_FLOATS]
+        values += [min(getattr(self, name), 0xFFFF) for name in self.STATE_INTS]
+        values += [self.paddle1_can_move, self.paddle2_can_move]
+        return struct.pack(self.STATE_FORMAT, *values)
+
+    def resume(self, data):
+        """Restore a match saved by state(); False if data is missing or from another size."""
+        if data is None or len(data) != struct.calcsize(self.STATE_FORMAT):
+            return False
+        values = struct.unpack(self.STATE_FORMAT, data)
+        if values[:2] != (self.WIDTH, self.HEIGHT):
+            return False
+        names = self.STATE_FLOATS + self.STATE_INTS
+        for name, value in zip(names, values[2:]):
+            setattr(self, name, value)
+        self.paddle1_can_move, self.paddle2_can_move = (bool(v) for v in values[2 + len(names):])
+        self.ball_color_index %= len(self.ball_colors)
+        self.paddle1_color_index %= len(self.player_colors)
+        self.paddle2_color_index %= len(self.player_colors)
+        self.palette[1] = self.ball_colors[self.ball_color_index]
+        self.palette[2] = self.player_colors[self.paddle1_color_index]
+        self.palette[3] = self.player_colors[self.paddle2_color_index]
+        return True
+
     def update_display(self):
         """Refresh the display to show the updated frame."""
         self.display.refresh(minimum_frames_per_second=60)
@@ -264,14 +333,17 @@ class PongGame:
         """Main game loop."""
         try:
             while True:
-                self.ai_move_paddles()
+                self.step()
                 self.draw_paddles()
                 self.draw_ball()
                 self.update_display()
+                if self.warm_start:
+                    self.warm_start.save_due(self.state)
                 time.sleep(0.02)  # Approximately 50 FPS
         except KeyboardInterrupt:
             print("Game terminated.")
 
 if __name__ == "__main__":
-    game = PongGame()
+    # Press UP or DOWN to take over the left paddle.
+    game = PongGame(warm_start=WarmStart("pong"), controls=buttons.Buttons())
     game.run()
@@ -0,0 +1,58 @@
+import time
+import displayio
+import fastrand
+import panel
+from automaton import Automaton, RippleRule
+
+class WaterRipples:
+    def __init__(self, size=None):
+        # Display configuration.
+        self.WIDTH, self.HEIGHT = size or (panel.PANEL_WIDTH, panel.PANEL_HEIGHT)
+        self.BITMAP_COLORS = 256
+
+        # Initialize the RGB matrix display.
+        self.matrix, self.display = panel.create_display(self.WIDTH, self.HEIGHT)
+
+        # Create a bitmap and palette.
+        self.bitmap = displayio.Bitmap(self.WIDTH, self.HEIGHT, self.BITMAP_COLORS)
+        self.palette = displayio.Palette(self.BITMAP_COLORS)
+        # The water height (128 is still water) indexes the palette directly:
+        # troughs fade to black, crests brighten from blue towards white.
+        for i in range(self.BITMAP_COLORS):
+            if i < 128:
+                b = 40 + i * 60 // 128
+                self.palette[i] = b
+            else:
+                level = (i - 128) * 2
+                self.palette[i] = (level << 16) | (level << 8) | min(255, 100 + level)
+
+        self.tile_grid = displayio.TileGrid(self.bitmap, pixel_shader=self.palette)
+        self.group = displayio.Group()
+        self.group.append(self.tile_grid)
+        self.display.root_group = self.group
+
+        # The water surface.
+        self.water = Automaton(self.WIDTH, self.HEIGHT, RippleRule(damping=5))
+        self.DROP_CHANCE = 0.08  # Chance of a new raindrop each frame.
+        self.rng = fastrand.shared
+
+    def update(self):
+        """Maybe add a raindrop, then move the ripples on by one step."""
+        rng = self.rng
+        if rng.random() < self.DROP_CHANCE:
+            x = rng.randint(2, self.WIDTH - 3)
+            y = rng.randint(2, self.HEIGHT - 3)
+            self.water.rule.drop(self.water.cells, self.WIDTH, x, y, rng.randint(60, 120))
+        self.water.step()
+        self.water.draw(self.bitmap)
+
+    def run(self):
+        """Main loop: ripple the water and refresh the display."""
+        while True:
+            self.update()
+            self.display.refresh(minimum_frames_per_second=60)
+            time.sleep(0.02)  # Roughly 50 FPS
+
+if __name__ == "__main__":
+    ripples = WaterRipples()
+    ripples.run()
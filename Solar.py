@@ -1,50 +1,27 @@
 import time
 import math
-import board
 import displayio
-import framebufferio
-import rgbmatrix
+import bitmaps
+import panel
+from truecolor import ColorMap
+from sprites import Sprite, SpriteLayer
 
 class SolarSystemSimulator:
-    def __init__(self):
-        # Release any resources currently in use.
-        displayio.release_displays()
-        
+    def __init__(self, size=None):
         # Display configuration.
-        self.WIDTH = 64
-        self.HEIGHT = 32
-        self.BITMAP_COLORS = 256
+        self.WIDTH, self.HEIGHT = size or (panel.PANEL_WIDTH, panel.PANEL_HEIGHT)
+        self.BITMAP_COLORS = 6  # Background, sun and four planets: four bits per pixel.
         
         # Initialize the RGB matrix display.
-        self.matrix = rgbmatrix.RGBMatrix(
-            width=self.WIDTH,
-            height=self.HEIGHT,
-            bit_depth=6,
-            rgb_pins=[
-                board.MTX_R1, board.MTX_G1, board.MTX_B1,
-                board.MTX_R2, board.MTX_G2, board.MTX_B2
-            ],
-            addr_pins=[
-                board.MTX_ADDRA, board.MTX_ADDRB, board.MTX_ADDRC, board.MTX_ADDRD
-            ],
-            clock_pin=board.MTX_CLK,
-            latch_pin=board.MTX_LAT,
-            output_enable_pin=board.MTX_OE,
-            tile=1,
-            serpentine=True,
-            doublebuffer=True,
-        )
-        self.display = framebufferio.FramebufferDisplay(self.matrix, auto_refresh=False)
+        self.matrix, self.display = panel.create_display(self.WIDTH, self.HEIGHT)
         
         # Create a bitmap and palette.
-        self.bitmap = displayio.Bitmap(self.WIDTH, self.HEIGHT, self.BITMAP_COLORS)
-        self.palette = displayio.Palette(self.BITMAP_COLORS)
+        self.bitmap, self.palette = bitmaps.indexed(self.WIDTH, self.HEIGHT, self.BITMAP_COLORS)
         self.palette[0] = 0x000000  # Background: Black
-        self.palette[1] = 0xFFFF00  # Sun: Yellow
-        self.palette[2] = 0xFF0000  # Planet 1: Red
-        self.palette[3] = 0x00FF00  # Planet 2: Green
-        self.palette[4] = 0x0000FF  # Planet 3: Blue
-        self.palette[5] = 0xFF00FF  # Planet 4: Magenta
+        # The sun and planets are drawn with their own colors; the ColorMap
+        # gives each color a palette entry.
+        self.colors = ColorMap(self.palette)
+        self.SUN_COLOR = 0xFFFF00  # Yellow
 
         self.tile_grid = displayio.TileGrid(self.bitmap, pixel_shader=self.palette)
         self.group = displayio.Group()
@@ -57,44 +34,46 @@ class SolarSystemSimulator:
         
         # Define a list of planets.
         # Each planet is a dictionary with:
-        #  - orbit_radius: distance from sun (in pixels)
+        #  - orbit_radius: distance from sun (in pixels on one 64x32 panel)
         #  - angle: current angular position (radians)
         #  - speed: angular speed per frame (radians)
-        #  - color: palette index for this planet.
+        #  - color: this planet's 0xRRGGBB color.
         self.planets = [
-            {"orbit_radius": 6,  "angle": 0.0, "speed": 0.08, "color": 2},
-            {"orbit_radius": 10, "angle": 1.0, "speed": 0.05, "color": 3},
-            {"orbit_radius": 14, "angle": 2.0, "speed": 0.03, "color": 4},
-            {"orbit_radius": 18, "angle": 3.0, "speed": 0.02, "color": 5},
+            {"orbit_radius": 6,  "angle": 0.0, "speed": 0.08, "color": 0xFF0000},  # Red
+            {"orbit_radius": 10, "angle": 1.0, "speed": 0.05, "color": 0x00FF00},  # Green
+            {"orbit_radius": 14, "angle": 2.0, "speed": 0.03, "color": 0x0000FF},  # Blue
+            {"orbit_radius": 18, "angle": 3.0, "speed": 0.02, "color": 0xFF00FF},  # Magenta
         ]
-        
-    def clear_bitmap(self):
-        """Clear the entire bitmap to the background color."""
-        for x in range(self.WIDTH):
-            for y in range(self.HEIGHT):
-                self.bitmap[x, y] = 0
+        # Larger displays get proportionally wider orbits.
+        unit = panel.geometry_scale(self.WIDTH, self.HEIGHT)
+        for planet in self.planets:
+            planet["orbit_radius"] *= unit
 
-    def update(self):
-        """Update planet positions and redraw the solar system."""
-        self.clear_bitmap()
-        
-        # Draw the sun.
+        # The sun never moves, so it is drawn once into the background bitmap.
         if 0 <= self.sun_x < self.WIDTH and 0 <= self.sun_y < self.HEIGHT:
-            self.bitmap[self.sun_x, self.sun_y] = 1
-        
-        # Update and draw each planet.
+            self.bitmap[self.sun_x, self.sun_y] = self.colors.index(self.SUN_COLOR)
+
+        # Each planet is a one-pixel sprite in a layer above the background.
+        self.sprites = SpriteLayer(self.group)
+        for planet in self.planets:
+            planet["sprite"] = self.sprites.add(
+                Sprite(self.palette, color_index=self.colors.index(planet["color"])))
+            self.place_planet(planet)
+
+    def place_planet(self, planet):
+        """Move a planet's sprite to the position given by its current angle."""
+        # Calculate the planet's x, y position.
+        x = self.sun_x + planet["orbit_radius"] * math.cos(planet["angle"])
+        y = self.sun_y + planet["orbit_radius"] * math.sin(planet["angle"])
+        # Sprites outside the panel are simply clipped by displayio.
+        planet["sprite"].move_to(x, y)
+
+    def update(self):
+        """Update planet positions by moving their sprites."""
         for planet in self.planets:
             # Update the angle.
             planet["angle"] += planet["speed"]
-            
-            # Calculate the planet's x, y position.
-            x = self.sun_x + planet["orbit_radius"] * math.cos(planet["angle"])
-            y = self.sun_y + planet["orbit_radius"] * math.sin(planet["angle"])
-            ix, iy = int(x), int(y)
-            
-            # Draw the planet (as a single pixel).
-            if 0 <= ix < self.WIDTH and 0 <= iy < self.HEIGHT:
-                self.bitmap[ix, iy] = planet["color"]
+            self.place_planet(planet)
     
     def run(self):
         """Main loop: update the solar system and refresh the display."""
@@ -1,9 +1,9 @@
 import time
-import random
-import board
 import displayio
-import framebufferio
-import rgbmatrix
+import panel
+import fastrand
+from sprites import Sprite, SpriteLayer
+from truecolor import ColorMap
 
 class Particle:
     def __init__(self, x, y, dx, dy, palette_index):
@@ -12,46 +12,29 @@ class Particle:
         self.dx = dx      # X velocity
         self.dy = dy      # Y velocity
         self.palette_index = palette_index  # The color index in the palette
+        self.sprite = None  # Sprite showing the particle on the panel
 
 class CosmicWanderers:
-    def __init__(self):
-        # Release any resources currently in use.
-        displayio.release_displays()
-        
+    def __init__(self, size=None):
         # Display configuration.
-        self.WIDTH = 64
-        self.HEIGHT = 32
-        self.BITMAP_COLORS = 256
+        self.WIDTH, self.HEIGHT = size or (panel.PANEL_WIDTH, panel.PANEL_HEIGHT)
+        self.BITMAP_COLORS = 8  # Black and the seven bright colors the particles share.
 
         # Initialize the RGB matrix display.
-        self.matrix = rgbmatrix.RGBMatrix(
-            width=self.WIDTH,
-            height=self.HEIGHT,
-            bit_depth=6,
-            rgb_pins=[
-                board.MTX_R1, board.MTX_G1, board.MTX_B1,
-                board.MTX_R2, board.MTX_G2, board.MTX_B2,
-            ],
-            addr_pins=[
-                board.MTX_ADDRA, board.MTX_ADDRB, board.MTX_ADDRC, board.MTX_ADDRD,
-            ],
-            clock_pin=board.MTX_CLK,
-            latch_pin=board.MTX_LAT,
-            output_enable_pin=board.MTX_OE,
-            tile=1,
-            serpentine=True,
-            doublebuffer=True,
-        )
-        self.display = framebufferio.FramebufferDisplay(self.matrix, auto_refresh=False)
+        self.matrix, self.display = panel.create_display(self.WIDTH, self.HEIGHT)
         
         # Create a display group and attach a TileGrid.
         self.group = displayio.Group()
         self.display.root_group = self.group
         
-        # Create the bitmap and a palette.
-        self.bitmap = displayio.Bitmap(self.WIDTH, self.HEIGHT, self.BITMAP_COLORS)
+        # Create the bitmap and a palette. The bitmap is only ever black, so it
+        # needs one bit per pixel; the particles' colors are for their sprites.
+        self.bitmap = displayio.Bitmap(self.WIDTH, self.HEIGHT, 1)
         self.palette = displayio.Palette(self.BITMAP_COLORS)
         self.palette[0] = 0x000000  # Black background.
+        # Particles are colored by RGB value; particles of the same color
+        # share the palette entry the ColorMap gives it.
+        self.colors = ColorMap(self.palette)
         
         # Define a set of bright colors.
         self.BRIGHT_COLORS = [
@@ -64,35 +47,37 @@ class CosmicWanderers:
             0xFFFFFF,  # White
         ]
         
+        # Shared fast generator for the particles' starting state and drift.
+        self.rng = fastrand.shared
+
         # Create a swarm of particles.
         self.NUM_PARTICLES = 15
         self.particles = []
-        for i in range(self.NUM_PARTICLES):
-            x = random.uniform(0, self.WIDTH)
-            y = random.uniform(0, self.HEIGHT)
-            dx = random.uniform(-1.5, 1.5)
-            dy = random.uniform(-1.5, 1.5)
-            palette_index = i + 1  # Reserve index 0 for the background.
+        for _ in range(self.NUM_PARTICLES):
+            x = self.rng.uniform(0, self.WIDTH)
+            y = self.rng.uniform(0, self.HEIGHT)
+            dx = self.rng.uniform(-1.5, 1.5)
+            dy = self.rng.uniform(-1.5, 1.5)
             # Assign each particle a random bright color.
-            self.palette[palette_index] = random.choice(self.BRIGHT_COLORS)
+            palette_index = self.colors.index(self.rng.choice(self.BRIGHT_COLORS))
             self.particles.append(Particle(x, y, dx, dy, palette_index))
         
-        # Attach the bitmap to the display group.
+        # Attach the bitmap to the display group. It stays black; the
+        # particles are one-pixel sprites in a layer above it.
         self.tile_grid = displayio.TileGrid(self.bitmap, pixel_shader=self.palette)
         self.group.append(self.tile_grid)
-    
-    def clear_screen(self):
-        """Fill the entire bitmap with the background color (black)."""
-        for x in range(self.WIDTH):
-            for y in range(self.HEIGHT):
-                self.bitmap[x, y] = 0
+        self.sprites = SpriteLayer(self.group)
+        for p in self.particles:
+            p.sprite = self.sprites.add(Sprite(self.palette, color_index=p.palette_index))
+        self.draw_particles()
 
     def update_particles(self):
         """Update each particle's position and velocity, adding a slight random drift and bouncing off the edges."""
+        rng = self.rng
         for p in self.particles:
             # Add a small random acceleration to create a drifting effect.
-            p.dx += random.uniform(-0.05, 0.05)
-            p.dy += random.uniform(-0.05, 0.05)
+            p.dx += rng.uniform(-0.05, 0.05)
+            p.dy += rng.uniform(-0.05, 0.05)
             # Clamp the speed to a maximum value.
             max_speed = 2.0
             p.dx = max(-max_speed, min(p.dx, max_speed))
@@ -118,9 +103,9 @@ class CosmicWanderers:
                 p.dy = -abs(p.dy)
 
     def draw_particles(self):
-        """Draw each particle onto the bitmap."""
+        """Move each particle's sprite to the particle's position."""
         for p in self.particles:
-            self.bitmap[int(p.x), int(p.y)] = p.palette_index
+            p.sprite.move_to(p.x, p.y)
 
     def update_display(self):
         """Refresh the display to show the current frame."""
@@ -129,7 +114,6 @@ class CosmicWanderers:
     def run(self):
         """Main animation loop."""
         while True:
-            self.clear_screen()
             self.update_particles()
             self.draw_particles()
             self.update_display()
@@ -0,0 +1,219 @@
+# Cellular automaton engine for the 64x32 matrix scenes.
+# An Automaton keeps two flat bytearray grids (row-major, one byte per cell
+# unless the rule packs them) and swaps them after every step. The per-cell
+# work lives in small rule classes that precompute lookup tables, so a new
+# effect only has to describe its rule, not another nested x/y loop.
+# Every rule has the same interface:
+#   blank                             value of a cell in an empty grid
+#   row_bytes(width)                  bytes used to store one row of cells
+#   step(src, dst, width, height)     write the next generation of src into dst
+#   pixels(cells, width, height)      one palette index per cell, row by row
+
+import bitmaptools
+import fastrand
+
+
+class Automaton:
+    def __init__(self, width, height, rule):
+        """Create an empty width x height grid driven by rule."""
+        self.width = width
+        self.height = height
+        self.rule = rule
+        size = rule.row_bytes(width) * height
+        self.cells = bytearray((rule.blank,)) * size  # Current generation.
+        self.back = bytearray((rule.blank,)) * size   # Next generation is written here, then swapped in.
+
+    def step(self):
+        """Advance one generation."""
+        self.rule.step(self.cells, self.back, self.width, self.height)
+        self.cells, self.back = self.back, self.cells
+
+    def pixels(self):
+        """The current generation as one palette index per cell, row by row."""
+        return self.rule.pixels(self.cells, self.width, self.height)
+
+    def draw(self, bitmap, x=0, y=0):
+        """Copy the current generation into bitmap with its top-left corner at (x, y)."""
+        bitmaptools.arrayblit(bitmap, self.pixels(), x, y, x + self.width, y + self.height)
+
+
+class FireRule:
+    blank = 0
+
+    def __init__(self, max_intensity=36, rng=None):
+        """
+        The Fireplace flame: each cell is the average of the three cells below it,
+        minus a random decay of 0 to 2, with a randomly lit bottom row.
+        rng is a fastrand.XorShift; seed it for repeatable flames.
+        """
+        self.max_intensity = max_intensity
+        self.rng = rng or fastrand.shared
+        # One table per decay value, indexed by the sum of the three cells below.
+        stride = 3 * max_intensity + 1
+        self.stride = stride
+        lut = bytearray(3 * stride)
+        for decay in range(3):
+            for total in range(stride):
+                lut[decay * stride + total] = max(0, total // 3 - decay)
+        self.lut = bytes(lut)
+        # Noise tables are made on the first step, once the grid size is known.
+        self.decay_noise = None
+        self.source_noise = None
+
+    def make_noise(self, width, height):
+        # Decay values come pre-multiplied by the table stride.
+        self.decay_noise = fastrand.NoiseTables(
+            width * (height - 1), (0, self.stride, 2 * self.stride), rng=self.rng)
+        # The bottom row is lit at full intensity 70% of the time, else half.
+        full = self.max_intensity
+        half = full // 2
+        self.source_noise = fastrand.NoiseTables(
+            width, (full,) * 7 + (half,) * 3, rng=self.rng)
+
+    def row_bytes(self, width):
+        return width
+
+    def step(self, src, dst, width, height):
+        # Like the original fire, each row is built from the row below it in the
+        # same frame, so new flames rise through the whole height at once.
+        if self.decay_noise is None or self.decay_noise.size != width * (height - 1):
+            self.make_noise(width, height)
+        lut = self.lut
+        source, offset = self.source_noise.next()
+        base = (height - 1) * width
+        dst[base:base + width] = source[offset:offset + width]
+
+        decay, offset = self.decay_noise.next()
+        for y in range(height - 2, -1, -1):
+            row = y * width
+            below = row + width
+            noise = offset + row
+            # Wrap around the horizontal edges.
+            left = dst[below + width - 1]
+            down = dst[below]
+            for x in range(width):
+                right = dst[below + x + 1] if x + 1 < width else dst[below]
+                dst[row + x] = lut[decay[noise + x] + left + down + right]
+                left = down
+                down = right
+
+    def pixels(self, cells, width, height):
+        return cells
+
+
+class LifeRule:
+    blank = 0
+
+    def __init__(self):
+        """
+        Conway's Game of Life on a wrapping grid. Each row is stored bit-packed
+        (one bit per cell) and a whole row of neighbor counts is added up at once
+        with bitwise adders on Python integers.
+        """
+        # Unpacked palette indices (0 dead, 1 alive) for every packed byte.
+        self.unpack = [bytes((byte >> (7 - bit)) & 1 for bit in range(8)) for byte in range(256)]
+
+    def row_bytes(self, width):
+        if width % 8:
+            raise ValueError("Life grid width must be a multiple of 8")
+        return width // 8
+
+    def set_cell(self, cells, width, x, y, alive=True):
+        """Set or clear one cell of a packed grid."""
+        index = y * (width // 8) + x // 8
+        mask = 0x80 >> (x % 8)
+        if alive:
+            cells[index] |= mask
+        else:
+            cells[index] &= ~mask & 0xFF
+
+    def randomize(self, cells, density=0.3, rng=None):
+        """Fill a packed grid with random live cells."""
+        rng = rng or fastrand.shared
+        for i in range(len(cells)):
+            byte = 0
+            for bit in range(8):
+                byte = (byte << 1) | (rng.random() < density)
+            cells[i] = byte
+
+    def step(self, src, dst, width, height):
+        row_bytes = width // 8
+        mask = (1 << width) - 1
+        top = width - 1
+        rows = [int.from_bytes(src[y * row_bytes:(y + 1) * row_bytes], "big") for y in range(height)]
+        for y in range(height):
+            above = rows[y - 1]
+            here = rows[y]
+            below = rows[(y + 1) % height]
+            # The eight neighbor bit-planes, wrapping at the left and right edges.
+            n1 = ((above << 1) | (above >> top)) & mask
+            n2 = above
+            n3 = (above >> 1) | ((above & 1) << top)
+            n4 = ((here << 1) | (here >> top)) & mask
+            n5 = (here >> 1) | ((here & 1) << top)
+            n6 = ((below << 1) | (below >> top)) & mask
+            n7 = below
+            n8 = (below >> 1) | ((below & 1) << top)
+            # Bit-sliced count: ones, twos and fours (or more) bits of every cell.
+            s1 = n1 ^ n2 ^ n3
+            c1 = (n1 & n2) | (n3 & (n1 ^ n2))
+            s2 = n4 ^ n5 ^ n6
+            c2 = (n4 & n5) | (n6 & (n4 ^ n5))
+            s3 = n7 ^ n8
+            c3 = n7 & n8
+            ones = s1 ^ s2 ^ s3
+            c4 = (s1 & s2) | (s3 & (s1 ^ s2))
+            t = c1 ^ c2 ^ c3
+            c5 = (c1 & c2) | (c3 & (c1 ^ c2))
+            twos = t ^ c4
+            fours = c5 | (t & c4)
+            # Alive next if the count is 3, or 2 and the cell is alive now.
+            alive = twos & ~fours & (ones | here) & mask
+            dst[y * row_bytes:(y + 1) * row_bytes] = alive.to_bytes(row_bytes, "big")
+
+    def pixels(self, cells, width, height):
+        unpack = self.unpack
+        return b"".join([unpack[byte] for byte in cells])
+
+
+class RippleRule:
+    blank = 128
+
+    def __init__(self, damping=4):
+        """
+        Water ripples: the classic two-buffer wave where each cell becomes half the
+        sum of its four neighbors minus its value two generations ago, then loses
+        1/2**damping of its height. Heights are stored biased by 128 so they fit a
+        byte; 128 is still water. The edges stay still.
+        """
+        # Index: the biased neighbor sum minus twice the old value, offset by 510.
+        # Halving and damping both round toward zero so the water settles flat.
+        lut = bytearray(1531)
+        for i in range(1531):
+            twice = i - 510 - 256
+            height = twice // 2 if twice >= 0 else -((-twice) // 2)
+            if height >= 0:
+                height -= height >> damping
+            else:
+                height += (-height) >> damping
+            lut[i] = max(0, min(255, height + 128))
+        self.lut = bytes(lut)
+
+    def row_bytes(self, width):
+        return width
+
+    def drop(self, cells, width, x, y, strength=100):
+        """Disturb the water at (x, y)."""
+        cells[y * width + x] = max(0, min(255, 128 + strength))
+
+    def step(self, src, dst, width, height):
+        # dst still holds the generation before src, which the wave equation needs.
+        lut = self.lut
+        for y in range(1, height - 1):
+            row = y * width
+            for i in range(row + 1, row + width - 1):
+                total = src[i - 1] + src[i + 1] + src[i - width] + src[i + width]
+                dst[i] = lut[total - 2 * dst[i] + 510]
+
+    def pixels(self, cells, width, height):
+        return cells
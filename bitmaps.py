@@ -0,0 +1,34 @@
+# Right-sized bitmaps for the matrix scenes.
+# displayio stores a Bitmap at 1, 2, 4, 8, 16 or 32 bits per pixel: the fewest
+# that hold value_count - 1, with every row padded to a whole 32-bit word. A
+# bitmap made for 256 values takes 8 bits per pixel even if the scene only
+# ever draws with two colors, and compositing it reads all of those bits.
+# indexed() sizes a scene's bitmap and palette for the colors it actually
+# draws with instead, so a two-color wireframe takes 1 bit per pixel, a
+# six-color scene 4 bits, and only scenes with more than 16 colors need 8.
+# Writing an index at or above the color count is a bug that the board does
+# not report (the pixel just shows nothing); host/backend.py warns about it.
+
+import displayio
+
+
+def bits_per_value(value_count):
+    """Bits displayio stores per pixel for a bitmap of value_count values."""
+    bits = 1
+    while (1 << bits) < value_count:
+        bits *= 2
+    return bits
+
+
+def bitmap_bytes(width, height, value_count):
+    """Bytes displayio uses for the pixels of a width x height bitmap of value_count values."""
+    words_per_row = (width * bits_per_value(value_count) + 31) // 32
+    return words_per_row * 4 * height
+
+
+def indexed(width, height, color_count):
+    """
+    Return (bitmap, palette) for a scene that draws with the palette indices
+    0 to color_count - 1, at the fewest bits per pixel that hold them.
+    """
+    return displayio.Bitmap(width, height, color_count), displayio.Palette(color_count)
@@ -0,0 +1,48 @@
+# Button input for the matrix scenes.
+# keypad.Keys scans the MatrixPortal's UP and DOWN buttons in the background,
+# debounces them and queues a press or release event for each change, so
+# nothing has to poll the pins from the render loop. A scene calls poll()
+# once per frame: it drains the queue into a reused keypad.Event without
+# allocating or waiting, keeps which buttons are held, and returns a bit
+# mask of the buttons pressed since the last frame. A press and release
+# between two frames still shows in that mask, so quick taps are not lost.
+
+import board
+import keypad
+
+UP = 0
+DOWN = 1
+
+
+class Buttons:
+    def __init__(self, pins=None, keys=None):
+        """The MatrixPortal's UP and DOWN buttons (or pins, pulled up), or an existing keypad.Keys."""
+        if keys is None:
+            pins = pins or (board.BUTTON_UP, board.BUTTON_DOWN)
+            keys = keypad.Keys(pins, value_when_pressed=False, pull=True)
+        self.keys = keys
+        self.event = keypad.Event()
+        self.held = [False] * keys.key_count
+        self.pressed = 0   # Bit mask (1 << key number) of the last poll's presses.
+        self.overflows = 0
+
+    def poll(self):
+        """Apply the events queued since the last call; return the mask of buttons pressed."""
+        events = self.keys.events
+        event = self.event
+        held = self.held
+        pressed = 0
+        while events.get_into(event):
+            held[event.key_number] = event.pressed
+            if event.pressed:
+                pressed |= 1 << event.key_number
+        if events.overflowed:
+            # Events were dropped, so the held states may be stale: start
+            # over, and the keys are reported again as they are now.
+            events.clear()
+            self.keys.reset()
+            for i in range(len(held)):
+                held[i] = False
+            self.overflows += 1
+        self.pressed = pressed
+        return pressed
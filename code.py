@@ -1,92 +1,85 @@
 import time
 import math
-import board
+import bitmaptools
 import displayio
-import framebufferio
-import rgbmatrix
-
-def hsv_to_rgb(h, s, v):
-    """Convert HSV (h in [0,1], s in [0,1], v in [0,1]) to RGB tuple (0-255)."""
-    i = int(h * 6)
-    f = h * 6 - i
-    p = v * (1 - s)
-    q = v * (1 - f * s)
-    t = v * (1 - (1 - f) * s)
-    i = i % 6
-    if i == 0:
-        r, g, b = v, t, p
-    elif i == 1:
-        r, g, b = q, v, p
-    elif i == 2:
-        r, g, b = p, v, t
-    elif i == 3:
-        r, g, b = p, q, v
-    elif i == 4:
-        r, g, b = t, p, v
-    elif i == 5:
-        r, g, b = v, p, q
-    return int(r * 255), int(g * 255), int(b * 255)
+import palettes
+import panel
+from perf import PerfMonitor
 
 class AbstractFractalExplorer:
-    def __init__(self):
-        # Release any resources currently in use.
-        displayio.release_displays()
-
+    def __init__(self, render_size=None, size=None, direct=False, mandelbrot=False):
         # Display configuration.
-        self.WIDTH = 64
-        self.HEIGHT = 32
+        self.WIDTH, self.HEIGHT = size or (panel.PANEL_WIDTH, panel.PANEL_HEIGHT)
+        # The fractal is computed at this resolution and stretched to fill the panel,
+        # e.g. (64, 16) or (32, 16) compute 2x or 4x fewer pixels per frame.
+        self.RENDER_WIDTH, self.RENDER_HEIGHT = render_size or (self.WIDTH, self.HEIGHT)
         # Use a 16-color palette.
         self.BITMAP_COLORS = 16
 
-        # Initialize the RGB matrix display.
-        self.matrix = rgbmatrix.RGBMatrix(
-            width=self.WIDTH,
-            height=self.HEIGHT,
-            bit_depth=6,
-            rgb_pins=[
-                board.MTX_R1, board.MTX_G1, board.MTX_B1,
-                board.MTX_R2, board.MTX_G2, board.MTX_B2,
-            ],
-            addr_pins=[
-                board.MTX_ADDRA, board.MTX_ADDRB, board.MTX_ADDRC, board.MTX_ADDRD,
-            ],
-            clock_pin=board.MTX_CLK,
-            latch_pin=board.MTX_LAT,
-            output_enable_pin=board.MTX_OE,
-            tile=1,
-            serpentine=True,
-            doublebuffer=True,
-        )
-        self.display = framebufferio.FramebufferDisplay(self.matrix, auto_refresh=False)
+        if direct:
+            # Write the fractal straight into the matrix's framebuffer, which also
+            # takes the palette (as native colors) and the display's refresh.
+            self.direct = panel.DirectFramebuffer(self.WIDTH, self.HEIGHT, self.BITMAP_COLORS)
+            self.matrix = self.direct.matrix
+            self.display = self.palette = self.direct
+            self.bitmap = None
+        else:
+            # Initialize the RGB matrix display.
+            self.direct = None
+            self.matrix, self.display = panel.create_display(self.WIDTH, self.HEIGHT)
+
+            # Create a bitmap and palette.
+            self.bitmap = displayio.Bitmap(self.RENDER_WIDTH, self.RENDER_HEIGHT, self.BITMAP_COLORS)
+            self.palette = displayio.Palette(self.BITMAP_COLORS)
 
-        # Create a bitmap and palette.
-        self.bitmap = displayio.Bitmap(self.WIDTH, self.HEIGHT, self.BITMAP_COLORS)
-        self.palette = displayio.Palette(self.BITMAP_COLORS)
+            self.tile_grid, layer = panel.scaled_group(self.bitmap, self.palette, self.WIDTH, self.HEIGHT)
+            self.group = displayio.Group()
+            self.group.append(layer)
+            self.display.root_group = self.group
         # Reserve index 0 as black.
         self.palette[0] = 0x000000
 
-        self.tile_grid = displayio.TileGrid(self.bitmap, pixel_shader=self.palette)
-        self.group = displayio.Group()
-        self.group.append(self.tile_grid)
-        self.display.root_group = self.group
+        # The palette cycles through a gamma-corrected hue wheel of HUE_STEPS
+        # colors, computed once; each frame only picks entries out of it.
+        self.HUE_STEPS = 256
+        self.colors = palettes.ColorCycle(
+            palettes.hue_wheel(self.HUE_STEPS), self.BITMAP_COLORS - 1, span=self.HUE_STEPS // 2)
+
+        # Palette index of each pixel, row by row; copied to the display once per frame.
+        self.pixels = bytearray(self.RENDER_WIDTH * self.RENDER_HEIGHT)
 
         # Fractal parameters.
         self.max_iter = 10  # Lower iteration count for performance
 
+        # With mandelbrot=True the explorer drifts over the Mandelbrot set
+        # instead of a Julia set. Its views are mostly inside the set, where
+        # every point would run all MANDELBROT_ITER iterations, so points in
+        # the main cardioid or the period-2 bulb are caught by a formula
+        # instead. detect_cycles also checks every other point for a cycle
+        # with Brent's method: z is compared with a saved value (within
+        # CYCLE_EPSILON of the distance between pixels) on every iteration,
+        # and a point whose z comes back will never escape. The comparison
+        # costs about as much as the iteration itself and only pays off at a
+        # few hundred iterations; at 48 it makes every view slower, so it is
+        # off by default. Interior points are drawn black.
+        self.mandelbrot = mandelbrot
+        self.MANDELBROT_ITER = 48
+        self.CYCLE_EPSILON = 0.1
+        self.reject_bulbs = True
+        self.detect_cycles = False
+        # Per frame: iterations run, and interior points found by each shortcut.
+        self.iterations = 0
+        self.rejected = 0
+        self.cycles = 0
+
     def update_palette(self, t):
         """
         Update the dynamic palette so that colors fade and shift over time.
-        We'll update palette indices 1 to BITMAP_COLORS-1.
+        Indices 1 to BITMAP_COLORS-1 span half the hue wheel from a base hue
+        that slowly turns.
         """
         base_hue = (t * 0.1) % 1.0  # Slowly shifting base hue.
-        fade_range = 0.5           # The range of hues to span.
-        for i in range(1, self.BITMAP_COLORS):
-            # Compute a hue for this palette index.
-            # The hue will shift over time.
-            hue = (base_hue + ((i - 1) / (self.BITMAP_COLORS - 2)) * fade_range) % 1.0
-            # Use full saturation and brightness.
-            r, g, b = hsv_to_rgb(hue, 1.0, 1.0)
-            self.palette[i] = (r << 16) | (g << 8) | b
+        self.colors.apply(self.palette, int(base_hue * self.HUE_STEPS), first=1)
 
     def compute_fractal(self, c, zoom, offset_x, offset_y):
         """
@@ -94,37 +87,129 @@ class AbstractFractalExplorer:
         Each pixel is mapped to a complex coordinate and iterated with: z = z^2 + c.
         The iteration count (modulo palette size) is used to color the pixel.
         """
-        for py in range(self.HEIGHT):
-            for px in range(self.WIDTH):
+        pixels = self.pixels
+        i = 0
+        for py in range(self.RENDER_HEIGHT):
+            for px in range(self.RENDER_WIDTH):
                 # Map pixel coordinate to the complex plane.
                 # Adjust these values for different views.
-                x = (px / self.WIDTH - 0.5) * 3.0 * zoom + offset_x
-                y = (py / self.HEIGHT - 0.5) * 2.0 * zoom + offset_y
+                x = (px / self.RENDER_WIDTH - 0.5) * 3.0 * zoom + offset_x
+                y = (py / self.RENDER_HEIGHT - 0.5) * 2.0 * zoom + offset_y
                 z = complex(x, y)
                 iter_count = 0
                 while iter_count < self.max_iter and abs(z) <= 2.0:
                     z = z * z + c
                     iter_count += 1
-                color_index = iter_count % self.BITMAP_COLORS
-                self.bitmap[px, py] = color_index
+                pixels[i] = iter_count % self.BITMAP_COLORS
+                i += 1
+        if self.direct:
+            self.direct.draw(pixels, self.RENDER_WIDTH, self.RENDER_HEIGHT)
+        else:
+            bitmaptools.arrayblit(self.bitmap, pixels)
+
+    def compute_mandelbrot(self, zoom, offset_x, offset_y):
+        """
+        Compute the Mandelbrot set over the view: each pixel is c, iterated
+        from z = 0 with z = z^2 + c. Points that escape are colored by their
+        iteration count, points inside the set are black.
+        """
+        pixels = self.pixels
+        max_iter = self.MANDELBROT_ITER
+        # Closer than this share of the distance between pixels counts as the same z.
+        epsilon = self.CYCLE_EPSILON * 3.0 * zoom / self.RENDER_WIDTH
+        reject_bulbs = self.reject_bulbs
+        detect_cycles = self.detect_cycles
+        colors = self.BITMAP_COLORS - 1
+        iterations = rejected = cycles = 0
+        i = 0
+        for py in range(self.RENDER_HEIGHT):
+            y = (py / self.RENDER_HEIGHT - 0.5) * 2.0 * zoom + offset_y
+            y2 = y * y
+            for px in range(self.RENDER_WIDTH):
+                x = (px / self.RENDER_WIDTH - 0.5) * 3.0 * zoom + offset_x
+                if reject_bulbs:
+                    # Inside the main cardioid, or the disc of the period-2 bulb.
+                    q = (x - 0.25) * (x - 0.25) + y2
+                    if q * (q + x - 0.25) <= 0.25 * y2 or (x + 1) * (x + 1) + y2 <= 0.0625:
+                        pixels[i] = 0
+                        rejected += 1
+                        i += 1
+                        continue
+                c = complex(x, y)
+                z = 0j
+                n = 0
+                inside = True
+                if detect_cycles:
+                    # Brent's method: every z is compared with the saved one,
+                    # which moves on after 1, 2, 4, 8... iterations, so a
+                    # cycle of any period is caught once the gap reaches it.
+                    saved = 0j
+                    next_save = 1
+                    while n < max_iter:
+                        z = z * z + c
+                        n += 1
+                        if abs(z) > 2.0:
+                            inside = False
+                            break
+                        if abs(z - saved) < epsilon:
+                            cycles += 1
+                            break
+                        if n == next_save:
+                            saved = z
+                            next_save *= 2
+                else:
+                    while n < max_iter:
+                        z = z * z + c
+                        n += 1
+                        if abs(z) > 2.0:
+                            inside = False
+                            break
+                iterations += n
+                pixels[i] = 0 if inside else 1 + (n - 1) % colors
+                i += 1
+        self.iterations = iterations
+        self.rejected = rejected
+        self.cycles = cycles
+        if self.direct:
+            self.direct.draw(pixels, self.RENDER_WIDTH, self.RENDER_HEIGHT)
+        else:
+            bitmaptools.arrayblit(self.bitmap, pixels)
+
+    def update(self, t):
+        """Draw the frame for time t (seconds since the start)."""
+        # Update the dynamic palette.
+        self.update_palette(t)
+        if self.mandelbrot:
+            # Drift around the body of the set, where most of the view is inside it.
+            zoom = 0.8 + 0.4 * math.sin(t * 0.5)
+            offset_x = -0.6 + 0.4 * math.sin(t * 0.3)
+            offset_y = 0.2 * math.cos(t * 0.3)
+            self.compute_mandelbrot(zoom, offset_x, offset_y)
+            return
+        # Evolve the parameter c over time.
+        c = complex(0.285 + 0.1 * math.sin(t), 0.01 + 0.1 * math.cos(t))
+        # Oscillate zoom to create a pulsing effect.
+        zoom = 1 + 0.5 * math.sin(t * 0.5)
+        # Slowly pan the fractal.
+        offset_x = 0.3 * math.sin(t * 0.3)
+        offset_y = 0.3 * math.cos(t * 0.3)
+        self.compute_fractal(c, zoom, offset_x, offset_y)
 
     def run(self):
         start_time = time.monotonic()
         while True:
             t = time.monotonic() - start_time
-            # Update the dynamic palette.
-            self.update_palette(t)
-            # Evolve the parameter c over time.
-            c = complex(0.285 + 0.1 * math.sin(t), 0.01 + 0.1 * math.cos(t))
-            # Oscillate zoom to create a pulsing effect.
-            zoom = 1 + 0.5 * math.sin(t * 0.5)
-            # Slowly pan the fractal.
-            offset_x = 0.3 * math.sin(t * 0.3)
-            offset_y = 0.3 * math.cos(t * 0.3)
-            self.compute_fractal(c, zoom, offset_x, offset_y)
+            self.update(t)
             self.display.refresh(minimum_frames_per_second=30)
             time.sleep(0.1)
 
+# Show the frame-rate overlay and print per-second timing over serial.
+SHOW_PERF = False
+# Explore the Mandelbrot set instead of the Julia set.
+MANDELBROT = False
+
 if __name__ == "__main__":
-    explorer = AbstractFractalExplorer()
+    explorer = AbstractFractalExplorer(mandelbrot=MANDELBROT)
+    if SHOW_PERF:
+        explorer.display = PerfMonitor(explorer.display, deadline_ms=150)
     explorer.run()
@@ -0,0 +1,106 @@
+# Temporal dithering of palette colors for the matrix panel.
+# rgbmatrix shows the top bit_depth bits of each channel of the RGB565
+# framebuffer (at most 5 for red and blue, 6 for green). Fewer bits mean
+# shorter bit planes, so the panel refreshes faster and the matrix interrupt
+# takes less CPU, but dim colors and gentle ramps collapse into few levels.
+# TemporalDither gets the extra bits back over time: each channel of each
+# palette color is shown rounded down on some frames and up on others, in
+# proportion to the bits that do not fit, so the eye averages them to the
+# color a deeper bit depth would show. A cycle of 2 ** (target_depth -
+# bit_depth) frames recovers that many extra levels per channel; the
+# rounding order (0, 2, 1, 3, ...) spreads the ups through the cycle.
+# The scene writes its colors into the TemporalDither instead of the
+# palette and calls step() before each display refresh. Only entries whose
+# color does not fit the bit depth are rewritten on a step, and all the
+# display has to recomposite is the palette change.
+
+CHANNEL_BITS = (5, 6, 5)  # Red, green and blue in the panel's RGB565 framebuffer.
+
+
+def _rounding_order(phases):
+    # Bit-reversed order: 0, 2, 1, 3 for 4 phases; 0, 4, 2, 6, 1, 5, 3, 7 for 8.
+    bits = phases.bit_length() - 1
+    order = []
+    for i in range(phases):
+        r = 0
+        for b in range(bits):
+            if i & (1 << b):
+                r |= 1 << (bits - 1 - b)
+        order.append(r)
+    return order
+
+
+def shown_levels(color, bit_depth, target_depth=None):
+    """
+    Per channel, (level, extra, bits): the level shown at bit_depth, how many
+    of the cycle's frames show level + 1 to reach target_depth, and the
+    bits the level has.
+    """
+    target_depth = bit_depth if target_depth is None else target_depth
+    result = []
+    for shift, channel_bits in zip((16, 8, 0), CHANNEL_BITS):
+        value = (color >> shift) & 0xFF
+        bits = min(channel_bits, bit_depth)
+        target_bits = min(channel_bits, target_depth)
+        fine = value >> (8 - target_bits)
+        extra_bits = target_bits - bits
+        level = fine >> extra_bits
+        extra = fine & ((1 << extra_bits) - 1)
+        # The cycle has 2 ** (target_depth - bit_depth) frames; scale to it.
+        extra <<= (target_depth - bit_depth) - extra_bits
+        if level == (1 << bits) - 1:
+            extra = 0  # Already at full brightness.
+        result.append((level, extra, bits))
+    return result
+
+
+class TemporalDither:
+    def __init__(self, palette, bit_depth=4, target_depth=6):
+        """
+        Dither the colors written to this object into palette, so a panel at
+        bit_depth approaches the look of target_depth.
+        """
+        if target_depth < bit_depth:
+            raise ValueError("target_depth must be at least bit_depth")
+        self.palette = palette
+        self.bit_depth = bit_depth
+        self.target_depth = target_depth
+        self.phases = 1 << (target_depth - bit_depth)
+        self.order = _rounding_order(self.phases)
+        self.phase = 0
+        self.colors = [0] * len(palette)  # Colors as the scene set them.
+        self.cycles = {}  # index -> the color to show on each phase, for dithered entries only.
+
+    def __len__(self):
+        return len(self.colors)
+
+    def __getitem__(self, index):
+        return self.colors[index]
+
+    def __setitem__(self, index, color):
+        self.colors[index] = color
+        cycle = []
+        threshold_phases = self.order
+        channels = shown_levels(color, self.bit_depth, self.target_depth)
+        for phase in range(self.phases):
+            shown = 0
+            for (level, extra, bits), shift in zip(channels, (16, 8, 0)):
+                if threshold_phases[phase] < extra:
+                    level += 1
+                # The panel only looks at the top bits of each channel.
+                shown |= (level << (8 - bits)) << shift
+            cycle.append(shown)
+        if all(shown == cycle[0] for shown in cycle):
+            self.cycles.pop(index, None)
+        else:
+            self.cycles[index] = cycle
+        self.palette[index] = cycle[self.phase]
+
+    def step(self):
+        """Advance to the next frame of the cycle; True if the palette changed."""
+        self.phase = (self.phase + 1) % self.phases
+        phase = self.phase
+        palette = self.palette
+        for index, cycle in self.cycles.items():
+            palette[index] = cycle[phase]
+        return bool(self.cycles)
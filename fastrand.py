@@ -0,0 +1,101 @@
+# Fast seedable randomness shared by the matrix scenes.
+# XorShift is Marsaglia's 32-bit xorshift generator. It offers the handful
+# of random-module calls the scenes use (random, uniform, randint, choice),
+# so it can be passed anywhere an rng is expected, and fill() writes a whole
+# bytearray or array of noise in one call. NoiseTables pre-generates a few
+# noise tables once; per frame a scene only picks a table and a start offset,
+# so per-cell randomness costs no generator calls at all.
+# Seed a generator (or the shared one with shared.seed()) for repeatable frames.
+
+import random
+
+MASK = 0xFFFFFFFF
+
+
+class XorShift:
+    def __init__(self, seed=None):
+        """Create a generator; without a seed it is seeded from the random module."""
+        self.seed(seed)
+
+    def seed(self, seed=None):
+        """Restart the sequence from seed (any int; 0 is replaced by a fixed value)."""
+        if seed is None:
+            seed = random.getrandbits(32)
+        self.state = (seed & MASK) or 0x9E3779B9
+
+    def next(self):
+        """Return the next 32-bit value."""
+        x = self.state
+        x ^= (x << 13) & MASK
+        x ^= x >> 17
+        x ^= (x << 5) & MASK
+        self.state = x
+        return x
+
+    def random(self):
+        """Return a float in [0, 1)."""
+        return self.next() / 4294967296
+
+    def uniform(self, a, b):
+        """Return a float between a and b."""
+        return a + (b - a) * self.next() / 4294967296
+
+    def randint(self, a, b):
+        """Return an int in [a, b], both ends included."""
+        return a + self.next() % (b - a + 1)
+
+    def choice(self, seq):
+        """Return a random element of a non-empty sequence."""
+        return seq[self.next() % len(seq)]
+
+    def fill(self, buf, values=None):
+        """
+        Fill buf (a bytearray or array) with random entries of values, or with
+        random bytes when values is None. Each generator step yields four values.
+        Picks are uniform when len(values) divides 256 and within 1/256 otherwise.
+        """
+        if values is None:
+            lut = range(256)
+        else:
+            count = len(values)
+            lut = [values[(byte * count) >> 8] for byte in range(256)]
+        size = len(buf)
+        whole = size - size % 4
+        x = self.state
+        for i in range(0, whole, 4):
+            x ^= (x << 13) & MASK
+            x ^= x >> 17
+            x ^= (x << 5) & MASK
+            buf[i] = lut[x & 0xFF]
+            buf[i + 1] = lut[(x >> 8) & 0xFF]
+            buf[i + 2] = lut[(x >> 16) & 0xFF]
+            buf[i + 3] = lut[x >> 24]
+        self.state = x
+        for i in range(whole, size):
+            buf[i] = lut[self.next() & 0xFF]
+        return buf
+
+
+class NoiseTables:
+    def __init__(self, size, values=(0, 1), count=4, rng=None):
+        """
+        Pre-generate count tables of random entries of values for a frame of
+        size cells. Each table is twice as long as a frame so any start offset
+        below size can be read without wrapping.
+        """
+        self.size = size
+        self.rng = rng or shared
+        self.tables = []
+        for _ in range(count):
+            table = bytearray(2 * size) if max(values) < 256 else [0] * (2 * size)
+            self.tables.append(self.rng.fill(table, values))
+        self.index = 0
+
+    def next(self):
+        """Return (table, offset) for the next frame: cell i reads table[offset + i]."""
+        self.index = (self.index + 1) % len(self.tables)
+        return self.tables[self.index], self.rng.next() % self.size
+
+
+# Generator shared by the scenes; call shared.seed(n) for deterministic frames.
+shared = XorShift()
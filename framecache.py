@@ -0,0 +1,76 @@
+# Memory-bounded cache of baked animation frames.
+# Scenes whose animation loops exactly (the cube and the line grid, with their
+# angles quantized to a whole number of turns per loop) draw each frame once,
+# store it here, and replay it on later loops instead of rotating, projecting
+# and rasterizing again. What a frame is stored as is up to the scene; the
+# wireframes store the offsets of their lit pixels, which is far smaller
+# than the frame itself.
+# The cache holds at most budget bytes: the frame data (as counted by the
+# scenes) plus ENTRY_OVERHEAD for each frame's key, entry and dict slot. When
+# it is full, the least recently used frame of any scene is evicted, so a
+# scene that has not been shown for a while gives way first. Entries are kept
+# in use order, oldest first (a hit moves its entry to the end), so eviction
+# takes the first one instead of searching.
+# A loop larger than the budget gets no hits under LRU: each frame is evicted
+# before the loop comes back round to it. Size the budget to whole loops.
+
+try:
+    from collections import OrderedDict
+except ImportError:
+    OrderedDict = dict  # Keeps insertion order on CPython.
+
+# Heap bytes per frame besides its data, on a 32-bit CircuitPython: the key
+# tuple, the entry tuple, the data object's header and the dict slot, each
+# rounded up to 16-byte heap blocks.
+ENTRY_OVERHEAD = 64
+
+
+class FrameCache:
+    def __init__(self, budget=128 * 1024):
+        """A cache holding at most budget bytes of frame data and entries."""
+        self.budget = budget
+        self.used = 0
+        self.entries = OrderedDict()  # (scene, frame) -> (data, size), least recently used first.
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, scene, frame):
+        """The data stored for frame of scene, or None."""
+        key = (scene, frame)
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.entries[key] = entry  # Now the most recently used.
+        self.hits += 1
+        return entry[0]
+
+    def put(self, scene, frame, data, size):
+        """Store data, which takes size bytes, evicting older frames to make room."""
+        size += ENTRY_OVERHEAD
+        if size > self.budget:
+            return
+        key = (scene, frame)
+        if key in self.entries:
+            self.used -= self.entries.pop(key)[1]
+        while self.used + size > self.budget:
+            self.evict()
+        self.entries[key] = (data, size)
+        self.used += size
+
+    def evict(self):
+        """Drop the least recently used frame."""
+        oldest = next(iter(self.entries))
+        self.used -= self.entries.pop(oldest)[1]
+        self.evictions += 1
+
+    def clear(self, scene=None):
+        """Forget every frame, or only the frames of scene."""
+        for key in [key for key in self.entries if scene is None or key[0] == scene]:
+            self.used -= self.entries.pop(key)[1]
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
@@ -0,0 +1,184 @@
+# Frames streamed to the matrix panel over a serial link.
+# A host next to the sign runs a scene and sends each frame to the board
+# (host/offload.py), which only has to apply it and refresh. Frames use the
+# palette and frame ops of framestream.py, so a frame is just the pixels that
+# changed, run-length encoded. Every packet is framed as
+#   header   "<2sBHHH": b"FL", kind, sequence number, payload length, CRC
+#   payload  length bytes; the CRC is the low 16 bits of its crc32
+# Host to board:
+#   SIZE     "<HH" width, height of the frames; starts a fresh, blank bitmap
+#   FRAME    "<HH" base sequence number, palette length, then that many bytes
+#            of framestream PALETTE payload (none if no colors changed) and
+#            the framestream frame ops
+# Board to host:
+#   ACK      "<BH" status, sequence number of the frame answered; the
+#            packet's own sequence number is the frame the board now shows
+# A frame is encoded against the frame its base names, and is applied only if
+# the board's bitmap holds exactly that frame; a base of BLANK means an all-0
+# frame and is always applied (a keyframe). The palette changes travel with
+# the frame and are encoded against the base frame's colors too (a keyframe
+# carries the whole palette), so they are applied exactly when the frame is
+# and a lost frame can't leave the colors wrong. Every FRAME is answered with one
+# ACK, APPLIED or REJECTED, so a frame that is never answered was lost on
+# the way. A rejected frame (a gap after a lost or corrupt
+# packet) tells the host which frame the board does have, so it re-bases
+# there or sends a keyframe. The host keeps only a few frames unacknowledged
+# and drops frames while that window is full, which is the backpressure: a
+# slow link or a busy board lowers the frame rate rather than growing a
+# queue. The board applies every complete frame that has arrived before it
+# refreshes, so it never falls behind showing stale frames.
+
+import binascii
+import struct
+from framestream import apply_frame, apply_palette
+
+SYNC = b"FL"
+HEADER = "<2sBHHH"
+HEADER_SIZE = struct.calcsize(HEADER)
+
+SIZE = 0x53     # "S"
+FRAME = 0x46    # "F"
+ACK = 0x41      # "A"
+
+APPLIED = 0
+REJECTED = 1
+
+BLANK = 0xFFFF  # Base of a keyframe and sequence number of a blank bitmap.
+
+
+def next_seq(seq):
+    """The sequence number after seq; BLANK is never used for a frame."""
+    return (seq + 1) % BLANK
+
+
+def checksum(payload):
+    return binascii.crc32(payload) & 0xFFFF
+
+
+def packet(kind, seq, payload=b""):
+    """A framed packet of kind."""
+    return struct.pack(HEADER, SYNC, kind, seq, len(payload), checksum(payload)) + payload
+
+
+class PacketReader:
+    def __init__(self, port, max_payload):
+        """Read packets of up to max_payload bytes from port as they arrive."""
+        self.port = port
+        # Bytes start to end of buffer have been read but not used yet. The
+        # buffer holds one whole packet of the largest size and is never
+        # resized: used bytes are dropped by moving the rest to the front.
+        self.buffer = bytearray(HEADER_SIZE + max_payload)
+        self.start = 0
+        self.end = 0
+        self.max_payload = max_payload
+        self.corrupt = 0  # Packets dropped for a bad length or CRC.
+
+    def compact(self):
+        """Move the unused bytes to the front of the buffer."""
+        count = self.end - self.start
+        if count:
+            self.buffer[0:count] = self.buffer[self.start:self.end]
+        self.start = 0
+        self.end = count
+
+    def find_sync(self):
+        """Offset of the first SYNC from start, or -1."""
+        buffer = self.buffer
+        first, second = SYNC
+        i = self.start
+        last = self.end - 1
+        while i < last:
+            if buffer[i] == first and buffer[i + 1] == second:
+                return i
+            i += 1
+        return -1
+
+    def read(self):
+        """Return the next complete packet as (kind, seq, payload), or None."""
+        buffer = self.buffer
+        waiting = self.port.in_waiting
+        if waiting:
+            if self.end + waiting > len(buffer):
+                self.compact()
+            count = min(waiting, len(buffer) - self.end)
+            if count:
+                data = self.port.read(count)
+                buffer[self.end:self.end + len(data)] = data
+                self.end += len(data)
+        while True:
+            start = self.find_sync()
+            if start < 0:
+                # Keep a last byte that may begin the next sync.
+                if self.end > self.start and buffer[self.end - 1] == SYNC[0]:
+                    self.start = self.end - 1
+                else:
+                    self.start = self.end = 0
+                return None
+            self.start = start
+            if self.end - start < HEADER_SIZE:
+                return None
+            _, kind, seq, length, crc = struct.unpack_from(HEADER, buffer, start)
+            if length > self.max_payload:
+                self.corrupt += 1
+                self.start += 1
+                continue
+            stop = start + HEADER_SIZE + length
+            if stop > self.end:
+                return None
+            payload = bytes(buffer[start + HEADER_SIZE:stop])
+            if checksum(payload) != crc:
+                self.corrupt += 1
+                self.start += 1  # Resynchronize on the next sync inside.
+                continue
+            self.start = stop
+            return kind, seq, payload
+
+
+class FrameReceiver:
+    def __init__(self, port, resize, max_size=(128, 64)):
+        """
+        Apply frames arriving on port. resize(width, height) is called for each
+        SIZE packet and returns the (bitmap, palette) to draw into.
+        """
+        self.port = port
+        self.resize = resize
+        width, height = max_size
+        # The largest frame: its header, a whole 256-color palette, and one
+        # op and one value byte per pixel.
+        self.reader = PacketReader(port, 4 + 2 + 3 * 256 + 2 * width * height)
+        self.bitmap = None
+        self.palette = None
+        self.seq = BLANK  # Frame the bitmap holds.
+        self.frames = 0
+        self.rejected = 0
+
+    def acknowledge(self, status, seq):
+        self.port.write(packet(ACK, self.seq, struct.pack("<BH", status, seq)))
+
+    def poll(self):
+        """Apply every packet that has arrived; True if the bitmap changed."""
+        changed = False
+        while True:
+            got = self.reader.read()
+            if got is None:
+                return changed
+            kind, seq, payload = got
+            if kind == SIZE:
+                width, height = struct.unpack("<HH", payload)
+                self.bitmap, self.palette = self.resize(width, height)
+                self.seq = BLANK
+            elif kind == FRAME and self.bitmap is not None:
+                base, colors = struct.unpack_from("<HH", payload)
+                if base == BLANK:
+                    self.bitmap.fill(0)
+                elif base != self.seq:
+                    self.rejected += 1
+                    self.acknowledge(REJECTED, seq)
+                    continue
+                if colors:
+                    apply_palette(self.palette, memoryview(payload)[4:4 + colors])
+                apply_frame(self.bitmap, memoryview(payload)[4 + colors:])
+                self.seq = seq
+                self.frames += 1
+                changed = True
+                self.acknowledge(APPLIED, seq)
@@ -0,0 +1,126 @@
+# Recorded animations for the matrix panel.
+# A frame stream holds palette-indexed frames recorded on the host with
+# host/recorder.py, so a deterministic scene (the cube, the line grid, a
+# seeded fire) can be played back with no per-frame math at all.
+#   header   "<4sHHH": b"FRS1", width, height, milliseconds per frame
+#   records  one type byte and a "<H" payload length, then the payload:
+#            PALETTE  "<H" first index, then 3 bytes (R, G, B) per color
+#            FRAME    ops turning the previous frame into this one
+# Frame ops walk the pixels in row-major order from pixel 0. Each op is one
+# header byte whose top two bits give the kind and whose low six bits hold
+# count - 1 (so 1 to 64 pixels):
+#   SKIP     leave count pixels as they are
+#   RUN      set count pixels to the following value byte
+#   LITERAL  set count pixels to the count value bytes that follow
+# Runs and literals never cross the end of a row, so each one is a single
+# bitmaptools call. The first frame is recorded against a blank (all 0) frame.
+# FramePlayer reads one record at a time into a reused buffer, so a stream of
+# any length plays from flash with a fixed, small amount of RAM.
+
+import struct
+import bitmaptools
+
+MAGIC = b"FRS1"
+HEADER = "<4sHHH"
+HEADER_SIZE = struct.calcsize(HEADER)
+RECORD = "<BH"
+RECORD_SIZE = struct.calcsize(RECORD)
+
+PALETTE = 0x50  # "P"
+FRAME = 0x46    # "F"
+
+SKIP = 0x00
+RUN = 0x40
+LITERAL = 0x80
+MAX_COUNT = 64
+
+
+def read_header(file):
+    """Read a stream header from file and return (width, height, milliseconds per frame)."""
+    magic, width, height, frame_ms = struct.unpack(HEADER, file.read(HEADER_SIZE))
+    if magic != MAGIC:
+        raise ValueError("not a frame stream")
+    return width, height, frame_ms
+
+
+def stream_size(path):
+    """(width, height) of the frames in the stream at path."""
+    with open(path, "rb") as file:
+        return read_header(file)[:2]
+
+
+def apply_palette(palette, payload):
+    """Apply a PALETTE payload to palette."""
+    index = payload[0] | (payload[1] << 8)
+    for i in range(2, len(payload), 3):
+        palette[index] = (payload[i] << 16) | (payload[i + 1] << 8) | payload[i + 2]
+        index += 1
+
+
+def apply_frame(bitmap, payload):
+    """Apply the ops of a FRAME payload to bitmap, which holds the previous frame."""
+    width = bitmap.width
+    pixel = 0
+    i = 0
+    end = len(payload)
+    while i < end:
+        op = payload[i]
+        count = (op & 0x3F) + 1
+        kind = op & 0xC0
+        i += 1
+        if kind == SKIP:
+            pixel += count
+            continue
+        y, x = divmod(pixel, width)
+        if kind == RUN:
+            bitmaptools.fill_region(bitmap, x, y, x + count, y + 1, payload[i])
+            i += 1
+        else:
+            bitmaptools.arrayblit(bitmap, payload[i:i + count], x, y, x + count, y + 1)
+            i += count
+        pixel += count
+
+
+class FramePlayer:
+    def __init__(self, path, bitmap, palette, loop=True):
+        """Play the frame stream at path into bitmap and palette."""
+        self.file = open(path, "rb")
+        self.width, self.height, self.frame_ms = read_header(self.file)
+        if (bitmap.width, bitmap.height) != (self.width, self.height):
+            raise ValueError("bitmap size does not match the stream")
+        self.bitmap = bitmap
+        self.palette = palette
+        self.loop = loop
+        self.frame_seconds = self.frame_ms / 1000
+        # A frame is at most one header and one value byte per pixel.
+        self.buffer = bytearray(2 * self.width * self.height + 8)
+        self.view = memoryview(self.buffer)
+        self.record = bytearray(RECORD_SIZE)
+        self.frames = 0  # Frames played since the stream (re)started.
+
+    def rewind(self):
+        """Start again from the first frame."""
+        self.file.seek(HEADER_SIZE)
+        self.bitmap.fill(0)
+        self.frames = 0
+
+    def next_frame(self):
+        """Apply the records up to and including the next frame; False at the end."""
+        while True:
+            if self.file.readinto(self.record) < RECORD_SIZE:
+                if not self.loop or not self.frames:
+                    return False
+                self.rewind()
+                continue
+            kind, length = struct.unpack(RECORD, self.record)
+            payload = self.view[:length]
+            self.file.readinto(payload)
+            if kind == PALETTE:
+                apply_palette(self.palette, payload)
+            elif kind == FRAME:
+                apply_frame(self.bitmap, payload)
+                self.frames += 1
+                return True
+
+    def close(self):
+        self.file.close()
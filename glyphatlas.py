@@ -0,0 +1,146 @@
+# Compact binary glyph atlases for the matrix scripts.
+# A BDF font is text and has to be parsed line by line at boot. The converter
+# in host/bdf2atlas.py turns it into an atlas file that needs no parsing:
+#   header   "<4sHHHHH": b"GLA1", glyph count, atlas width, atlas height,
+#            baseline (atlas rows above the baseline), line height
+#   metrics  glyph count x "<HHBbBx": codepoint, x of the glyph in the atlas,
+#            width, x offset from the pen, advance; sorted by codepoint
+#   bitmap   atlas height rows of (atlas width + 7) // 8 bytes, one bit per
+#            pixel, most significant bit first
+# Every glyph is a full-height column strip of the atlas, so a glyph is just
+# (x, width) and its rows start at the same offsets as every other glyph's.
+# AtlasFont offers the font interface adafruit_display_text uses (get_glyph,
+# get_bounding_box, load_glyphs) and a small draw() blitter for plain bitmaps.
+# On the host the file is memory-mapped; on the board it is read in once.
+
+import struct
+import bitmaptools
+import displayio
+from fontio import Glyph
+
+try:
+    import mmap
+except ImportError:
+    mmap = None
+
+MAGIC = b"GLA1"
+HEADER = "<4sHHHHH"
+ENTRY = "<HHBbBx"
+HEADER_SIZE = struct.calcsize(HEADER)
+ENTRY_SIZE = struct.calcsize(ENTRY)
+
+
+class AtlasFont:
+    def __init__(self, path):
+        """Open the atlas file at path."""
+        with open(path, "rb") as file:
+            if mmap is not None:
+                self.data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                self.data = file.read()
+        magic, count, width, height, baseline, line_height = struct.unpack_from(HEADER, self.data)
+        if magic != MAGIC:
+            raise ValueError("not a glyph atlas")
+        self.count = count
+        self.width = width
+        self.height = height
+        self.baseline = baseline
+        self.line_height = line_height
+        self.stride = (width + 7) // 8
+        self.bitmap_offset = HEADER_SIZE + count * ENTRY_SIZE
+        self.glyphs = {}  # Codepoint -> Glyph, for the glyphs made so far.
+        self.widest = max([self.entry(i)[2] for i in range(count)], default=0)
+
+    def entry(self, index):
+        """(codepoint, x, width, x offset, advance) of the index-th glyph."""
+        return struct.unpack_from(ENTRY, self.data, HEADER_SIZE + index * ENTRY_SIZE)
+
+    def find(self, codepoint):
+        """Index of codepoint in the metrics table, or None. A binary search, no dict."""
+        low = 0
+        high = self.count - 1
+        while low <= high:
+            middle = (low + high) // 2
+            found = self.entry(middle)[0]
+            if found == codepoint:
+                return middle
+            if found < codepoint:
+                low = middle + 1
+            else:
+                high = middle - 1
+        return None
+
+    def get_bounding_box(self):
+        return (self.widest, self.height, 0, self.baseline - self.height)
+
+    @property
+    def ascent(self):
+        return self.baseline
+
+    @property
+    def descent(self):
+        return self.height - self.baseline
+
+    def load_glyphs(self, code_points):
+        """Make the glyphs of a string (or codepoints) ready in advance."""
+        if isinstance(code_points, int):
+            code_points = (code_points,)
+        for code_point in code_points:
+            self.get_glyph(code_point if isinstance(code_point, int) else ord(code_point))
+
+    def get_glyph(self, codepoint):
+        """The glyph for codepoint as a fontio.Glyph, or None if the atlas lacks it."""
+        glyph = self.glyphs.get(codepoint)
+        if glyph is not None:
+            return glyph
+        index = self.find(codepoint)
+        if index is None:
+            return None
+        _, x, width, dx, advance = self.entry(index)
+        bitmap = displayio.Bitmap(max(1, width), self.height, 2)
+        data = self.data
+        row = self.bitmap_offset
+        for y in range(self.height):
+            for column in range(width):
+                bit = x + column
+                if data[row + (bit >> 3)] & (0x80 >> (bit & 7)):
+                    bitmap[column, y] = 1
+            row += self.stride
+        glyph = Glyph(bitmap, 0, width, self.height, dx, self.baseline - self.height, advance, 0)
+        self.glyphs[codepoint] = glyph
+        return glyph
+
+    def draw(self, bitmap, text, x, y, color=1):
+        """
+        Draw text into bitmap with the pen starting at x and the top of the
+        atlas at row y. Only set pixels are written, with palette index color.
+        Returns the pen's end x.
+        """
+        for char in text:
+            glyph = self.get_glyph(ord(char))
+            if glyph is None:
+                continue
+            left = x + glyph.dx
+            source = glyph.bitmap
+            if color == 1:
+                bitmaptools.blit(bitmap, source, left, y, skip_source_index=0)
+                x += glyph.shift_x
+                continue
+            for gy in range(glyph.height):
+                ty = y + gy
+                if 0 <= ty < bitmap.height:
+                    for gx in range(glyph.width):
+                        tx = left + gx
+                        if 0 <= tx < bitmap.width and source[gx, gy]:
+                            bitmap[tx, ty] = color
+            x += glyph.shift_x
+        return x
+
+    def text_width(self, text):
+        """Advance width of text in pixels."""
+        width = 0
+        for char in text:
+            glyph = self.get_glyph(ord(char))
+            if glyph is not None:
+                width += glyph.shift_x
+        return width
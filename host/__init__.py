@@ -0,0 +1,5 @@
+"""Host-side tools for the matrix scripts.
+
+Nothing in this package is copied to the MatrixPortal. Run the tools from the
+repository root, for example ``python -m host.pong_sim``.
+"""
@@ -0,0 +1,793 @@
+"""Pure-Python stand-ins for the CircuitPython display modules.
+
+``install()`` registers ``board``, ``displayio``, ``bitmaptools``,
+``framebufferio`` and ``rgbmatrix`` modules in ``sys.modules`` so the panel
+scripts can be imported and stepped on a desktop Python, along with the few
+libraries the sensor, text and serial scripts need (``busio``,
+``terminalio``, ``fontio``, ``adafruit_display_text.label``,
+``adafruit_matrixportal.matrix``, ``usb_cdc``,
+``microcontroller``, ``keypad`` and ``gifio``).
+The stand-ins follow the CircuitPython APIs the scripts use closely enough
+for benchmarking and for checking output:
+
+* ``Bitmap`` stores one value per pixel and rejects values that do not fit
+  its bits per value, like the real one. It also warns (once per bitmap)
+  about values that fit but are not below its ``value_count``, which the
+  board accepts silently and shows as nothing.
+* ``busio.I2C`` talks to simulated devices (an MCP9808 at 0x18 and the
+  board's LIS3DH at 0x19 unless ``devices=`` says otherwise), requires the
+  lock like the real one, and adds up in ``bus_time`` how long its
+  transfers would keep the wires busy at its frequency.
+* ``Label`` counts how often its text is laid out (``layout_count``) but
+  does not draw glyphs.
+* ``RGBMatrix`` is its own RGB565 framebuffer (``memoryview(matrix)``), like
+  the real one, so scenes can also write the panel's pixels directly.
+* ``keypad.Keys`` takes its events from ``Keys.feed`` (see ``host.keys``,
+  which reads them from stdin or a script) instead of from pins.
+* ``displayio.OnDiskBitmap`` and ``gifio.OnDiskGif`` read memory-mapped
+  files (``host/ondisk.py``).
+* ``FramebufferDisplay.refresh`` composites the root group (groups, scale,
+  tile grids, transparency, rotation) into the matrix's RGB565 framebuffer
+  and keeps the RGB888 frame in ``display.frame`` for inspection.
+
+Only the behaviour the scripts rely on is modelled; timing is host timing.
+"""
+
+import struct
+import sys
+import types
+import warnings
+from array import array
+from collections import namedtuple
+
+
+class Pin:
+    def __init__(self, name):
+        self.name = name
+
+    def __repr__(self):
+        return "board." + self.name
+
+
+def _board_getattr(name):
+    if name.startswith("__"):
+        raise AttributeError(name)
+    pin = Pin(name)
+    setattr(board, name, pin)
+    return pin
+
+
+board = types.ModuleType("board")
+board.__getattr__ = _board_getattr
+
+
+def _bits_for(value_count):
+    bits = 1
+    while (1 << bits) < value_count:
+        bits *= 2
+    return bits
+
+
+class Bitmap:
+    def __init__(self, width, height, value_count):
+        if not 1 <= value_count <= 1 << 32:
+            raise ValueError("value_count must be in 1 to 2**32")
+        self.width = width
+        self.height = height
+        self.value_count = value_count
+        self.bits_per_value = _bits_for(value_count)
+        if self.bits_per_value <= 8:
+            self._data = bytearray(width * height)
+        else:
+            self._data = array("I" if self.bits_per_value > 16 else "H", [0]) * (width * height)
+        self._max = (1 << self.bits_per_value) - 1
+        self._warned = False
+
+    def _offset(self, index):
+        if isinstance(index, tuple):
+            x, y = index
+            if not (0 <= x < self.width and 0 <= y < self.height):
+                raise IndexError("pixel coordinates out of bounds")
+            return y * self.width + x
+        if not 0 <= index < self.width * self.height:
+            raise IndexError("pixel index out of bounds")
+        return index
+
+    def __getitem__(self, index):
+        return self._data[self._offset(index)]
+
+    def _check(self, value):
+        if not 0 <= value <= self._max:
+            raise ValueError("pixel value requires too many bits")
+        # The board stores values up to the next power of two without complaint;
+        # a palette sized to value_count has no color for them.
+        if value >= self.value_count and not self._warned:
+            self._warned = True
+            warnings.warn("pixel value %d written to a %dx%d bitmap of %d values" % (
+                value, self.width, self.height, self.value_count), stacklevel=3)
+
+    def __setitem__(self, index, value):
+        self._check(value)
+        self._data[self._offset(index)] = value
+
+    def fill(self, value):
+        self._check(value)
+        if isinstance(self._data, bytearray):
+            self._data[:] = bytes((value,)) * len(self._data)
+        else:
+            self._data[:] = array(self._data.typecode, (value,)) * len(self._data)
+
+    def blit(self, x, y, source_bitmap, *, x1=0, y1=0, x2=None, y2=None, skip_index=None):
+        x2 = source_bitmap.width if x2 is None else x2
+        y2 = source_bitmap.height if y2 is None else y2
+        for sy in range(y1, y2):
+            dy = y + sy - y1
+            if not 0 <= dy < self.height:
+                continue
+            for sx in range(x1, x2):
+                dx = x + sx - x1
+                if 0 <= dx < self.width:
+                    value = source_bitmap[sx, sy]
+                    if value != skip_index:
+                        self[dx, dy] = value
+
+    def dirty(self, x1=0, y1=0, x2=None, y2=None):
+        pass
+
+    def __len__(self):
+        return self.width * self.height
+
+
+def _to_rgb888(color):
+    if isinstance(color, int):
+        return color & 0xFFFFFF
+    r, g, b = color[0], color[1], color[2]
+    return (r << 16) | (g << 8) | b
+
+
+class Palette:
+    def __init__(self, color_count, *, dither=False):
+        self._colors = [0] * color_count
+        self._transparent = [False] * color_count
+        self.dither = dither
+
+    def __len__(self):
+        return len(self._colors)
+
+    def __getitem__(self, index):
+        return self._colors[index]
+
+    def __setitem__(self, index, color):
+        self._colors[index] = _to_rgb888(color)
+
+    def make_transparent(self, index):
+        self._transparent[index] = True
+
+    def make_opaque(self, index):
+        self._transparent[index] = False
+
+    def is_transparent(self, index):
+        return self._transparent[index]
+
+
+class Colorspace:
+    RGB888 = "RGB888"
+    RGB565 = "RGB565"
+    RGB565_SWAPPED = "RGB565_SWAPPED"
+
+
+def _rgb565_to_rgb888(value):
+    r = (value >> 11) & 0x1F
+    g = (value >> 5) & 0x3F
+    b = value & 0x1F
+    return ((r << 3 | r >> 2) << 16) | ((g << 2 | g >> 4) << 8) | (b << 3 | b >> 2)
+
+
+_rgb565_tables = {}
+
+
+class _Identity:
+    # Stands in for a color table of 2**24 entries: every value is its own color.
+    def __init__(self, size):
+        self._size = size
+
+    def __len__(self):
+        return self._size
+
+    def __getitem__(self, value):
+        return value
+
+
+class _TransparentColor:
+    def __init__(self, size):
+        self._size = size
+        self.color = None
+
+    def __len__(self):
+        return self._size
+
+    def __getitem__(self, value):
+        return value == self.color
+
+
+class ColorConverter:
+    def __init__(self, *, input_colorspace=Colorspace.RGB888, dither=False):
+        # TileGrid rendering looks colors up in _colors, as for a Palette.
+        self.input_colorspace = input_colorspace
+        self.dither = dither
+        if input_colorspace == Colorspace.RGB888:
+            self._colors = _Identity(1 << 24)
+        else:
+            table = _rgb565_tables.get(input_colorspace)
+            if table is None:
+                table = [_rgb565_to_rgb888(v) for v in range(1 << 16)]
+                if input_colorspace == Colorspace.RGB565_SWAPPED:
+                    table = [table[((v & 0xFF) << 8) | (v >> 8)] for v in range(1 << 16)]
+                _rgb565_tables[input_colorspace] = table
+            self._colors = table
+        self._transparent = _TransparentColor(len(self._colors))
+
+    def convert(self, color):
+        return self._colors[color]
+
+    def make_transparent(self, color):
+        self._transparent.color = color
+
+    def make_opaque(self, color):
+        self._transparent.color = None
+
+
+class TileGrid:
+    def __init__(self, bitmap, *, pixel_shader, width=1, height=1, tile_width=None,
+                 tile_height=None, default_tile=0, x=0, y=0):
+        self.bitmap = bitmap
+        self.pixel_shader = pixel_shader
+        self.width = width
+        self.height = height
+        self.tile_width = bitmap.width if tile_width is None else tile_width
+        self.tile_height = bitmap.height if tile_height is None else tile_height
+        if bitmap.width % self.tile_width or bitmap.height % self.tile_height:
+            raise ValueError("Tile dimensions must divide the bitmap evenly")
+        self._tiles = array("H", (default_tile,)) * (width * height)
+        self.x = x
+        self.y = y
+        self.hidden = False
+        self.flip_x = False
+        self.flip_y = False
+
+    def _tile_offset(self, index):
+        if isinstance(index, tuple):
+            return index[1] * self.width + index[0]
+        return index
+
+    def __getitem__(self, index):
+        return self._tiles[self._tile_offset(index)]
+
+    def __setitem__(self, index, value):
+        self._tiles[self._tile_offset(index)] = value
+
+    def _render(self, frame, frame_width, frame_height, ox, oy, scale):
+        bitmap = self.bitmap
+        palette = self.pixel_shader
+        colors = palette._colors
+        transparent = palette._transparent
+        color_count = len(colors)
+        data = bitmap._data
+        bw = bitmap.width
+        tw = self.tile_width
+        th = self.tile_height
+        tiles_per_row = bw // tw
+        ox += self.x * scale
+        oy += self.y * scale
+        for ty in range(self.height):
+            for tx in range(self.width):
+                tile = self._tiles[ty * self.width + tx]
+                src_x = (tile % tiles_per_row) * tw
+                src_y = (tile // tiles_per_row) * th
+                for py in range(th):
+                    dy0 = oy + (ty * th + py) * scale
+                    if dy0 + scale <= 0 or dy0 >= frame_height:
+                        continue  # Row outside the frame (or the band being drawn).
+                    row = (src_y + py) * bw + src_x
+                    for px in range(tw):
+                        value = data[row + px]
+                        if value >= color_count or transparent[value]:
+                            continue
+                        color = colors[value]
+                        dx0 = ox + (tx * tw + px) * scale
+                        for dy in range(dy0, dy0 + scale):
+                            if 0 <= dy < frame_height:
+                                base = dy * frame_width
+                                for dx in range(dx0, dx0 + scale):
+                                    if 0 <= dx < frame_width:
+                                        frame[base + dx] = color
+
+
+def _adopt(layer):
+    # A layer (or root group) can only be in one place at a time, as on the board.
+    if getattr(layer, "_in_group", False):
+        raise ValueError("Layer already in a group")
+    layer._in_group = True
+
+
+def _release(layer):
+    layer._in_group = False
+
+
+class Group:
+    def __init__(self, *, scale=1, x=0, y=0):
+        self.scale = scale
+        self.x = x
+        self.y = y
+        self.hidden = False
+        self._children = []
+
+    def append(self, layer):
+        _adopt(layer)
+        self._children.append(layer)
+
+    def insert(self, index, layer):
+        _adopt(layer)
+        self._children.insert(index, layer)
+
+    def remove(self, layer):
+        self._children.remove(layer)
+        _release(layer)
+
+    def pop(self, index=-1):
+        layer = self._children.pop(index)
+        _release(layer)
+        return layer
+
+    def index(self, layer):
+        return self._children.index(layer)
+
+    def __len__(self):
+        return len(self._children)
+
+    def __getitem__(self, index):
+        return self._children[index]
+
+    def __setitem__(self, index, layer):
+        _release(self._children[index])
+        _adopt(layer)
+        self._children[index] = layer
+
+    def __iter__(self):
+        return iter(self._children)
+
+    def _render(self, frame, frame_width, frame_height, ox, oy, scale):
+        ox += self.x * scale
+        oy += self.y * scale
+        scale *= self.scale
+        for layer in self._children:
+            if not layer.hidden:
+                layer._render(frame, frame_width, frame_height, ox, oy, scale)
+
+
+def release_displays():
+    pass
+
+
+displayio = types.ModuleType("displayio")
+for _obj in (Bitmap, Palette, TileGrid, Group, ColorConverter, Colorspace, release_displays):
+    setattr(displayio, _obj.__name__, _obj)
+
+
+def arrayblit(bitmap, data, x1=0, y1=0, x2=None, y2=None, skip_index=None):
+    x2 = bitmap.width if x2 is None else x2
+    y2 = bitmap.height if y2 is None else y2
+    width = x2 - x1
+    if len(data) < width * (y2 - y1):
+        raise ValueError("data is too short")
+    if skip_index is None and isinstance(bitmap._data, bytearray):
+        # Row copies, standing in for the C loop on the device.
+        bitmap._check(max(data[:width * (y2 - y1)], default=0))
+        for y in range(y1, y2):
+            row = (y - y1) * width
+            start = y * bitmap.width + x1
+            bitmap._data[start:start + width] = data[row:row + width]
+        return
+    for y in range(y1, y2):
+        row = (y - y1) * width
+        for x in range(x1, x2):
+            value = data[row + x - x1]
+            if value != skip_index:
+                bitmap[x, y] = value
+
+
+def _bitmaptools_blit(dest_bitmap, source_bitmap, x, y, *, x1=0, y1=0, x2=None, y2=None, skip_source_index=None, skip_dest_index=None):
+    dest_bitmap.blit(x, y, source_bitmap, x1=x1, y1=y1, x2=x2, y2=y2, skip_index=skip_source_index)
+
+
+def fill_region(dest_bitmap, x1, y1, x2, y2, value):
+    for y in range(max(0, y1), min(dest_bitmap.height, y2)):
+        for x in range(max(0, x1), min(dest_bitmap.width, x2)):
+            dest_bitmap[x, y] = value
+
+
+bitmaptools = types.ModuleType("bitmaptools")
+bitmaptools.arrayblit = arrayblit
+bitmaptools.blit = _bitmaptools_blit
+bitmaptools.fill_region = fill_region
+
+
+def _matrix_height(height, addr_pins, tile):
+    # Each address line doubles the rows of a panel; tile stacks rows of panels.
+    return height if height is not None else 2 * (1 << len(addr_pins)) * abs(tile)
+
+
+class RGBMatrix(array):
+    # Like the real object, the matrix is its own framebuffer: memoryview(matrix)
+    # gives the panel's pixels in native RGB565, row by row.
+    def __new__(cls, *, width, height=None, addr_pins, tile=1, **kwargs):
+        return super().__new__(cls, "H", bytes(2 * width * _matrix_height(height, addr_pins, tile)))
+
+    def __init__(self, *, width, height=None, bit_depth, rgb_pins, addr_pins, clock_pin,
+                 latch_pin, output_enable_pin, doublebuffer=True, framebuffer=None,
+                 height_hint=None, tile=1, serpentine=True):
+        if not 1 <= bit_depth <= 6:
+            raise ValueError("bit_depth must be between 1 and 6")
+        self.width = width
+        self.height = _matrix_height(height, addr_pins, tile)
+        self.bit_depth = bit_depth
+        self.tile = tile
+        self.serpentine = serpentine
+        self.doublebuffer = doublebuffer
+        self.brightness = 1.0
+        self.buffer = memoryview(self)
+        self.refresh_count = 0
+
+    def refresh(self):
+        self.refresh_count += 1
+
+    def deinit(self):
+        pass
+
+
+rgbmatrix = types.ModuleType("rgbmatrix")
+rgbmatrix.RGBMatrix = RGBMatrix
+
+
+def render_band(root_group, frame, width, y0, y1):
+    """Composite rows y0 to y1 of root_group into frame, a (y1 - y0) x width array."""
+    frame[:] = array("I", (0,)) * ((y1 - y0) * width)
+    if root_group is not None and not root_group.hidden:
+        root_group._render(frame, width, y1 - y0, 0, -y0, 1)
+    return frame
+
+
+class FramebufferDisplay:
+    def __init__(self, framebuffer, *, rotation=0, auto_refresh=True):
+        self.framebuffer = framebuffer
+        self.rotation = rotation
+        self.auto_refresh = auto_refresh
+        self._root_group = None
+        self.width = framebuffer.width
+        self.height = framebuffer.height
+        # Last composited frame as 0xRRGGBB values, row by row.
+        self.frame = array("I", (0,)) * (self.width * self.height)
+        self.refresh_count = 0
+        # Composites the root group into the frame; see host.parallel for a pooled one.
+        self.renderer = None
+
+    @property
+    def root_group(self):
+        return self._root_group
+
+    @root_group.setter
+    def root_group(self, group):
+        if group is self._root_group:
+            return
+        if group is not None:
+            if getattr(group, "_in_group", False):
+                raise ValueError("Group already used")
+            group._in_group = True
+        if self._root_group is not None:
+            _release(self._root_group)
+        self._root_group = group
+
+    def refresh(self, *, target_frames_per_second=None, minimum_frames_per_second=0):
+        width = self.width
+        height = self.height
+        frame = self.frame
+        if self.renderer is not None:
+            self.renderer.render(self.root_group, frame, width, height)
+        else:
+            render_band(self.root_group, frame, width, 0, height)
+        buffer = self.framebuffer.buffer
+        last = len(frame) - 1
+        flip = self.rotation == 180
+        for i in range(len(frame)):
+            color = frame[last - i] if flip else frame[i]
+            buffer[i] = ((color >> 8) & 0xF800) | ((color >> 5) & 0x07E0) | ((color >> 3) & 0x001F)
+        self.framebuffer.refresh()
+        self.refresh_count += 1
+        return True
+
+
+framebufferio = types.ModuleType("framebufferio")
+framebufferio.FramebufferDisplay = FramebufferDisplay
+
+
+class SimulatedMCP9808:
+    def __init__(self):
+        # Returns the true temperature in Celsius; replace to simulate weather.
+        self.source = lambda: 21.0
+        self.reads = 0
+        self._register = 0
+
+    def write(self, data):
+        self._register = data[0]
+
+    def read(self, count):
+        if self._register == 0x05:
+            # The sensor reports in steps of 0.0625 degrees Celsius.
+            self.reads += 1
+            raw = round(self.source() * 16) & 0x1FFF
+            return bytes((raw >> 8, raw & 0xFF))
+        return {0x06: b"\x00\x54", 0x07: b"\x04\x00"}.get(self._register, bytes(count))[:count]
+
+
+class SimulatedLIS3DH:
+    def __init__(self):
+        # Returns the acceleration (x, y, z) in g; the board lying flat by default.
+        self.source = lambda: (0.0, 0.0, 1.0)
+        self.reads = 0
+        self.registers = bytearray(0x40)
+        self._register = 0
+
+    def write(self, data):
+        self._register = data[0] & 0x7F
+        if len(data) > 1:
+            self.registers[self._register] = data[1]
+
+    def read(self, count):
+        if self._register == 0x0F:
+            return b"\x33"[:count]
+        if self._register == 0x28:
+            self.reads += 1
+            return struct.pack("<hhh", *(max(-32768, min(32767, int(g * 16384))) for g in self.source()))[:count]
+        return bytes(self.registers[self._register:self._register + count])
+
+
+class I2C:
+    def __init__(self, scl, sda, *, frequency=100000, devices=None):
+        self.scl = scl
+        self.sda = sda
+        self.frequency = frequency
+        self._locked = False
+        # Address -> simulated device; by default the MatrixPortal's
+        # accelerometer and an MCP9808 on the STEMMA QT port.
+        if devices is None:
+            devices = {0x18: SimulatedMCP9808(), 0x19: SimulatedLIS3DH()}
+        self.devices = devices
+        self.bus_time = 0.0  # Seconds the transfers so far would keep the wires busy.
+        self.transfers = 0
+        self.locks = 0
+
+    def try_lock(self):
+        if self._locked:
+            return False
+        self._locked = True
+        self.locks += 1
+        return True
+
+    def unlock(self):
+        self._locked = False
+
+    def deinit(self):
+        pass
+
+    def _transfer(self, *lengths):
+        # Per message: a start, the address byte and bytes at nine clocks each
+        # (eight bits and an ack), and one stop for the whole transfer.
+        if not self._locked:
+            raise RuntimeError("Function requires lock")
+        clocks = 1 + sum(1 + 9 * (1 + length) for length in lengths)
+        self.bus_time += clocks / self.frequency
+        self.transfers += 1
+
+    def _device(self, address):
+        device = self.devices.get(address)
+        if device is None:
+            raise OSError(19, "No such device")
+        return device
+
+    def scan(self):
+        # One address-only write to each of 0x08 to 0x77.
+        for _ in range(0x08, 0x78):
+            self._transfer(0)
+        return sorted(self.devices)
+
+    def writeto(self, address, buffer, *, start=0, end=None):
+        self._transfer(len(buffer[start:end]))
+        self._device(address).write(bytes(buffer[start:end]))
+
+    def readfrom_into(self, address, buffer, *, start=0, end=None):
+        end = len(buffer) if end is None else end
+        self._transfer(end - start)
+        buffer[start:end] = self._device(address).read(end - start)
+
+    def writeto_then_readfrom(self, address, out_buffer, in_buffer, *, out_start=0, out_end=None,
+                              in_start=0, in_end=None):
+        in_end = len(in_buffer) if in_end is None else in_end
+        out = bytes(out_buffer[out_start:out_end])
+        # A repeated start between the two messages, one stop at the end.
+        self._transfer(len(out), in_end - in_start)
+        device = self._device(address)
+        device.write(out)
+        in_buffer[in_start:in_end] = device.read(in_end - in_start)
+
+
+busio = types.ModuleType("busio")
+busio.I2C = I2C
+
+terminalio = types.ModuleType("terminalio")
+# terminalio.FONT has 6x12 pixel glyphs; only the size is modelled.
+terminalio.FONT = types.SimpleNamespace(width=6, height=12)
+
+
+fontio = types.ModuleType("fontio")
+fontio.Glyph = namedtuple(
+    "Glyph", ["bitmap", "tile_index", "width", "height", "dx", "dy", "shift_x", "shift_y"])
+
+
+class Label(Group):
+    def __init__(self, font, *, text="", color=0xFFFFFF, scale=1, x=0, y=0, **kwargs):
+        super().__init__(scale=scale, x=x, y=y)
+        self.font = font
+        self.color = color
+        self.layout_count = 0
+        self._text = None
+        self.text = text
+
+    @property
+    def text(self):
+        return self._text
+
+    @text.setter
+    def text(self, value):
+        # The real label rebuilds its glyph bitmap on every assignment, even
+        # when the text is the same, so every assignment counts.
+        self._text = value
+        self.layout_count += 1
+
+    @property
+    def bounding_box(self):
+        return (0, -self.font.height // 2, len(self._text) * self.font.width, self.font.height)
+
+
+adafruit_display_text = types.ModuleType("adafruit_display_text")
+adafruit_display_text.__path__ = []
+label = types.ModuleType("adafruit_display_text.label")
+label.Label = Label
+adafruit_display_text.label = label
+
+
+class Matrix:
+    def __init__(self, *, width=64, height=32, bit_depth=2, alt_addr_pins=None,
+                 color_order="RGB", serpentine=True, tile_rows=1, rotation=0):
+        self._matrix = RGBMatrix(
+            width=width, height=height, bit_depth=bit_depth, rgb_pins=[None] * 6,
+            addr_pins=[None] * 4, clock_pin=None, latch_pin=None, output_enable_pin=None,
+            tile=tile_rows, serpentine=serpentine)
+        self.display = FramebufferDisplay(self._matrix, rotation=rotation)
+
+
+adafruit_matrixportal = types.ModuleType("adafruit_matrixportal")
+adafruit_matrixportal.__path__ = []
+matrix = types.ModuleType("adafruit_matrixportal.matrix")
+matrix.Matrix = Matrix
+adafruit_matrixportal.matrix = matrix
+
+
+usb_cdc = types.ModuleType("usb_cdc")
+# No USB serial channels on the host; pass a host.offload.SerialPort instead.
+usb_cdc.console = None
+usb_cdc.data = None
+
+
+class Event:
+    def __init__(self, key_number=0, pressed=True, timestamp=0):
+        self.key_number = key_number
+        self.pressed = pressed
+        self.released = not pressed
+        self.timestamp = timestamp
+
+
+class EventQueue:
+    def __init__(self, max_events, feed):
+        self._events = []
+        self._max = max_events
+        self._feed = feed
+        self.overflowed = False
+
+    def _put(self, key_number, pressed):
+        if len(self._events) >= self._max:
+            self.overflowed = True
+            return
+        self._events.append((key_number, pressed))
+
+    def _pull(self):
+        if self._feed is not None:
+            self._feed(self)
+
+    def get(self):
+        event = Event()
+        return event if self.get_into(event) else None
+
+    def get_into(self, event):
+        self._pull()
+        if not self._events:
+            return False
+        event.key_number, event.pressed = self._events.pop(0)
+        event.released = not event.pressed
+        return True
+
+    def clear(self):
+        self._events.clear()
+        self.overflowed = False
+
+    def __len__(self):
+        self._pull()
+        return len(self._events)
+
+
+class Keys:
+    # A callable taking the EventQueue, called whenever the queue is read,
+    # that puts events into it with queue._put(key_number, pressed) without
+    # blocking; see host.keys. None leaves the keys unpressed.
+    feed = None
+
+    def __init__(self, pins, *, value_when_pressed, pull=True, interval=0.02, max_events=64):
+        self.key_count = len(pins)
+        self.events = EventQueue(max_events, Keys.feed)
+
+    def reset(self):
+        pass
+
+    def deinit(self):
+        pass
+
+
+keypad = types.ModuleType("keypad")
+keypad.Event = Event
+keypad.EventQueue = EventQueue
+keypad.Keys = Keys
+
+microcontroller = types.ModuleType("microcontroller")
+# The MatrixPortal S3's 8 KB of non-volatile memory, kept only for the process.
+microcontroller.nvm = bytearray(8192)
+
+# The on-disk image readers build on Bitmap, Palette and ColorConverter above.
+from host import ondisk  # noqa: E402
+
+displayio.OnDiskBitmap = ondisk.OnDiskBitmap
+gifio = types.ModuleType("gifio")
+gifio.OnDiskGif = ondisk.OnDiskGif
+
+MODULES = {
+    "board": board,
+    "displayio": displayio,
+    "bitmaptools": bitmaptools,
+    "framebufferio": framebufferio,
+    "rgbmatrix": rgbmatrix,
+    "busio": busio,
+    "terminalio": terminalio,
+    "fontio": fontio,
+    "adafruit_display_text": adafruit_display_text,
+    "adafruit_display_text.label": label,
+    "adafruit_matrixportal": adafruit_matrixportal,
+    "adafruit_matrixportal.matrix": matrix,
+    "usb_cdc": usb_cdc,
+    "microcontroller": microcontroller,
+    "keypad": keypad,
+    "gifio": gifio,
+}
+
+
+def install():
+    """Register the stand-in modules so panel scripts can be imported."""
+    for name, module in MODULES.items():
+        sys.modules.setdefault(name, module)
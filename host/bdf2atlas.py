@@ -0,0 +1,173 @@
+"""Convert a BDF font into a compact glyph atlas for ``glyphatlas.py``.
+
+    python -m host.bdf2atlas Fonts_lib.zip digits.gla --chars "0123456789.-°F"
+    python -m host.bdf2atlas Fonts/win_crox5tb.bdf font.gla --encoding cp1251
+
+The source is a ``.bdf`` file or a zip archive holding one (``--member``
+picks it, default ``Fonts/win_crox5tb.bdf``). ``--chars`` keeps only the
+glyphs needed, and the atlas is cropped to the rows those glyphs use, so a
+temperature display can carry a few hundred bytes instead of a 51 KB BDF.
+``--encoding`` maps the font's ENCODING numbers to Unicode when they are a
+legacy 8-bit code page (win_crox5tb is CP1251, where 176 is the degree sign).
+Copy the ``.gla`` file to the board next to ``glyphatlas.py``.
+"""
+
+import argparse
+import io
+import struct
+import zipfile
+
+from host import backend
+
+backend.install()
+
+from glyphatlas import ENTRY, HEADER, MAGIC  # noqa: E402
+
+DEFAULT_MEMBER = "Fonts/win_crox5tb.bdf"
+
+
+def open_bdf(path, member=DEFAULT_MEMBER):
+    """Return the BDF text of ``path``, a ``.bdf`` file or a zip holding one."""
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as archive:
+            return archive.read(member).decode("latin-1")
+    with open(path, encoding="latin-1") as file:
+        return file.read()
+
+
+def read_bdf(text):
+    """Parse BDF text into a dict of font metrics and a list of glyphs.
+
+    Each glyph is a dict with ``encoding``, ``advance``, ``bbx`` (width,
+    height, x offset, y offset) and ``rows``, one int of ``width`` bits per
+    row with the leftmost pixel in the highest bit.
+    """
+    font = {"glyphs": [], "ascent": None, "descent": None, "bbx": None}
+    glyph = None
+    lines = iter(io.StringIO(text))
+    for line in lines:
+        words = line.split()
+        if not words:
+            continue
+        key = words[0]
+        if key == "FONTBOUNDINGBOX":
+            font["bbx"] = tuple(int(word) for word in words[1:5])
+        elif key == "FONT_ASCENT":
+            font["ascent"] = int(words[1])
+        elif key == "FONT_DESCENT":
+            font["descent"] = int(words[1])
+        elif key == "STARTCHAR":
+            glyph = {"encoding": -1, "advance": 0, "bbx": (0, 0, 0, 0), "rows": []}
+        elif key == "ENCODING":
+            glyph["encoding"] = int(words[1])
+        elif key == "DWIDTH":
+            glyph["advance"] = int(words[1])
+        elif key == "BBX":
+            glyph["bbx"] = tuple(int(word) for word in words[1:5])
+        elif key == "BITMAP":
+            width, height = glyph["bbx"][:2]
+            for _ in range(height):
+                row = next(lines).strip()
+                glyph["rows"].append(int(row, 16) >> (len(row) * 4 - width) if row else 0)
+        elif key == "ENDCHAR":
+            font["glyphs"].append(glyph)
+            glyph = None
+    if font["ascent"] is None:
+        width, height, x_offset, y_offset = font["bbx"]
+        font["ascent"] = height + y_offset
+        font["descent"] = -y_offset
+    return font
+
+
+def codepoint(encoding, code_page=None):
+    """Unicode codepoint of a BDF ENCODING number, or None if it has none."""
+    if encoding < 0:
+        return None
+    if code_page is None or encoding > 255:
+        return encoding
+    try:
+        return ord(bytes((encoding,)).decode(code_page))
+    except UnicodeDecodeError:
+        return None
+
+
+def build_atlas(font, chars=None, code_page=None):
+    """Return the atlas file contents for ``font`` (from ``read_bdf``).
+
+    ``chars`` is a string of the characters to keep, or None for all.
+    """
+    ascent = font["ascent"]
+    wanted = None if chars is None else {ord(char) for char in chars}
+    glyphs = {}
+    for glyph in font["glyphs"]:
+        point = codepoint(glyph["encoding"], code_page)
+        if point is None or point > 0xFFFF or point in glyphs:
+            continue
+        if wanted is None or point in wanted:
+            glyphs[point] = glyph
+    if wanted is not None and wanted - set(glyphs):
+        missing = "".join(sorted(chr(point) for point in wanted - set(glyphs)))
+        raise ValueError("font has no glyph for %r" % missing)
+
+    # Ink of every glyph as (column, row) pixels, rows counted from the top of
+    # the font's ascent so all glyphs share one vertical frame.
+    inks = {}
+    for point, glyph in glyphs.items():
+        width, height, x_offset, y_offset = glyph["bbx"]
+        top = ascent - (y_offset + height)
+        inks[point] = [
+            (column, top + y)
+            for y, row in enumerate(glyph["rows"])
+            for column in range(width)
+            if row & (1 << (width - 1 - column))
+        ]
+    rows = [row for ink in inks.values() for _, row in ink]
+    first_row = min(min(rows, default=0), ascent)
+    last_row = max(rows, default=first_row)
+    height = last_row - first_row + 1
+
+    entries = []
+    pixels = []
+    x = 0
+    for point in sorted(glyphs):
+        ink = inks[point]
+        x_offset = glyphs[point]["bbx"][2]
+        if ink:
+            left = min(column for column, _ in ink)
+            width = max(column for column, _ in ink) - left + 1
+        else:
+            left = width = 0
+        entries.append(struct.pack(ENTRY, point, x, width, x_offset + left, glyphs[point]["advance"]))
+        pixels.extend((x + column - left, row - first_row) for column, row in ink)
+        x += width
+
+    stride = (x + 7) // 8
+    bitmap = bytearray(stride * height)
+    for column, row in pixels:
+        bitmap[row * stride + (column >> 3)] |= 0x80 >> (column & 7)
+    header = struct.pack(
+        HEADER, MAGIC, len(entries), x, height, ascent - first_row,
+        font["ascent"] + font["descent"])
+    return header + b"".join(entries) + bytes(bitmap)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("source", help="a .bdf file or a zip archive holding one")
+    parser.add_argument("output", help="atlas file to write")
+    parser.add_argument("--member", default=DEFAULT_MEMBER, help="BDF file inside a zip source")
+    parser.add_argument("--chars", help="only keep these characters")
+    parser.add_argument("--encoding", help="code page of the font's ENCODING numbers, e.g. cp1251")
+    args = parser.parse_args()
+
+    text = open_bdf(args.source, args.member)
+    atlas = build_atlas(read_bdf(text), args.chars, args.encoding)
+    with open(args.output, "wb") as file:
+        file.write(atlas)
+    count, width, height = struct.unpack_from(HEADER, atlas)[1:4]
+    print("%s: %d glyphs, %dx%d atlas, %d bytes (BDF %d bytes)" % (
+        args.output, count, width, height, len(atlas), len(text)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Per-step cost of the cellular automaton rules against plain nested loops.
+
+    python -m host.bench_automaton [--frames N]
+
+``fire (lists)`` is the Fireplace update as it was written before the
+automaton engine: a list of columns and a nested x/y loop. ``life (cells)``
+counts neighbors cell by cell, for comparison with the bit-packed rule.
+"""
+
+import argparse
+import random
+
+from host import backend
+from host.benchmark import print_table, time_frames
+
+backend.install()
+
+import automaton  # noqa: E402  (needs the stand-in bitmaptools)
+import displayio  # noqa: E402
+
+WIDTH = 64
+HEIGHT = 32
+
+
+class ListFire:
+    """The original Fireplace.update_fire / update_bitmap pair."""
+
+    def __init__(self, bitmap, max_intensity=36):
+        self.bitmap = bitmap
+        self.max_intensity = max_intensity
+        self.fire_buffer = [[0 for _ in range(HEIGHT)] for _ in range(WIDTH)]
+
+    def step(self, n=0):
+        for x in range(WIDTH):
+            self.fire_buffer[x][HEIGHT - 1] = self.max_intensity if random.random() > 0.3 else int(self.max_intensity / 2)
+        for y in range(HEIGHT - 2, -1, -1):
+            for x in range(WIDTH):
+                left = self.fire_buffer[(x - 1) % WIDTH][y + 1]
+                down = self.fire_buffer[x][y + 1]
+                right = self.fire_buffer[(x + 1) % WIDTH][y + 1]
+                new_intensity = (left + down + right) // 3 - random.randint(0, 2)
+                self.fire_buffer[x][y] = max(0, new_intensity)
+        for x in range(WIDTH):
+            for y in range(HEIGHT):
+                self.bitmap[x, y] = self.fire_buffer[x][y]
+
+
+class CellLife:
+    """Game of Life on a one-byte-per-cell grid with a per-cell neighbor count."""
+
+    def __init__(self, bitmap, seed):
+        rng = random.Random(seed)
+        self.bitmap = bitmap
+        self.cells = bytearray(rng.random() < 0.3 for _ in range(WIDTH * HEIGHT))
+
+    def step(self, n=0):
+        cells = self.cells
+        new = bytearray(WIDTH * HEIGHT)
+        for y in range(HEIGHT):
+            for x in range(WIDTH):
+                count = 0
+                for dy in (-1, 0, 1):
+                    row = ((y + dy) % HEIGHT) * WIDTH
+                    for dx in (-1, 0, 1):
+                        if dy or dx:
+                            count += cells[row + (x + dx) % WIDTH]
+                new[y * WIDTH + x] = count == 3 or (count == 2 and cells[y * WIDTH + x])
+        self.cells = new
+        for y in range(HEIGHT):
+            for x in range(WIDTH):
+                self.bitmap[x, y] = new[y * WIDTH + x]
+
+
+def engine_step(grid, bitmap):
+    def step(n):
+        grid.step()
+        grid.draw(bitmap)
+    return step
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--frames", type=int, default=30)
+    args = parser.parse_args()
+    bitmap = displayio.Bitmap(WIDTH, HEIGHT, 256)
+
+    fire = automaton.Automaton(WIDTH, HEIGHT, automaton.FireRule(36))
+    life_rule = automaton.LifeRule()
+    life = automaton.Automaton(WIDTH, HEIGHT, life_rule)
+    life_rule.randomize(life.cells, rng=random.Random(1))
+    ripple = automaton.Automaton(WIDTH, HEIGHT, automaton.RippleRule())
+    ripple.rule.drop(ripple.cells, WIDTH, 20, 10)
+
+    cases = [
+        ("fire (lists)", ListFire(bitmap).step),
+        ("fire (engine)", engine_step(fire, bitmap)),
+        ("life (cells)", CellLife(bitmap, 1).step),
+        ("life (bit-packed)", engine_step(life, bitmap)),
+        ("ripple (engine)", engine_step(ripple, bitmap)),
+    ]
+    rows = []
+    for name, step in cases:
+        seconds = time_frames(step, args.frames)
+        rows.append([name, "%.3f" % (seconds * 1000), "%.0f" % (1 / seconds)])
+    print_table(["rule", "ms/step", "steps/s"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""Refresh rate, interrupt load and color error of the panel at each bit depth.
+
+    python -m host.bench_bit_depth [--size 64x32] [--clock-mhz 20] [--isr-us 2] [--cap-hz 250]
+
+Refresh rate and interrupt load come from a model of the binary-coded
+modulation rgbmatrix drives the panel with: every row pair is shown once
+per bit plane, plane b stays lit for 2**b units, and a unit is the time it
+takes to clock one row of pixels out (``--clock-mhz``). Each plane starts
+with an interrupt costing ``--isr-us`` of CPU; the shifting itself is done
+by DMA. Left free-running, lower bit depths refresh faster and so take
+*more* interrupts per second, not fewer; what they save is interrupts per
+refresh, which shows as lower load once the refresh rate is held to
+``--cap-hz``.
+
+Color error is the mean CIE76 delta E between each palette color (the 8-bit
+value as a PWM duty) and what the panel shows at the bit depth, for the
+fire's ramp, the ripple's palette and a hue wheel. ``+dither`` is the same
+with ``dither.TemporalDither`` averaging a cycle of frames up to 6 bits.
+A delta E around 1 is at the edge of what is visible. ``step us`` is the
+host cost of one dither step over the fire's palette.
+"""
+
+import argparse
+
+from host import backend, recorder
+from host.benchmark import print_table, time_frames
+
+backend.install()
+
+import dither  # noqa: E402
+import displayio  # noqa: E402
+import palettes  # noqa: E402
+
+ROWS = 16  # Row pairs of a 32-row panel: rgbmatrix lights two rows at a time.
+
+
+def scan_model(width, height, bit_depth, clock_hz, isr_seconds):
+    """Return (refresh rate, interrupts per refresh, interrupt CPU load) for the panel."""
+    chain = width * (height // 32)  # Rows of panels are chained into one long row.
+    unit = chain / clock_hz
+    refresh = 1 / (ROWS * unit * ((1 << bit_depth) - 1))
+    interrupts = ROWS * bit_depth
+    return refresh, interrupts, refresh * interrupts * isr_seconds
+
+
+def _lab(r, g, b):
+    # Linear RGB (0 to 1) with sRGB primaries to CIE L*a*b* under D65.
+    x = (0.4124 * r + 0.3576 * g + 0.1805 * b) / 0.9505
+    y = 0.2126 * r + 0.7152 * g + 0.0722 * b
+    z = (0.0193 * r + 0.1192 * g + 0.9505 * b) / 1.089
+
+    def f(t):
+        return t ** (1 / 3) if t > 0.008856 else 7.787 * t + 16 / 116
+
+    fx, fy, fz = f(x), f(y), f(z)
+    return 116 * fy - 16, 500 * (fx - fy), 200 * (fy - fz)
+
+
+def _duty(color, bit_depth):
+    # On-time fraction of each channel at bit_depth: level / (2**bits - 1).
+    return [level / ((1 << bits) - 1) for level, _, bits in dither.shown_levels(color, bit_depth)]
+
+
+def color_error(colors, bit_depth, dithered):
+    """Mean delta E of colors shown at bit_depth, optionally dithered up to 6 bits."""
+    total = 0.0
+    for color in colors:
+        ideal = _lab(*(((color >> shift) & 0xFF) / 255 for shift in (16, 8, 0)))
+        if dithered and bit_depth < 6:
+            palette = [0]
+            stage = dither.TemporalDither(palette, bit_depth)
+            stage[0] = color
+            duty = [0.0, 0.0, 0.0]
+            for _ in range(stage.phases):
+                for i, value in enumerate(_duty(palette[0], bit_depth)):
+                    duty[i] += value / stage.phases
+                stage.step()
+        else:
+            duty = _duty(color, bit_depth)
+        shown = _lab(*duty)
+        total += sum((a - b) ** 2 for a, b in zip(ideal, shown)) ** 0.5
+    return total / len(colors)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--size", default="64x32", help="display size, e.g. 128x64")
+    parser.add_argument("--clock-mhz", type=float, default=20.0)
+    parser.add_argument("--isr-us", type=float, default=2.0)
+    parser.add_argument("--cap-hz", type=float, default=250.0)
+    args = parser.parse_args()
+    width, height = (int(n) for n in args.size.split("x"))
+
+    sets = [
+        ("fire", list(recorder.make_scene("fire").palette._colors)),
+        ("ripple", list(recorder.make_scene("ripple").palette._colors)),
+        ("wheel", list(palettes.hue_wheel(256))),
+    ]
+    fire = sets[0][1]
+    rows = []
+    for bit_depth in range(6, 0, -1):
+        refresh, interrupts, load = scan_model(
+            width, height, bit_depth, args.clock_mhz * 1e6, args.isr_us / 1e6)
+        capped = min(refresh, args.cap_hz) * interrupts * args.isr_us / 1e6
+        row = ["%d" % bit_depth, "%.0f" % refresh, interrupts, "%.1f%%" % (load * 100),
+               "%.1f%%" % (capped * 100)]
+        for _, colors in sets:
+            row.append("%.2f" % color_error(colors, bit_depth, False))
+            row.append("%.2f" % color_error(colors, bit_depth, True) if bit_depth < 6 else "-")
+        if bit_depth < 6:
+            stage = dither.TemporalDither(displayio.Palette(len(fire)), bit_depth)
+            for i, color in enumerate(fire):
+                stage[i] = color
+            row.append("%.1f" % (time_frames(lambda n: stage.step(), 500) * 1e6))
+        else:
+            row.append("-")
+        rows.append(row)
+    headers = ["bits", "refresh Hz", "irq/refresh", "irq load", "@%.0f Hz" % args.cap_hz]
+    for name, _ in sets:
+        headers += [name, "+dither"]
+    print("%dx%d panel, %.0f MHz clock, %.1f us per interrupt" % (
+        width, height, args.clock_mhz, args.isr_us))
+    print_table(headers + ["step us"], rows)
+
+
+if __name__ == "__main__":
+    main()
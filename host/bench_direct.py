@@ -0,0 +1,103 @@
+"""Frame time of the fire and fractal through displayio against direct framebuffer writes.
+
+    python -m host.bench_direct [--frames N]
+
+``displayio`` is the scene's bitmap shown by a TileGrid and composited into
+the matrix's framebuffer by ``display.refresh()``; ``direct`` is the same
+scene with ``direct=True``, writing native RGB565 values into
+``memoryview(matrix)`` through ``panel.DirectFramebuffer`` and calling
+``matrix.refresh()``. Both run from the same seed and the framebuffers are
+checked to be identical every frame. ``draw ms`` (copying a frame into the
+bitmap or the framebuffer) and ``refresh ms`` are listed apart because on
+the board the compositor and ``arrayblit`` are C while the direct draw is
+Python: there the direct path saves the compositing but pays for the draw.
+"""
+
+import argparse
+import time
+
+from host import backend, scripts
+from host.benchmark import print_table
+
+backend.install()
+
+import fastrand  # noqa: E402
+
+RENDER_SIZES = [(64, 32), (32, 16)]
+
+
+def bench_scene(name, make_scene, update, frames):
+    rows = []
+    for size in RENDER_SIZES:
+        results = {}
+        buffers = {}
+        for direct in (False, True):
+            fastrand.shared.seed(0)
+            scene = make_scene(size, direct)
+            compute = draw = refresh = 0.0
+            frames_seen = []
+            for n in range(frames):
+                start = time.perf_counter()
+                update(scene, n)
+                middle = time.perf_counter()
+                scene.display.refresh(minimum_frames_per_second=0)
+                refresh += time.perf_counter() - middle
+                compute += middle - start
+                frames_seen.append(bytes(memoryview(scene.matrix).cast("B")))
+            # Time the copy into the bitmap or framebuffer on its own.
+            start = time.perf_counter()
+            for _ in range(frames):
+                if direct:
+                    scene.direct.draw(scene_pixels(scene), *size)
+                else:
+                    redraw_bitmap(scene)
+            draw = time.perf_counter() - start
+            results[direct] = (compute, draw, refresh)
+            buffers[direct] = frames_seen
+        if buffers[False] != buffers[True]:
+            raise AssertionError("%s %dx%d: direct frames differ" % ((name,) + size))
+        base = sum(results[False][0::2])
+        for direct in (False, True):
+            compute, draw, refresh = results[direct]
+            rows.append([
+                name,
+                "%dx%d" % size,
+                "direct" if direct else "displayio",
+                "%.2f" % (draw / frames * 1000),
+                "%.2f" % (refresh / frames * 1000),
+                "%.2f" % ((compute + refresh) / frames * 1000),
+                "%.1fx" % (base / (compute + refresh)),
+            ])
+    return rows
+
+
+def scene_pixels(scene):
+    return scene.fire.pixels() if hasattr(scene, "fire") else scene.pixels
+
+
+def redraw_bitmap(scene):
+    if hasattr(scene, "fire"):
+        scene.fire.draw(scene.bitmap)
+    else:
+        backend.arrayblit(scene.bitmap, scene.pixels)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--frames", type=int, default=30)
+    args = parser.parse_args()
+
+    fire = scripts.load("FirePlace.py")
+    fractal = scripts.load("Abstract .py")
+    rows = bench_scene(
+        "fire", lambda size, direct: fire.Fireplace(render_size=size, direct=direct),
+        lambda scene, n: scene.update(), args.frames)
+    rows += bench_scene(
+        "fractal",
+        lambda size, direct: fractal.AbstractFractalExplorer(render_size=size, direct=direct),
+        lambda scene, n: scene.update(n * 0.1), args.frames)
+    print_table(["scene", "render", "path", "draw ms", "refresh ms", "frame ms", "speedup"], rows)
+
+
+if __name__ == "__main__":
+    main()
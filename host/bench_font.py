@@ -0,0 +1,131 @@
+"""Boot-to-first-text time and memory of a BDF font against glyph atlases.
+
+    python -m host.bench_font [--text "72.5°F"] [--runs N]
+
+Each path starts from the font file and ends with the text drawn into a
+64x32 bitmap. ``bdf`` scans the BDF text line by line for the glyphs needed
+and builds one bitmap per glyph, as adafruit_bitmap_font does on the board;
+``atlas`` opens a ``.gla`` file made by ``host.bdf2atlas``, once with every
+glyph and once with only the characters of a temperature display. Memory is
+the Python heap measured with tracemalloc: ``peak`` while loading and
+``kept`` once loaded. A memory-mapped atlas is not heap; on the board the
+whole atlas file is read into RAM, so its size is listed too.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+from host import backend, bdf2atlas, scripts
+from host.benchmark import print_table
+
+backend.install()
+
+import displayio  # noqa: E402
+from glyphatlas import AtlasFont  # noqa: E402
+
+SUBSET = "0123456789.-°F "
+CODE_PAGE = "cp1251"
+
+
+def load_bdf_glyphs(path, text, code_page=CODE_PAGE):
+    """Load the glyphs of text from a BDF file; return {char: (bitmap, dx, dy, advance)}."""
+    wanted = {}
+    for char in text:
+        wanted[char.encode(code_page)[0]] = char
+    glyphs = {}
+    with open(path, encoding="latin-1") as file:
+        encoding = advance = None
+        for line in file:
+            if line.startswith("ENCODING"):
+                encoding = int(line.split()[1])
+            elif line.startswith("DWIDTH"):
+                advance = int(line.split()[1])
+            elif line.startswith("BBX") and encoding in wanted:
+                width, height, dx, dy = (int(word) for word in line.split()[1:5])
+            elif line.startswith("BITMAP") and encoding in wanted:
+                bitmap = displayio.Bitmap(width, height, 2)
+                for y in range(height):
+                    digits = file.readline().strip()
+                    row = int(digits, 16)
+                    bits = len(digits) * 4
+                    for x in range(width):
+                        if row & (1 << (bits - 1 - x)):
+                            bitmap[x, y] = 1
+                glyphs[wanted.pop(encoding)] = (bitmap, dx, dy, advance)
+                if not wanted:
+                    break
+    return glyphs
+
+
+def draw_bdf(path, text):
+    glyphs = load_bdf_glyphs(path, text)
+    target = displayio.Bitmap(64, 32, 2)
+    x = 0
+    for char in text:
+        bitmap, dx, dy, advance = glyphs[char]
+        target.blit(x + dx, 0, bitmap, skip_index=0)
+        x += advance
+    return glyphs, target
+
+
+def draw_atlas(path, text):
+    font = AtlasFont(path)
+    target = displayio.Bitmap(64, 32, 2)
+    font.draw(target, text, 0, 0)
+    return font, target
+
+
+def measure(draw, path, text, runs):
+    """Return (mean seconds, peak heap bytes, kept heap bytes) of draw(path, text)."""
+    start = time.perf_counter()
+    for _ in range(runs):
+        draw(path, text)
+    seconds = (time.perf_counter() - start) / runs
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = draw(path, text)
+    kept = tracemalloc.get_traced_memory()[0] - before
+    peak = tracemalloc.get_traced_memory()[1] - before
+    tracemalloc.stop()
+    del result
+    return seconds, peak, kept
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--text", default="72.5°F")
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    bdf_text = bdf2atlas.open_bdf(os.path.join(scripts.ROOT, "Fonts_lib.zip"))
+    font = bdf2atlas.read_bdf(bdf_text)
+    with tempfile.TemporaryDirectory() as tmp:
+        bdf_path = os.path.join(tmp, "win_crox5tb.bdf")
+        with open(bdf_path, "w", encoding="latin-1") as file:
+            file.write(bdf_text)
+        paths = [("bdf", draw_bdf, bdf_path)]
+        for name, chars in (("atlas, all glyphs", None), ("atlas, " + SUBSET.strip(), SUBSET)):
+            path = os.path.join(tmp, "%d.gla" % len(paths))
+            with open(path, "wb") as file:
+                file.write(bdf2atlas.build_atlas(font, chars, CODE_PAGE))
+            paths.append((name, draw_atlas, path))
+
+        rows = []
+        for name, draw, path in paths:
+            seconds, peak, kept = measure(draw, path, args.text, args.runs)
+            rows.append([
+                name,
+                os.path.getsize(path),
+                "%.2f" % (seconds * 1000),
+                "%.1f" % (peak / 1024),
+                "%.1f" % (kept / 1024),
+            ])
+    print("text %r" % args.text)
+    print_table(["font", "file bytes", "load+draw ms", "peak KB", "kept KB"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Hit rate, memory and speedup of ``framecache.FrameCache``.
+
+    python -m host.bench_framecache [--loops N]
+
+The cube and the line grid are run for several loops with caches of
+different budgets, then both scenes share one cache while a playlist
+switches between them every ``--switch`` frames. ``uncached`` is the
+scene's own draw per frame and ``ms/frame`` the mean with the cache. LRU
+gets no hits from a budget smaller than one loop, since each frame is
+evicted just before the loop comes round to it again.
+"""
+
+import argparse
+import time
+
+from host import backend, scripts
+from host.benchmark import print_table
+
+backend.install()
+
+from framecache import FrameCache  # noqa: E402
+
+UNLIMITED = 1 << 30
+
+SCENES = {
+    "cube": ("3D_Cube.py", "RotatingCube"),
+    "odyssey": ("LineOdyssey.py", "LineOdyssey"),
+}
+
+
+def make(name, cache=None):
+    filename, class_name = SCENES[name]
+    return getattr(scripts.load(filename), class_name)(cache=cache)
+
+
+def run(scenes, frames, switch):
+    """Update the scenes in turn, switching every switch frames; return seconds per frame."""
+    start = time.perf_counter()
+    for n in range(frames):
+        scenes[(n // switch) % len(scenes)].update()
+    return (time.perf_counter() - start) / frames
+
+
+def row(label, budget, cache, seconds, uncached):
+    return [
+        label,
+        "%d KB" % (budget // 1024) if budget < UNLIMITED else "none",
+        "%.1f%%" % (100 * cache.hit_rate),
+        "%.1f" % (cache.used / 1024),
+        cache.evictions,
+        "%.3f" % (uncached * 1000),
+        "%.3f" % (seconds * 1000),
+        "%.1fx" % (uncached / seconds),
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--loops", type=int, default=3)
+    parser.add_argument("--switch", type=int, default=150)
+    args = parser.parse_args()
+
+    rows = []
+    uncached = {}
+    loop_bytes = {}
+    for name in SCENES:
+        scene = make(name)
+        frames = args.loops * scene.LOOP_FRAMES
+        uncached[name] = run([scene], frames, frames)
+        probe = FrameCache(UNLIMITED)
+        run([make(name, probe)], scene.LOOP_FRAMES, frames)
+        loop_bytes[name] = probe.used
+        for budget in (UNLIMITED, probe.used, probe.used // 2):
+            cache = FrameCache(budget)
+            seconds = run([make(name, cache)], frames, frames)
+            rows.append(row(name, budget, cache, seconds, uncached[name]))
+
+    # Both scenes share a cache that holds one loop of each, or only the larger loop.
+    frames = args.loops * 2 * 630
+    mean = sum(uncached.values()) / len(uncached)
+    for budget in (sum(loop_bytes.values()), max(loop_bytes.values())):
+        cache = FrameCache(budget)
+        seconds = run([make(name, cache) for name in SCENES], frames, args.switch)
+        rows.append(row("playlist", budget, cache, seconds, mean))
+
+    print("%d loops of 630 frames; playlist switches every %d frames" % (args.loops, args.switch))
+    print_table(["scene", "limit", "hit rate", "KB used", "evictions", "uncached ms",
+                 "ms/frame", "speedup"], rows)
+
+
+if __name__ == "__main__":
+    main()
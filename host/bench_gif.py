@@ -0,0 +1,138 @@
+"""GIF playback: decode time per frame and peak RAM, streamed against preloaded.
+
+    python -m host.bench_gif [--frames N] [--scenes cube,fire]
+
+Each scene's frames are recorded (as ``host.recorder`` does) and written as
+two GIFs with ``host.gifwrite``: ``changed`` stores only the rectangle that
+differs from the previous frame, ``full`` stores every frame whole. Both
+are then played back through the ``gifio.OnDiskGif`` stand-in:
+
+* ``px/frame`` is the pixels the decoder wrote into the bitmap per frame,
+  as a share of the panel.
+* ``ms/frame`` is the decode time of the plain Python host decoder, far
+  slower than gifio's; compare the rows with each other, not with the
+  board.
+* ``stream KB`` is the peak Python heap while playing every frame with
+  ``OnDiskGif``, which maps the file and keeps one bitmap and its LZW
+  tables. ``preload KB`` is the peak when the file is read into RAM and
+  every decoded frame is kept, as playing from memory would need.
+
+Last, ``Gallery.py`` plays the first GIF on a simulated clock, to check
+that it shows frames for the delays the GIF gives.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+from host import backend, gifwrite, recorder, scripts
+from host.benchmark import print_table
+
+backend.install()
+
+import gifio  # noqa: E402
+
+
+def play(path, frames):
+    """Decode frames frames of the GIF at path; return (seconds per frame, pixels written per frame)."""
+    gif = gifio.OnDiskGif(path)
+    written = 0
+    start = time.perf_counter()
+    for _ in range(frames):
+        gif.next_frame()
+        written += gif.pixels_written
+    seconds = time.perf_counter() - start
+    gif.deinit()
+    return seconds / frames, written / frames
+
+
+def peak_kb(step):
+    tracemalloc.start()
+    step()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 1024
+
+
+def stream(path, frames):
+    gif = gifio.OnDiskGif(path)
+    for _ in range(frames):
+        gif.next_frame()
+    gif.deinit()
+
+
+def preload(path, frames):
+    with open(path, "rb") as file:
+        data = file.read()
+    gif = gifio.OnDiskGif(path)
+    kept = [data]
+    for _ in range(frames):
+        gif.next_frame()
+        kept.append(gif.bitmap._data[:])
+    gif.deinit()
+    return kept
+
+
+def gallery_check(folder, seconds):
+    """Frames Gallery decodes in seconds of simulated time, and the frames the GIF's delays allow."""
+    now = [0]
+    gallery = scripts.load("Gallery.py").Gallery(folder, seconds=3600, clock=lambda: now[0])
+    frames = 0
+    original = gallery.gif.next_frame
+
+    def counted():
+        nonlocal frames
+        frames += 1
+        return original()
+    gallery.gif.next_frame = counted
+    step = 10000000  # 10 ms.
+    while now[0] < seconds * 1000000000:
+        gallery.update()
+        now[0] += step
+    delay = max(gallery.gif.min_delay, gallery.MIN_DELAY)
+    gallery.gif.deinit()
+    return frames, int(seconds / delay)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--frames", type=int, default=40)
+    parser.add_argument("--scenes", default="cube,odyssey,fire,ripple")
+    args = parser.parse_args()
+
+    rows = []
+    with tempfile.TemporaryDirectory() as folder:
+        first = None
+        for name in args.scenes.split(","):
+            scene = recorder.make_scene(name)
+            update = recorder.SCENES[name][3]
+            frames = []
+            for n in range(args.frames):
+                update(scene, n)
+                frames.append(bytes(scene.bitmap._data))
+            width, height = scene.bitmap.width, scene.bitmap.height
+            colors = list(scene.palette._colors)
+            for mode, regions in (("changed", True), ("full", False)):
+                path = os.path.join(folder, "%s-%s.gif" % (name, mode))
+                gifwrite.write_gif(path, width, height, frames, colors, recorder.SCENES[name][2], regions)
+                first = first or path
+                seconds, written = play(path, args.frames)
+                rows.append((
+                    name, mode, "%.1f" % (os.path.getsize(path) / 1024),
+                    "%.0f%%" % (100 * written / (width * height)),
+                    "%.2f" % (seconds * 1000),
+                    "%.1f" % peak_kb(lambda: stream(path, args.frames)),
+                    "%.1f" % peak_kb(lambda: preload(path, args.frames)),
+                ))
+        print_table(("scene", "stored", "file KB", "px/frame", "ms/frame", "stream KB", "preload KB"), rows)
+
+        with tempfile.TemporaryDirectory() as gallery_folder:
+            os.link(first, os.path.join(gallery_folder, os.path.basename(first)))
+            shown, expected = gallery_check(gallery_folder, 5)
+    print()
+    print("Gallery: %d frames decoded in 5 s of simulated time; the GIF's delays allow %d" % (shown, expected))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Bus time and locking of the shared I2C bus manager (``i2cbus.py``).
+
+    python -m host.bench_i2c [--cycles N]
+
+Runs against the ``busio.I2C`` stand-in with its simulated MCP9808 and
+LIS3DH, which adds up how long each transfer would keep the wires busy
+(``bus ms``: clocks at the bus frequency, without clock stretching or the
+time between transfers):
+
+* ``scan``: one discovery scan, which probes all 112 addresses. ``Bus``
+  does it once and keeps the result; before, each script scanned or
+  created the bus itself.
+* ``per read``: each sensor read takes and releases the lock itself, as
+  the Adafruit drivers do.
+* ``batched``: ``Bus.read_all()``, every sensor in one lock window. It
+  saves lock round trips, not bus time: the transfers are the same, but
+  the readings come from one moment and one busy check covers them all.
+
+``host us`` is the Python time per cycle on the host. Last, the lock is
+held elsewhere to show ``Bus.lock`` giving up after its timeout, where a
+``while not i2c.try_lock(): pass`` loop would never return.
+"""
+
+import argparse
+import time
+
+from host import backend
+from host.benchmark import print_table
+
+backend.install()
+
+import busio  # noqa: E402
+import i2cbus  # noqa: E402
+
+
+def measure(i2c, step, cycles):
+    bus_time, transfers, locks = i2c.bus_time, i2c.transfers, i2c.locks
+    start = time.perf_counter()
+    for _ in range(cycles):
+        step()
+    seconds = time.perf_counter() - start
+    return (
+        (i2c.locks - locks) / cycles, (i2c.transfers - transfers) / cycles,
+        (i2c.bus_time - bus_time) / cycles, seconds / cycles,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--cycles", type=int, default=200)
+    args = parser.parse_args()
+
+    rows = []
+    for frequency in (100000, 400000):
+        i2c = busio.I2C(None, None, frequency=frequency)
+        bus = i2cbus.Bus(i2c)
+
+        def scan():
+            with bus as locked:
+                locked.scan()
+
+        def per_read():
+            for device in bus.devices.values():
+                with bus as locked:
+                    device.read(locked)
+
+        for name, step in (("scan", scan), ("per read", per_read), ("batched", bus.read_all)):
+            locks, transfers, bus_time, host = measure(i2c, step, args.cycles)
+            rows.append(("%dk" % (frequency // 1000), name, len(bus.devices), "%.0f" % locks,
+                         "%.0f" % transfers, "%.3f" % (bus_time * 1000), "%.0f" % (host * 1e6)))
+    print_table(("bus", "cycle", "devices", "locks", "transfers", "bus ms", "host us"), rows)
+
+    i2c.try_lock()  # Held by someone else.
+    start = time.monotonic()
+    taken = bus.read_all()
+    print()
+    print("bus held elsewhere: read_all() returned %s after %.0f ms (timeout %.0f ms), timeouts=%d" % (
+        taken, (time.monotonic() - start) * 1000, bus.timeout * 1000, bus.timeouts))
+    i2c.unlock()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Frame rate and link traffic of host-rendered scenes streamed over serial.
+
+    python -m host.bench_offload [--frames N] [--rates none 100000] [--scenes fire ...]
+
+Each scene is rendered by ``host.offload`` at its own frame rate and sent
+over a local pty pair to ``Offload.py``, which runs on a thread here as it
+would on the board. ``--rates`` limits the link to that many bytes per
+second (``none`` is the bare pty); USB serial to a CircuitPython board
+manages a few hundred KB/s. ``sent`` is the frame rate leaving the host
+after frames dropped for backpressure, ``shown`` the rate of panel refreshes
+on the board. Once the stream ends the board's bitmap and palette are
+checked against the last frame sent. The board's refresh here is the Python
+stand-in, so ``shown`` is lower than on real hardware.
+"""
+
+import argparse
+import threading
+import time
+
+from host import backend, offload, recorder, scripts
+from host.benchmark import print_table
+
+backend.install()
+
+
+def run_board(board, stop):
+    while not stop.is_set():
+        if board.update():
+            board.display.refresh(minimum_frames_per_second=0)
+        else:
+            time.sleep(0.0005)  # On the board this loop just spins.
+
+
+def bench_scene(name, frames, rate, window):
+    host_port, board_port = offload.loopback(rate)
+    board = scripts.load("Offload.py").Offload(port=board_port)
+    stop = threading.Event()
+    thread = threading.Thread(target=run_board, args=(board, stop))
+    thread.start()
+    start = time.perf_counter()
+    try:
+        sender = offload.stream(name, host_port, frames, window=window)
+        seconds = time.perf_counter() - start
+        deadline = time.perf_counter() + 5
+        while sender.in_flight and time.perf_counter() < deadline:
+            sender.poll()
+            time.sleep(0.001)
+        time.sleep(0.05)
+    finally:
+        stop.set()
+        thread.join()
+        host_port.close()
+        board_port.close()
+
+    if bytes(board.bitmap._data) != sender.sent[sender.seq]:
+        raise AssertionError("%s: the board does not show the last frame sent" % name)
+    if board.receiver.palette._colors[:len(sender.colors)] != sender.colors:
+        raise AssertionError("%s: the board's palette does not match" % name)
+    frame_ms = recorder.SCENES[name][2]
+    return [
+        name,
+        "none" if rate is None else "%d KB/s" % (rate // 1000),
+        "%.0f" % (1000 / frame_ms),
+        "%.1f" % (sender.frames / seconds),
+        "%.1f" % (board.display.refresh_count / seconds),
+        sender.dropped,
+        sender.rejected,
+        "%.0f" % (sender.bytes / sender.frames),
+        len(sender.sent[sender.seq]),
+        "%.1f" % (sender.bytes / seconds / 1000),
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--frames", type=int, default=100)
+    parser.add_argument("--rates", nargs="+", default=["none", "100000"],
+                        help="link speeds in bytes per second")
+    parser.add_argument("--scenes", nargs="+", default=["fire", "fractal", "cube"],
+                        choices=sorted(recorder.SCENES))
+    parser.add_argument("--window", type=int, default=2)
+    args = parser.parse_args()
+
+    rates = [None if rate == "none" else int(rate) for rate in args.rates]
+    rows = [bench_scene(name, args.frames, rate, args.window)
+            for name in args.scenes for rate in rates]
+    print_table(["scene", "link", "target fps", "sent fps", "shown fps", "dropped",
+                 "rejected", "bytes/frame", "raw bytes", "KB/s"], rows)
+
+
+if __name__ == "__main__":
+    main()
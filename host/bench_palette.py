@@ -0,0 +1,94 @@
+"""Palette updates per second: HSV math per entry against cached color tables.
+
+    python -m host.bench_palette [--frames N]
+
+``hsv_to_rgb`` is the fractal's old per-frame palette update, converting
+each of its 15 hues from HSV with float math; ``ColorCycle`` is the update
+it now does, picking the same entries out of a cached, gamma-corrected hue
+wheel from ``palettes.py``. The 256-entry rows cycle a full palette through
+the wheel, as a color-cycling scene would. ``build ms`` is the one-off cost
+of computing the table, paid once per set of parameters since tables are
+cached.
+"""
+
+import argparse
+import time
+
+from host import backend
+from host.benchmark import print_table, time_frames
+
+backend.install()
+
+import displayio  # noqa: E402
+import palettes  # noqa: E402
+
+
+def hsv_to_rgb(h, s, v):
+    # The fractal's conversion before palettes.py.
+    i = int(h * 6)
+    f = h * 6 - i
+    p = v * (1 - s)
+    q = v * (1 - f * s)
+    t = v * (1 - (1 - f) * s)
+    i = i % 6
+    if i == 0:
+        r, g, b = v, t, p
+    elif i == 1:
+        r, g, b = q, v, p
+    elif i == 2:
+        r, g, b = p, v, t
+    elif i == 3:
+        r, g, b = p, q, v
+    elif i == 4:
+        r, g, b = t, p, v
+    elif i == 5:
+        r, g, b = v, p, q
+    return int(r * 255), int(g * 255), int(b * 255)
+
+
+def hsv_update(palette, count, span):
+    def update(n):
+        base_hue = (n * 0.01) % 1.0
+        for i in range(1, count + 1):
+            hue = (base_hue + ((i - 1) / (count - 1)) * span) % 1.0
+            r, g, b = hsv_to_rgb(hue, 1.0, 1.0)
+            palette[i] = (r << 16) | (g << 8) | b
+    return update
+
+
+def cycle_update(palette, count, span, steps):
+    cycle = palettes.ColorCycle(palettes.hue_wheel(steps), count, span=int(span * steps))
+
+    def update(n):
+        cycle.apply(palette, int((n * 0.01) % 1.0 * steps), first=1)
+    return update
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--frames", type=int, default=2000)
+    args = parser.parse_args()
+
+    rows = []
+    for count, span, label in ((15, 0.5, "fractal, 15 entries"), (255, 1.0, "cycle, 255 entries")):
+        palette = displayio.Palette(count + 1)
+        base = time_frames(hsv_update(palette, count, span), args.frames)
+        rows.append([label, "hsv_to_rgb", "-", "%.0f" % (1 / base), "1.0x"])
+        for steps in (64, 256, 1024):
+            palettes._tables.clear()
+            start = time.perf_counter()
+            palettes.hue_wheel(steps)
+            build = time.perf_counter() - start
+            seconds = time_frames(cycle_update(palette, count, span, steps), args.frames)
+            rows.append([
+                label,
+                "ColorCycle, %d-step wheel" % steps,
+                "%.2f" % (build * 1000),
+                "%.0f" % (1 / seconds),
+                "%.1fx" % (base / seconds),
+            ])
+    print_table(["palette", "update", "build ms", "updates/s", "speedup"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Cost of perf.PerfMonitor against the frame time of each scene.
+
+    python -m host.bench_perf [--frames N]
+
+``frame ms`` is a scene's update and refresh on the host. ``per frame us``
+is the monitor's bookkeeping per refresh, timed around a display whose
+refresh does nothing so only the monitor is measured; the per-second
+report is kept out of it by a clock that never ends the window. ``report
+us`` is that once-a-second report, the telemetry line and the overlay
+redraw. On the board the frame takes far longer than on the host, so the
+overhead there is smaller still in proportion.
+"""
+
+import argparse
+import contextlib
+import io
+
+from host import backend, recorder
+from host.benchmark import print_table, time_frames
+
+backend.install()
+
+import perf  # noqa: E402
+
+
+class NullDisplay:
+    root_group = None
+
+    def refresh(self, **kwargs):
+        return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--frames", type=int, default=200)
+    args = parser.parse_args()
+
+    display = NullDisplay()
+    bare = time_frames(lambda n: display.refresh(), 20000)
+    monitor = perf.PerfMonitor(display, clock=iter(range(0, 1 << 62, 1000)).__next__)
+    per_frame = time_frames(lambda n: monitor.refresh(), 20000) - bare
+    with contextlib.redirect_stdout(io.StringIO()):
+        report = time_frames(lambda n: monitor.end_window(monitor.window_ns + perf.NS_PER_SECOND), 500)
+
+    rows = []
+    for name, (_, _, _, update) in recorder.SCENES.items():
+        scene = recorder.make_scene(name)
+
+        def step(n):
+            update(scene, n)
+            scene.display.refresh()
+
+        frame = time_frames(step, args.frames)
+        # One report per second at the scene's host frame rate.
+        share = (per_frame + report * frame) / frame
+        rows.append([name, "%.2f" % (frame * 1000), "%.2f" % (per_frame * 1e6),
+                     "%.0f" % (report * 1e6), "%.3f%%" % (share * 100)])
+    print_table(["scene", "frame ms", "per frame us", "report us", "overhead"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Playback cost and size of recorded frame streams against live rendering.
+
+    python -m host.bench_playback [--frames N] [--scenes cube fire ...]
+
+Each scene is recorded with ``host.recorder`` into a temporary stream and
+then played back with ``framestream.FramePlayer`` into a fresh bitmap, with
+every played frame checked against the recording. ``compute`` is the
+scene's own update, ``playback`` reading and applying one recorded frame.
+Sizes are per second of animation at the scene's own frame rate; ``raw`` is
+one byte per pixel per frame. Playback is mostly bitmaptools calls, which
+are C on the board but Python stand-ins here, so scenes that change most
+pixels every frame (fire, ripples) look worse here than they are.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from host import backend, recorder
+from host.benchmark import print_table
+
+backend.install()
+
+import displayio  # noqa: E402
+from framestream import FramePlayer  # noqa: E402
+
+
+def bench_scene(name, frames, directory):
+    frame_ms, update = recorder.SCENES[name][2:]
+    scene = recorder.make_scene(name)
+    path = os.path.join(directory, name + ".frs")
+    expected = []
+    compute = 0.0
+    with open(path, "wb") as file:
+        stream = recorder.FrameRecorder(file, scene.bitmap.width, scene.bitmap.height, frame_ms)
+        for n in range(frames):
+            start = time.perf_counter()
+            update(scene, n)
+            compute += time.perf_counter() - start
+            stream.add(scene.bitmap, scene.palette)
+            expected.append(bytes(scene.bitmap._data))
+
+    bitmap = displayio.Bitmap(scene.bitmap.width, scene.bitmap.height, scene.bitmap.value_count)
+    palette = displayio.Palette(len(scene.palette))
+    player = FramePlayer(path, bitmap, palette, loop=False)
+    playback = 0.0
+    for frame in expected:
+        start = time.perf_counter()
+        player.next_frame()
+        playback += time.perf_counter() - start
+        if bytes(bitmap._data) != frame:
+            raise AssertionError("%s: frame %d does not match the recording" % (name, player.frames))
+    player.close()
+
+    seconds = frames * frame_ms / 1000
+    raw = scene.bitmap.width * scene.bitmap.height * frames
+    return [
+        name,
+        "%d fps" % (1000 // frame_ms),
+        "%.1f" % (stream.bytes / seconds / 1024),
+        "%.1f" % (raw / seconds / 1024),
+        "%.1fx" % (raw / stream.bytes),
+        "%.2f" % (compute / frames * 1000),
+        "%.2f" % (playback / frames * 1000),
+        "%.1fx" % (compute / playback),
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--frames", type=int, default=150)
+    parser.add_argument("--scenes", nargs="+", default=sorted(recorder.SCENES),
+                        choices=sorted(recorder.SCENES))
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        rows = [bench_scene(name, args.frames, directory) for name in args.scenes]
+    print_table(["scene", "rate", "KB/s", "raw KB/s", "ratio", "compute ms",
+                 "playback ms", "speedup"], rows)
+
+
+if __name__ == "__main__":
+    main()
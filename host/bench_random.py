@@ -0,0 +1,82 @@
+"""Cost of the fire's per-frame randomness: random module calls against fastrand.
+
+    python -m host.bench_random [--frames N]
+
+Each case produces one frame's worth of randomness for a 64x32 fire: a decay
+of 0-2 for the 1984 cells above the bottom row and a light level for the 64
+bottom cells. ``uniform x30`` is the per-frame drift of CosmicWanderers.
+On CPython the C-coded random module is quick per call, so the gain comes
+from making fewer calls: fill() and, above all, the pre-generated tables.
+"""
+
+import argparse
+import random
+
+import fastrand
+from host.benchmark import print_table, time_frames
+
+WIDTH = 64
+HEIGHT = 32
+CELLS = WIDTH * (HEIGHT - 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--frames", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = fastrand.XorShift(1)
+    decay = bytearray(CELLS)
+    source = bytearray(WIDTH)
+    decay_tables = fastrand.NoiseTables(CELLS, (0, 1, 2), rng=rng)
+    source_tables = fastrand.NoiseTables(WIDTH, (36,) * 7 + (18,) * 3, rng=rng)
+
+    def module_calls(n):
+        for i in range(CELLS):
+            decay[i] = random.randint(0, 2)
+        for i in range(WIDTH):
+            source[i] = 36 if random.random() > 0.3 else 18
+
+    def xorshift_calls(n):
+        for i in range(CELLS):
+            decay[i] = rng.randint(0, 2)
+        for i in range(WIDTH):
+            source[i] = 36 if rng.random() > 0.3 else 18
+
+    def xorshift_fill(n):
+        rng.fill(decay, (0, 1, 2))
+        rng.fill(source, (36,) * 7 + (18,) * 3)
+
+    def noise_tables(n):
+        decay_tables.next()
+        source_tables.next()
+
+    def module_uniform(n):
+        for _ in range(30):
+            random.uniform(-0.05, 0.05)
+
+    def xorshift_uniform(n):
+        for _ in range(30):
+            rng.uniform(-0.05, 0.05)
+
+    cases = [
+        ("random.randint/random", module_calls),
+        ("XorShift.randint/random", xorshift_calls),
+        ("XorShift.fill", xorshift_fill),
+        ("NoiseTables.next", noise_tables),
+        ("random.uniform x30", module_uniform),
+        ("XorShift.uniform x30", xorshift_uniform),
+    ]
+    rows = []
+    for name, step in cases:
+        seconds = time_frames(step, args.frames)
+        rows.append([name, "%.1f" % (seconds * 1e6), "%.0f" % (1 / seconds)])
+    print_table(["per frame", "us/frame", "frames/s"], rows)
+
+    a = fastrand.XorShift(42).fill(bytearray(16), (0, 1, 2))
+    b = fastrand.XorShift(42).fill(bytearray(16), (0, 1, 2))
+    print("\nseeded fills repeat:", a == b)
+
+
+if __name__ == "__main__":
+    main()
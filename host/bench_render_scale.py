@@ -0,0 +1,62 @@
+"""Frame time of the fire and fractal scenes at reduced render resolutions.
+
+    python -m host.bench_render_scale [--frames N]
+
+Each scene computes its frame at the render size and displayio stretches it
+over the 64x32 panel. ``compute`` is the scene's own per-frame Python work,
+which is what the MatrixPortal spends its time on; ``+refresh`` adds the host
+stand-in compositor and is only indicative.
+"""
+
+import argparse
+
+from host import backend, scripts
+from host.benchmark import print_table, time_frames
+
+backend.install()
+
+RENDER_SIZES = [(64, 32), (64, 16), (32, 16)]
+
+
+def bench_scene(name, make_scene, update, frames):
+    rows = []
+    base = None
+    for size in RENDER_SIZES:
+        scene = make_scene(size)
+        compute = time_frames(lambda n: update(scene, n), frames)
+
+        def update_and_refresh(n):
+            update(scene, n)
+            scene.display.refresh()
+
+        total = time_frames(update_and_refresh, frames)
+        base = base or compute
+        rows.append([
+            name,
+            "%dx%d" % size,
+            size[0] * size[1],
+            "%.2f" % (compute * 1000),
+            "%.2fx" % (base / compute),
+            "%.2f" % (total * 1000),
+        ])
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--frames", type=int, default=30)
+    args = parser.parse_args()
+
+    fire = scripts.load("FirePlace.py")
+    fractal = scripts.load("Abstract .py")
+    rows = bench_scene(
+        "fire", lambda size: fire.Fireplace(render_size=size),
+        lambda scene, n: scene.update(), args.frames)
+    rows += bench_scene(
+        "fractal", lambda size: fractal.AbstractFractalExplorer(render_size=size),
+        lambda scene, n: scene.update(n * 0.1), args.frames)
+    print_table(["scene", "render", "pixels", "compute ms", "speedup", "+refresh ms"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Panel refreshes and label layouts of MCP9808.py over a simulated hour.
+
+    python -m host.bench_temperature_display [--minutes N] [--noise C]
+
+The script's scheduler is driven by a fake clock, so an hour passes in a few
+seconds, and the sensor stand-in follows a slow indoor temperature swing with
+a little reading noise. ``before`` is what the original loop cost: it read
+the sensor, set the label and refreshed once a second, 3,600 times an hour.
+``now`` is the scheduled loop, which only lays the label out and refreshes
+when the shown text or graph changed. With the default ``BLINK_SECONDS =
+0`` and the default reading noise that is about half as often. The
+``0.5s`` row turns on the blink of the newest graph point, which refreshes
+twice a second, twice as often as the original loop. Each refresh on the
+board redraws the whole panel, so fewer refreshes leave more time for the
+matrix and less for displayio.
+"""
+
+import argparse
+import math
+import random
+
+from host import backend, scripts
+from host.benchmark import print_table
+
+backend.install()
+
+from scheduler import NS_PER_SECOND, Scheduler  # noqa: E402
+
+
+def simulate(thermometer, seconds, blink_seconds, noise, seed=0):
+    """Run the script's tasks for seconds of fake time.
+
+    Returns ``(passes, reads, layouts, refreshes)``: loop passes, sensor reads,
+    label layouts and panel refreshes.
+    """
+    now = [0]
+    rng = random.Random(seed)
+    sensor = thermometer.bus.i2c.devices[thermometer.mcp9808.address]
+    sensor.source = lambda: (
+        21.0 + 0.5 * math.sin(2 * math.pi * now[0] / NS_PER_SECOND / 3600) + rng.gauss(0, noise))
+    thermometer.BLINK_SECONDS = blink_seconds
+    thermometer.shown_text = None
+    thermometer.needs_refresh = True
+    scheduler = Scheduler(clock=lambda: now[0])
+    thermometer.start_tasks(scheduler)
+
+    reads = sensor.reads
+    layouts = thermometer.temp_label.layout_count
+    refreshes = thermometer.display.refresh_count
+    end = seconds * NS_PER_SECOND
+    passes = 0
+    while now[0] < end:
+        scheduler.run_pending()
+        thermometer.refresh_if_changed()
+        passes += 1
+        # Same wake-up rule as Scheduler.sleep_until_next.
+        now[0] = min(min(task.due_ns for task in scheduler.tasks), now[0] + NS_PER_SECOND)
+    return (
+        passes,
+        sensor.reads - reads,
+        thermometer.temp_label.layout_count - layouts,
+        thermometer.display.refresh_count - refreshes,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--minutes", type=int, default=60, help="simulated time")
+    parser.add_argument("--noise", type=float, default=0.03,
+                        help="standard deviation of the reading noise in Celsius")
+    args = parser.parse_args()
+
+    thermometer = scripts.load("MCP9808.py")
+    rows = []
+    # The original loop: one read, label layout and refresh per second.
+    before = args.minutes * 60
+    for blink in (0, 0.5):
+        _, reads, layouts, refreshes = simulate(
+            thermometer, args.minutes * 60, blink, args.noise)
+        rows.append([
+            "%gs" % blink if blink else "off",
+            reads,
+            "%d -> %d" % (before, layouts),
+            "%d -> %d" % (before, refreshes),
+            "%.1f%%" % (100 * refreshes / before),
+        ])
+    print("%d simulated minutes" % args.minutes)
+    print_table(["blink", "readings", "layouts before -> now",
+                 "refreshes before -> now", "refreshes kept"], rows)
+
+
+if __name__ == "__main__":
+    main()
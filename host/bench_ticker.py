@@ -0,0 +1,87 @@
+"""Cost of a scroll step: re-rendering the text against ``ticker.Ticker``.
+
+    python -m host.bench_ticker [--steps N] [--swap-every N]
+
+``re-render`` clears a full-width text bitmap and draws the whole message
+again one pixel further left on every step, which is what rebuilding a
+label's layout per step amounts to. ``ticker`` streams one glyph column per
+step into a column ring and moves two TileGrids. Every ``--swap-every``
+steps the text is replaced by a new reading, as a temperature ticker would;
+the max column shows whether a swap stalls the scroll.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from host import backend, bdf2atlas, scripts
+from host.benchmark import print_table
+
+backend.install()
+
+import displayio  # noqa: E402
+from glyphatlas import AtlasFont  # noqa: E402
+from ticker import Ticker  # noqa: E402
+
+WIDTH = 64
+
+
+def reading(n):
+    return "Indoor %.1f°F  Humidity %d%%  Pressure %d hPa" % (68 + n % 70 / 10, 40 + n % 17, 1000 + n % 23)
+
+
+def time_steps(step, steps):
+    """Return (mean, max) seconds of step(n) over steps calls."""
+    worst = 0
+    start = time.perf_counter()
+    for n in range(steps):
+        before = time.perf_counter()
+        step(n)
+        worst = max(worst, time.perf_counter() - before)
+    return (time.perf_counter() - start) / steps, worst
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--steps", type=int, default=2000)
+    parser.add_argument("--swap-every", type=int, default=100)
+    args = parser.parse_args()
+
+    font_data = bdf2atlas.build_atlas(
+        bdf2atlas.read_bdf(bdf2atlas.open_bdf(os.path.join(scripts.ROOT, "Fonts_lib.zip"))),
+        code_page="cp1251")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "font.gla")
+        with open(path, "wb") as file:
+            file.write(font_data)
+        font = AtlasFont(path)
+
+        bitmap = displayio.Bitmap(WIDTH, font.height, 2)
+        state = {"text": reading(0)}
+
+        def rerender(n):
+            if n % args.swap_every == 0:
+                state["text"] = reading(n)
+            text = state["text"]
+            span = font.text_width(text) + WIDTH
+            bitmap.fill(0)
+            font.draw(bitmap, text, WIDTH - n % span, 0)
+
+        ticker = Ticker(font, WIDTH, text=reading(0))
+
+        def scroll(n):
+            if n % args.swap_every == 0:
+                ticker.set_text(reading(n))
+            ticker.step()
+
+        rows = []
+        for name, step in (("re-render", rerender), ("ticker", scroll)):
+            mean, worst = time_steps(step, args.steps)
+            rows.append([name, "%.3f" % (mean * 1000), "%.3f" % (worst * 1000)])
+    print("%d steps, %d px wide, text swapped every %d steps" % (args.steps, WIDTH, args.swap_every))
+    print_table(["method", "mean ms/step", "max ms/step"], rows)
+
+
+if __name__ == "__main__":
+    main()
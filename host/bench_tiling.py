@@ -0,0 +1,70 @@
+"""Frame time against panel area and worker processes.
+
+    python -m host.bench_tiling [--frames N] [--processes 1 2 4]
+
+Every layout in ``panel.LAYOUTS`` (one panel up to a 128x64 chain of four)
+runs the fire and the cube at the display's full size. ``compute`` is the
+scene's own update; ``refresh`` composites the frame with the stand-in
+display, serially and with ``host.parallel.BandRenderer`` over each number
+of processes. Parallel bands only help with as many cores as processes;
+the core count of the machine is printed first.
+"""
+
+import argparse
+import os
+
+from host import backend, scripts
+from host.benchmark import print_table, time_frames
+
+backend.install()
+
+import panel  # noqa: E402
+from host.parallel import BandRenderer  # noqa: E402
+
+SCENES = {
+    "fire": ("FirePlace.py", "Fireplace"),
+    "cube": ("3D_Cube.py", "RotatingCube"),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--frames", type=int, default=10)
+    parser.add_argument("--processes", type=int, nargs="+", default=[2, 4])
+    args = parser.parse_args()
+
+    renderers = {processes: BandRenderer(processes) for processes in args.processes}
+    rows = []
+    try:
+        for name, (filename, class_name) in SCENES.items():
+            scene_class = getattr(scripts.load(filename), class_name)
+            base = None
+            for layout, size in panel.LAYOUTS.items():
+                scene = scene_class(size=size)
+                compute = time_frames(lambda n: scene.update(), args.frames)
+                scene.display.renderer = None
+                serial = time_frames(lambda n: scene.display.refresh(), args.frames)
+                base = base or compute + serial
+                row = [name, layout, "%.2f" % (compute * 1000), "%.2f" % (serial * 1000)]
+                best = serial
+                for processes in args.processes:
+                    scene.display.renderer = renderers[processes]
+                    pooled = time_frames(lambda n: scene.display.refresh(), args.frames)
+                    best = min(best, pooled)
+                    row.append("%.2f" % (pooled * 1000))
+                row.append("%.1fx" % ((compute + best) / base))
+                rows.append(row)
+    finally:
+        for renderer in renderers.values():
+            renderer.close()
+
+    print("%d cores" % os.cpu_count())
+    print_table(
+        ["scene", "layout", "compute ms", "refresh ms"]
+        + ["%d procs ms" % processes for processes in args.processes]
+        + ["best frame vs 64x32"],
+        rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Pixel writes per second: direct palette indices against truecolor.ColorMap.
+
+    python -m host.bench_truecolor [--frames N]
+
+Each row draws a frame of the 64x32 bitmap pixel by pixel. ``index`` writes
+a palette index the scene picked itself, as the scenes used to;
+``Canvas`` writes the 0xRRGGBB color through ``truecolor.Canvas`` and its
+``ColorMap``. The color sets stress the map differently:
+
+* ``7 colors``: the Wanderers' bright colors, all hits after the first
+  frame.
+* ``hue drift``: 15 hues sliding around the wheel every frame, more
+  colors over time than the palette holds, so entries are evicted.
+* ``gradient``: every pixel a different color, more than the 255-entry
+  palette holds in one frame, so colors are remapped to their nearest
+  entry.
+
+``hit %``, ``evictions`` and ``remaps`` are per frame.
+"""
+
+import argparse
+
+from host import backend
+from host.benchmark import print_table, time_frames
+
+backend.install()
+
+import displayio  # noqa: E402
+import palettes  # noqa: E402
+import truecolor  # noqa: E402
+
+WIDTH, HEIGHT = 64, 32
+
+
+def seven_colors(n):
+    bright = (0xFF0000, 0xFFFF00, 0x00FF00, 0x00FFFF, 0xFF00FF, 0xFFA500, 0xFFFFFF)
+    return [bright[i % 7] for i in range(WIDTH * HEIGHT)]
+
+
+def hue_drift(n):
+    wheel = palettes.hue_wheel(1024)
+    return [wheel[(n * 8 + (i % 15) * 64) % 1024] for i in range(WIDTH * HEIGHT)]
+
+
+def gradient(n):
+    return [(((x * 4 + n) & 0xFF) << 16) | ((y * 8) << 8) | ((x + y * 2) & 0xFF)
+            for y in range(HEIGHT) for x in range(WIDTH)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--frames", type=int, default=20)
+    args = parser.parse_args()
+
+    rows = []
+    for name, make, palette_size in (
+            ("7 colors", seven_colors, 8), ("hue drift", hue_drift, 16), ("gradient", gradient, 256)):
+        frames = [make(n) for n in range(args.frames + 3)]
+        bitmap = displayio.Bitmap(WIDTH, HEIGHT, palette_size)
+        palette = displayio.Palette(palette_size)
+        indices = [[1 + (i % (palette_size - 1)) for i in range(WIDTH * HEIGHT)]] * len(frames)
+
+        def draw_indices(n):
+            pixels = indices[n]
+            for i in range(WIDTH * HEIGHT):
+                bitmap[i] = pixels[i]
+
+        colors = truecolor.ColorMap(palette)
+        canvas = truecolor.Canvas(bitmap, colors)
+
+        def draw_colors(n):
+            pixels = frames[n]
+            for i in range(WIDTH * HEIGHT):
+                canvas[i] = pixels[i]
+            colors.next_frame()
+
+        direct = time_frames(draw_indices, args.frames)
+        mapped = time_frames(draw_colors, args.frames)
+        lookups = colors.hits + colors.misses
+        frame_count = args.frames + 3
+        rows.append([
+            name, palette_size,
+            "%.2f" % (WIDTH * HEIGHT / direct / 1e6),
+            "%.2f" % (WIDTH * HEIGHT / mapped / 1e6),
+            "%.1fx" % (mapped / direct),
+            "%.1f" % (100 * colors.hits / lookups),
+            "%.0f" % (colors.evictions / frame_count),
+            "%.0f" % (colors.remaps / frame_count),
+        ])
+    print_table(["colors", "palette", "index M/s", "Canvas M/s", "cost", "hit %", "evictions",
+                 "remaps"], rows)
+
+
+if __name__ == "__main__":
+    main()
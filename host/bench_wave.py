@@ -0,0 +1,59 @@
+"""LineOdyssey frame time against grid resolution, flat and as a wave surface.
+
+    python -m host.bench_wave [--frames N]
+
+For each grid size (points per side) the rows time:
+
+* ``flat``: the original rotating grid, rotating every point on its own.
+* ``tables``: the wave surface with heights from sine tables, computed once
+  per row, column and diagonal of points, as on a board without ulab.
+* ``vectorized``: the wave surface computed as whole arrays, with NumPy
+  here and ulab on the board (skipped if NumPy is not installed).
+
+``points ms`` is the time to compute and project the points alone,
+``frame ms`` the whole update including drawing the lines, which grows
+with the number of line segments. Times are for the host; the board is
+much slower, but the ratios between rows are a guide.
+"""
+
+import argparse
+
+from host import backend, scripts
+from host.benchmark import print_table, time_frames
+
+backend.install()
+
+GRIDS = (8, 16, 24, 32)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--frames", type=int, default=20)
+    args = parser.parse_args()
+
+    odyssey = scripts.load("LineOdyssey.py")
+    modes = [("flat", False, None), ("tables", True, False)]
+    if odyssey.np is not None:
+        modes.append(("vectorized", True, True))
+
+    rows = []
+    for grid in GRIDS:
+        for name, wave, vectorized in modes:
+            scene = odyssey.LineOdyssey(wave=wave, grid=grid, vectorized=vectorized)
+            if not wave:
+                points = None
+            elif vectorized:
+                points = time_frames(lambda n: scene.surface_vectorized(), args.frames)
+            else:
+                points = time_frames(lambda n: scene.surface_from_tables(), args.frames)
+            frame = time_frames(lambda n: scene.update(), args.frames)
+            rows.append((
+                "%dx%d" % (grid, grid), name, grid * grid, 2 * grid * (grid - 1),
+                "-" if points is None else "%.3f" % (points * 1000),
+                "%.2f" % (frame * 1000),
+            ))
+    print_table(("grid", "mode", "points", "segments", "points ms", "frame ms"), rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+"""Small helpers shared by the ``host.bench_*`` benchmarks."""
+
+import time
+
+
+def time_frames(step, frames=50, warmup=3):
+    """Call ``step(frame_number)`` repeatedly and return mean seconds per call.
+
+    The first ``warmup`` calls are not timed.
+    """
+    for n in range(warmup):
+        step(n)
+    start = time.perf_counter()
+    for n in range(warmup, warmup + frames):
+        step(n)
+    return (time.perf_counter() - start) / frames
+
+
+def print_table(headers, rows):
+    """Print rows as a plain text table with right-aligned columns."""
+    cells = [[str(h) for h in headers]] + [[str(c) for c in row] for row in rows]
+    widths = [max(len(row[i]) for row in cells) for i in range(len(headers))]
+    for n, row in enumerate(cells):
+        print("  ".join(cell.rjust(width) for cell, width in zip(row, widths)))
+        if n == 0:
+            print("  ".join("-" * width for width in widths))
@@ -0,0 +1,115 @@
+"""Write palette-indexed frames as an animated GIF.
+
+``write_gif`` is used by ``host.bench_gif`` to turn recorded scenes into
+test animations, and can make GIFs for ``Gallery.py`` from any frames.
+With ``regions=True`` (the default) each frame after the first stores only
+the rectangle that changed since the previous one, with disposal method 1
+(leave the frame in place), so a decoder that writes only the stored
+rectangle updates only what changed. ``regions=False`` stores every frame
+whole, for comparison.
+"""
+
+import struct
+
+
+def _lzw(indices, min_size):
+    clear = 1 << min_size
+    end = clear + 1
+    out = bytearray()
+    state = [0, 0]  # Bit buffer, bits in it.
+
+    def emit(code, size):
+        bits = state[0] | (code << state[1])
+        count = state[1] + size
+        while count >= 8:
+            out.append(bits & 0xFF)
+            bits >>= 8
+            count -= 8
+        state[0], state[1] = bits, count
+
+    size = min_size + 1
+    next_code = end + 1
+    table = {}
+    emit(clear, size)
+    prefix = indices[0]
+    for index in indices[1:]:
+        key = (prefix << 8) | index
+        code = table.get(key)
+        if code is not None:
+            prefix = code
+            continue
+        emit(prefix, size)
+        if next_code < 4096:
+            table[key] = next_code
+            next_code += 1
+            if next_code > 1 << size and size < 12:
+                size += 1
+        else:
+            emit(clear, size)
+            table.clear()
+            size = min_size + 1
+            next_code = end + 1
+        prefix = index
+    emit(prefix, size)
+    emit(end, size)
+    if state[1]:
+        out.append(state[0] & 0xFF)
+    blocks = bytearray()
+    for i in range(0, len(out), 255):
+        chunk = out[i:i + 255]
+        blocks.append(len(chunk))
+        blocks += chunk
+    blocks.append(0)
+    return bytes(blocks)
+
+
+def _changed(previous, current, width, height):
+    # Bounding box (left, top, right, bottom) of the pixels that differ, or None.
+    left, top, right, bottom = width, height, -1, -1
+    for y in range(height):
+        row = y * width
+        if previous[row:row + width] == current[row:row + width]:
+            continue
+        top = min(top, y)
+        bottom = y
+        for x in range(width):
+            if previous[row + x] != current[row + x]:
+                left = min(left, x)
+                break
+        for x in range(width - 1, -1, -1):
+            if previous[row + x] != current[row + x]:
+                right = max(right, x)
+                break
+    return None if bottom < 0 else (left, top, right + 1, bottom + 1)
+
+
+def write_gif(path, width, height, frames, colors, delay_ms, regions=True):
+    """Write frames (width * height palette indices each) with colors (0xRRGGBB) to path."""
+    bits = max(1, (len(colors) - 1).bit_length())
+    table = bytearray()
+    for i in range(1 << bits):
+        color = colors[i] if i < len(colors) else 0
+        table += bytes(((color >> 16) & 0xFF, (color >> 8) & 0xFF, color & 0xFF))
+    min_size = max(2, bits)
+    with open(path, "wb") as file:
+        file.write(b"GIF89a" + struct.pack("<HHBBB", width, height, 0x80 | 0x70 | (bits - 1), 0, 0))
+        file.write(table)
+        # Loop forever.
+        file.write(b"\x21\xFF\x0BNETSCAPE2.0\x03\x01\x00\x00\x00")
+        previous = None
+        for frame in frames:
+            frame = bytes(frame)
+            if previous is None or not regions:
+                box = (0, 0, width, height)
+            else:
+                # An unchanged frame still needs one pixel to carry its delay.
+                box = _changed(previous, frame, width, height) or (0, 0, 1, 1)
+            left, top, right, bottom = box
+            pixels = bytearray()
+            for y in range(top, bottom):
+                pixels += frame[y * width + left:y * width + right]
+            file.write(struct.pack("<BBBBHBB", 0x21, 0xF9, 4, 1 << 2, round(delay_ms / 10), 0, 0))
+            file.write(struct.pack("<BHHHHB", 0x2C, left, top, right - left, bottom - top, 0))
+            file.write(bytes((min_size,)) + _lzw(pixels, min_size))
+            previous = frame
+        file.write(b"\x3B")
@@ -0,0 +1,159 @@
+"""Drive the button scripts on the host from stdin or a scripted event file.
+
+    python -m host.keys playlist [--script events.txt] [--frames N]
+    python -m host.keys pong [--script events.txt] [--frames N]
+
+The ``keypad`` stand-in in ``host/backend.py`` has no pins; it takes its
+events from a feed installed here, which it calls whenever a scene drains
+its queue, so the scene never waits on input:
+
+* ``--script`` reads lines of ``<seconds> <up|down> [press|release]``
+  (``#`` starts a comment). Without press or release the button is tapped:
+  pressed and released together. Time runs with the frames (each frame
+  adds the scene's frame time), so a script plays back the same way every
+  run and as fast as the host can go.
+* Without ``--script``, lines typed on stdin are read as they arrive:
+  ``u`` or ``up`` and ``d`` or ``down`` tap a button, ``+up`` holds it
+  and ``-up`` lets it go. Frames then run in real time.
+
+The tool prints the scene shown (``playlist``) or the left paddle and
+score (``pong``) whenever they change.
+"""
+
+import argparse
+import os
+import select
+import sys
+import time
+
+from host import backend, scripts
+
+backend.install()
+
+import buttons  # noqa: E402
+
+NS_PER_SECOND = 1000000000
+KEYS = {"u": 0, "up": 0, "d": 1, "down": 1}
+
+
+def parse_event(word):
+    """(key number, pressed) events for a word such as up, +down or -d."""
+    action = word[0] if word[:1] in "+-" else ""
+    key = KEYS.get(word.lstrip("+-").lower())
+    if key is None:
+        raise ValueError("unknown button: %r" % word)
+    if action == "+":
+        return [(key, True)]
+    if action == "-":
+        return [(key, False)]
+    return [(key, True), (key, False)]
+
+
+class ScriptFeed:
+    def __init__(self, lines, clock):
+        """Events from script lines, due at their time in seconds on clock (nanoseconds)."""
+        self.clock = clock
+        self.start = clock()
+        self.events = []  # (due ns, key number, pressed), in order.
+        for number, line in enumerate(lines, 1):
+            line = line.split("#")[0].split()
+            if not line:
+                continue
+            if len(line) == 3:
+                line[1] = {"press": "+", "release": "-"}[line[2]] + line[1]
+            try:
+                due = int(float(line[0]) * NS_PER_SECOND)
+                for key, pressed in parse_event(line[1]):
+                    self.events.append((due, key, pressed))
+            except (ValueError, KeyError, IndexError):
+                raise ValueError("line %d: expected <seconds> <up|down> [press|release]" % number)
+        self.events.sort(key=lambda event: event[0])
+
+    def __call__(self, queue):
+        now = self.clock() - self.start
+        while self.events and self.events[0][0] <= now:
+            _, key, pressed = self.events.pop(0)
+            queue._put(key, pressed)
+
+
+class StdinFeed:
+    def __init__(self, stream=sys.stdin):
+        """Events from lines typed on stream, read only when some are waiting."""
+        self.fd = stream.fileno()
+        self.pending = b""
+        self.closed = False
+
+    def __call__(self, queue):
+        while not self.closed and select.select([self.fd], [], [], 0)[0]:
+            data = os.read(self.fd, 256)
+            if not data:
+                self.closed = True
+                break
+            self.pending += data
+        *lines, self.pending = self.pending.split(b"\n")
+        for line in lines:
+            for word in line.decode().split():
+                try:
+                    for key, pressed in parse_event(word):
+                        queue._put(key, pressed)
+                except ValueError as e:
+                    print(e)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("scene", choices=("playlist", "pong"))
+    parser.add_argument("--script", help="scripted event file (default: read stdin)")
+    parser.add_argument("--frames", type=int, help="stop after this many frames")
+    parser.add_argument("--seconds", type=float, default=60, help="playlist: seconds per scene")
+    args = parser.parse_args()
+
+    now = [0]
+    if args.script:
+        def clock():
+            return now[0]
+        with open(args.script) as file:
+            backend.keypad.Keys.feed = ScriptFeed(file, clock)
+    else:
+        clock = time.monotonic_ns
+        backend.keypad.Keys.feed = StdinFeed()
+        print("type u/d (tap), +u/-u (hold/release), then Enter")
+
+    if args.scene == "playlist":
+        playlist = scripts.load("Playlist.py").Playlist(
+            seconds=args.seconds, controls=buttons.Buttons(), clock=clock)
+
+        def frame():
+            playlist.frame()
+            return playlist.frame_ns, playlist.scenes[playlist.position][1]
+    else:
+        game = scripts.load("Pong.py").PongGame(controls=buttons.Buttons())
+
+        def frame():
+            game.step()
+            game.draw_paddles()
+            game.draw_ball()
+            game.update_display()
+            return 20000000, "%s paddle y=%d  score %d-%d" % (
+                "human" if game.human else "AI", game.paddle1_y, game.score1, game.score2)
+
+    start = clock()
+    shown = None
+    n = 0
+    try:
+        while args.frames is None or n < args.frames:
+            frame_ns, status = frame()
+            if status != shown:
+                shown = status
+                print("%7.2fs  frame %5d  %s" % ((clock() - start) / NS_PER_SECOND, n, status))
+            n += 1
+            if args.script:
+                now[0] += frame_ns
+            else:
+                time.sleep(frame_ns / NS_PER_SECOND)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
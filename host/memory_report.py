@@ -0,0 +1,87 @@
+"""Bitmap memory of each scene, sized by its colors against the old 8-bit bitmaps.
+
+    python -m host.memory_report [--frames N]
+
+Every scene is created and stepped for a few frames, then each bitmap it
+shows (its own and its sprites') is measured as displayio stores it on the
+board: ``bitmaps.bitmap_bytes`` at the bitmap's bits per pixel, rows padded
+to 32-bit words. ``before`` sizes the same bitmaps for the ``value_count``
+the scene used to allocate. ``max index`` is the largest palette index
+found in the scene's bitmaps, and ``warnings`` counts writes of an index
+the bitmap has no color for, which the host backend reports.
+"""
+
+import argparse
+import warnings
+
+from host import backend, scripts
+from host.benchmark import print_table
+
+backend.install()
+
+import bitmaps  # noqa: E402
+import displayio  # noqa: E402
+import fastrand  # noqa: E402
+
+# name: (script, class, step(scene, frame number), value_count allocated before)
+SCENES = {
+    "cube": ("3D_Cube.py", "RotatingCube", lambda scene, n: scene.update(), 256),
+    "odyssey": ("LineOdyssey.py", "LineOdyssey", lambda scene, n: scene.update(), 256),
+    "solar": ("Solar.py", "SolarSystemSimulator", lambda scene, n: scene.update(), 256),
+    "wanderers": ("Wanderers.py", "CosmicWanderers", lambda scene, n: scene.update_particles(), 256),
+    "pong": ("Pong.py", "PongGame", lambda scene, n: scene.step(), 256),
+    "life": ("Life.py", "GameOfLife", lambda scene, n: scene.update(), 2),
+    "fire": ("FirePlace.py", "Fireplace", lambda scene, n: scene.update(), 256),
+    "ripple": ("Ripple.py", "WaterRipples", lambda scene, n: scene.update(), 256),
+    "fractal": ("Abstract .py", "AbstractFractalExplorer", lambda scene, n: scene.update(n * 0.1), 16),
+}
+
+
+def shown_bitmaps(layer, found):
+    """Add the bitmaps of every TileGrid under layer to found (by id)."""
+    if isinstance(layer, displayio.TileGrid):
+        found[id(layer.bitmap)] = layer.bitmap
+    elif layer is not None:
+        for child in layer:
+            shown_bitmaps(child, found)
+    return found
+
+
+def report_scene(name, frames):
+    filename, class_name, step, before_count = SCENES[name]
+    fastrand.shared.seed(0)
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        scene = getattr(scripts.load(filename), class_name)()
+        for n in range(frames):
+            step(scene, n)
+    found = shown_bitmaps(scene.display.root_group, {})
+    main = scene.bitmap
+    now = sum(bitmaps.bitmap_bytes(b.width, b.height, b.value_count) for b in found.values())
+    before = sum(bitmaps.bitmap_bytes(b.width, b.height, before_count) for b in found.values())
+    return [
+        name,
+        len(scene.palette),
+        max(max(b._data) for b in found.values()),
+        "%d -> %d" % (bitmaps.bits_per_value(before_count), main.bits_per_value),
+        len(found),
+        before,
+        now,
+        "%.0f%%" % (100 * (before - now) / before),
+        len(caught),
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--frames", type=int, default=50)
+    args = parser.parse_args()
+
+    rows = [report_scene(name, args.frames) for name in SCENES]
+    print_table(["scene", "colors", "max index", "bits/pixel", "bitmaps", "before bytes",
+                 "bytes", "saved", "warnings"], rows)
+    print("total: %d -> %d bytes" % (sum(row[5] for row in rows), sum(row[6] for row in rows)))
+
+
+if __name__ == "__main__":
+    main()
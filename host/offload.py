@@ -0,0 +1,251 @@
+"""Render a scene on the host and stream its frames to the board over serial.
+
+    python -m host.offload fire /dev/ttyACM1 [--fps N] [--window 2]
+
+The board runs ``Offload.py``, which applies the frames as they arrive and
+refreshes the panel; the second argument is the board's USB serial *data*
+channel (enabled in its ``boot.py``), not the REPL console. Frames are the
+scene's palette-indexed bitmap, sent as the changed pixels only with the
+framed protocol of ``framelink.py``. At most ``--window`` frames are sent
+without an acknowledgement from the board; frames rendered while the window
+is full are dropped, so a slow link lowers the frame rate instead of
+building up latency. ``loopback()`` connects a sender to a board over a
+local pty pair for testing without hardware; see ``host.bench_offload``.
+"""
+
+import argparse
+import fcntl
+import os
+import select
+import struct
+import termios
+import time
+import tty
+
+from host import backend, recorder
+
+backend.install()
+
+from framelink import (  # noqa: E402
+    ACK, APPLIED, BLANK, FRAME, SIZE, PacketReader, next_seq, packet,
+)
+
+
+class SerialPort:
+    def __init__(self, fd, rate=None):
+        """
+        The serial device (or pty) open on fd, with the read, write and
+        in_waiting of a usb_cdc channel. rate limits reads to that many bytes
+        per second to model a slower link: the writer fills the link's buffer
+        and then waits, as it would for a real board.
+        """
+        if os.isatty(fd):
+            tty.setraw(fd)
+        os.set_blocking(fd, False)
+        self.fd = fd
+        self.rate = rate
+        self.credit = 0.0  # Bytes a rate-limited link has delivered but not yet read.
+        self.credited = time.perf_counter()
+
+    @classmethod
+    def open(cls, path, rate=None):
+        return cls(os.open(path, os.O_RDWR | os.O_NOCTTY), rate)
+
+    @property
+    def in_waiting(self):
+        return struct.unpack("i", fcntl.ioctl(self.fd, termios.FIONREAD, b"\0\0\0\0"))[0]
+
+    def read(self, count):
+        if self.rate:
+            now = time.perf_counter()
+            # Up to 10 ms of data arrives at once, like USB packets.
+            self.credit = min(self.credit + (now - self.credited) * self.rate, self.rate / 100)
+            self.credited = now
+            count = min(count, int(self.credit))
+            if count <= 0:
+                return b""
+        try:
+            data = os.read(self.fd, count)
+        except BlockingIOError:
+            return b""
+        self.credit -= len(data)
+        return data
+
+    def write(self, data):
+        """Write all of data, waiting while the link's buffer is full."""
+        view = memoryview(data)
+        while view:
+            try:
+                view = view[os.write(self.fd, view):]
+            except BlockingIOError:
+                select.select([], [self.fd], [])
+        return len(data)
+
+    def close(self):
+        os.close(self.fd)
+
+
+def loopback(rate=None):
+    """
+    Return (host port, board port), the two ends of a new pty pair. rate
+    limits the bytes per second the board can read.
+    """
+    host, board = os.openpty()
+    return SerialPort(host), SerialPort(board, rate)
+
+
+class FrameSender:
+    def __init__(self, port, width, height, window=2, timeout=0.25):
+        """
+        Send width x height frames to a board on port, with at most window
+        frames unacknowledged. After timeout seconds without an acknowledgement
+        the frames in flight are given up and the next frame is a keyframe.
+        """
+        self.port = port
+        self.width = width
+        self.window = window
+        self.timeout = timeout
+        self.reader = PacketReader(port, 3)
+        self.colors = None  # Colors of the last frame sent.
+        self.seq = BLANK   # Last frame sent.
+        self.base = BLANK  # Frame the next one is encoded against.
+        # Pixels and colors of the frames the board may hold or be about to
+        # hold; a blank bitmap's palette is unknown.
+        self.sent = {BLANK: bytes(width * height)}
+        self.sent_colors = {BLANK: None}
+        self.in_flight = []
+        self.stale = set()  # Frames in flight that were encoded before a re-base.
+        self.heard = time.perf_counter()  # Time of the last acknowledgement.
+        self.frames = 0
+        self.dropped = 0
+        self.acked = 0
+        self.rejected = 0
+        self.lost = 0
+        self.keyframes = 0
+        self.timeouts = 0
+        self.bytes = port.write(packet(SIZE, 0, struct.pack("<HH", width, height)))
+
+    def poll(self):
+        """Handle the acknowledgements that have arrived."""
+        while True:
+            got = self.reader.read()
+            if got is None:
+                return
+            kind, board_seq, payload = got
+            if kind != ACK:
+                continue
+            status, answered = struct.unpack("<BH", payload)
+            self.heard = time.perf_counter()
+            if answered in self.in_flight:
+                index = self.in_flight.index(answered)
+                self.lost += index  # Earlier frames never reached the board.
+                del self.in_flight[:index + 1]
+            if status == APPLIED:
+                self.acked += 1
+            else:
+                self.rejected += 1
+                if answered not in self.stale:
+                    # The board missed a frame: continue from the one it shows.
+                    self.base = board_seq if board_seq in self.sent else BLANK
+                    self.stale = set(self.in_flight)
+            self.stale.intersection_update(self.in_flight)
+            keep = set(self.in_flight)
+            keep.update((board_seq, self.base, BLANK))
+            self.sent = {seq: pixels for seq, pixels in self.sent.items() if seq in keep}
+            self.sent_colors = {seq: colors for seq, colors in self.sent_colors.items() if seq in keep}
+
+    @property
+    def busy(self):
+        """True while the window is full and a frame would be dropped."""
+        self.poll()
+        if self.in_flight and time.perf_counter() - self.heard > self.timeout:
+            self.timeouts += 1
+            self.in_flight = []
+            self.stale = set()
+            self.base = BLANK
+        return len(self.in_flight) >= self.window
+
+    def send(self, pixels, colors):
+        """Send a frame of pixels shown with colors (0xRRGGBB); False if it was dropped."""
+        if self.busy:
+            self.dropped += 1
+            return False
+        # The colors that changed since the base frame, sent with the frame.
+        colors = list(colors)
+        base_colors = self.sent_colors[self.base]
+        if base_colors is None:
+            changed = range(len(colors))
+        else:
+            changed = [i for i, color in enumerate(colors) if color != base_colors[i]]
+        palette = bytearray()
+        if changed:
+            first = changed[0]
+            palette += struct.pack("<H", first)
+            for color in colors[first:changed[-1] + 1]:
+                palette += bytes(((color >> 16) & 0xFF, (color >> 8) & 0xFF, color & 0xFF))
+        self.colors = colors
+
+        if not self.in_flight:
+            self.heard = time.perf_counter()  # The timeout runs from the first frame in flight.
+        pixels = bytes(pixels)
+        if self.base == BLANK:
+            self.keyframes += 1
+        ops = recorder.encode_frame(self.sent[self.base], pixels, self.width)
+        self.seq = next_seq(self.seq)
+        header = struct.pack("<HH", self.base, len(palette))
+        self.bytes += self.port.write(packet(FRAME, self.seq, header + palette + ops))
+        self.sent[self.seq] = pixels
+        self.sent_colors[self.seq] = colors
+        self.base = self.seq
+        self.in_flight.append(self.seq)
+        self.frames += 1
+        return True
+
+
+def stream(name, port, frames=None, fps=None, window=2):
+    """Render the scene name and send its frames on port; return the sender."""
+    frame_ms, update = recorder.SCENES[name][2:]
+    scene = recorder.make_scene(name)
+    sender = FrameSender(port, scene.bitmap.width, scene.bitmap.height, window)
+    frame_ns = 1000000000 // fps if fps else frame_ms * 1000000
+    next_ns = time.monotonic_ns()
+    n = 0
+    try:
+        while frames is None or n < frames:
+            update(scene, n)
+            sender.send(scene.bitmap._data, scene.palette._colors)
+            n += 1
+            next_ns += frame_ns
+            wait = next_ns - time.monotonic_ns()
+            if wait > 0:
+                time.sleep(wait / 1000000000)
+            else:
+                next_ns = time.monotonic_ns()  # Running late: don't try to catch up.
+    except KeyboardInterrupt:
+        pass
+    return sender
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("scene", choices=sorted(recorder.SCENES))
+    parser.add_argument("port", help="the board's USB serial data channel, e.g. /dev/ttyACM1")
+    parser.add_argument("--fps", type=float, help="frame rate (default: the scene's own)")
+    parser.add_argument("--window", type=int, default=2, help="frames sent ahead of the board")
+    parser.add_argument("--frames", type=int, help="stop after this many frames")
+    args = parser.parse_args()
+
+    port = SerialPort.open(args.port)
+    start = time.perf_counter()
+    try:
+        sender = stream(args.scene, port, args.frames, args.fps, args.window)
+    finally:
+        port.close()
+    seconds = time.perf_counter() - start
+    print("%d frames sent in %.1f s (%.1f fps), %d dropped, %.0f bytes per frame" % (
+        sender.frames, seconds, sender.frames / seconds, sender.dropped,
+        sender.bytes / max(sender.frames, 1)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,344 @@
+"""Memory-mapped stand-ins for ``displayio.OnDiskBitmap`` and ``gifio.OnDiskGif``.
+
+On the board both read images from flash as they are drawn or decoded
+instead of loading them into RAM. Here the file is memory-mapped, so the
+operating system pages it in on demand and none of it is copied onto the
+Python heap:
+
+* ``OnDiskBitmap`` reads each pixel of an uncompressed BMP (1, 4 or 8-bit
+  indexed, 16-bit RGB565 or 24-bit) from the mapping when the display
+  composites it. Indexed images get a ``Palette``, others a
+  ``ColorConverter``, as on the board.
+* ``OnDiskGif`` decodes one frame per ``next_frame()`` into its RGB565
+  (byte-swapped) ``bitmap``, like gifio. The LZW decoder keeps only its
+  4096-entry code tables and one row of palette indices, and writes each
+  row into the bitmap as soon as it is complete. Only the rectangle the
+  frame covers is written, so a GIF that stores just the changed region of
+  each frame rewrites just that region. Transparent pixels are skipped and
+  disposal methods 1 to 3 are followed; playback loops after the last frame.
+
+The decoder is plain Python, so it is far slower than gifio's C decoder;
+it is for checking output and comparing approaches, not for real timing.
+"""
+
+import mmap
+import struct
+from array import array
+
+from host import backend
+
+
+def _open(file):
+    if isinstance(file, str):
+        file = open(file, "rb")
+    return file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def rgb565_swapped(color):
+    """0xRRGGBB as the byte-swapped RGB565 value gifio writes."""
+    value = ((color >> 8) & 0xF800) | ((color >> 5) & 0x7E0) | ((color >> 3) & 0x1F)
+    return ((value & 0xFF) << 8) | (value >> 8)
+
+
+class _BMPPixels:
+    # Reads pixel values from the mapped file for TileGrid rendering.
+    def __init__(self, data, offset, width, height, bits, stride, top_down):
+        self.data = data
+        self.offset = offset
+        self.width = width
+        self.height = height
+        self.bits = bits
+        self.stride = stride
+        self.top_down = top_down
+
+    def __len__(self):
+        return self.width * self.height
+
+    def __getitem__(self, index):
+        y, x = divmod(index, self.width)
+        if not self.top_down:
+            y = self.height - 1 - y
+        row = self.offset + y * self.stride
+        bits = self.bits
+        data = self.data
+        if bits == 24:
+            i = row + 3 * x
+            return (data[i + 2] << 16) | (data[i + 1] << 8) | data[i]
+        if bits == 16:
+            i = row + 2 * x
+            return data[i] | (data[i + 1] << 8)
+        bit = x * bits
+        shift = 8 - bits - (bit & 7)
+        return (data[row + (bit >> 3)] >> shift) & ((1 << bits) - 1)
+
+
+class OnDiskBitmap:
+    def __init__(self, file):
+        self._file, data = _open(file)
+        if data[0:2] != b"BM":
+            raise ValueError("Invalid BMP file")
+        offset = struct.unpack_from("<I", data, 10)[0]
+        header_size, width, height, _, bits, compression = struct.unpack_from("<IiiHHI", data, 14)
+        colors_used = struct.unpack_from("<I", data, 46)[0] if header_size >= 40 else 0
+        if bits not in (1, 4, 8, 16, 24) or compression not in (0, 3):
+            raise ValueError("Only uncompressed 1, 4, 8, 16 and 24-bit BMPs are supported")
+        self.width = width
+        self.height = abs(height)
+        if bits <= 8:
+            count = colors_used or 1 << bits
+            self.pixel_shader = backend.Palette(count)
+            table = 14 + header_size
+            for i in range(count):
+                b, g, r = data[table + 4 * i:table + 4 * i + 3]
+                self.pixel_shader[i] = (r << 16) | (g << 8) | b
+        else:
+            space = backend.Colorspace.RGB888 if bits == 24 else backend.Colorspace.RGB565
+            self.pixel_shader = backend.ColorConverter(input_colorspace=space)
+        stride = (width * bits + 31) // 32 * 4
+        self._data = _BMPPixels(data, offset, width, self.height, bits, stride, height < 0)
+
+    def __getitem__(self, index):
+        if isinstance(index, tuple):
+            index = index[1] * self.width + index[0]
+        return self._data[index]
+
+
+# Rows of an interlaced GIF image come in four passes: (first row, step).
+INTERLACE_PASSES = ((0, 8), (4, 8), (2, 4), (1, 2))
+
+
+class OnDiskGif:
+    def __init__(self, file):
+        self._file, data = _open(file)
+        self._data = data
+        if data[0:6] not in (b"GIF87a", b"GIF89a"):
+            raise ValueError("Not a GIF file")
+        self.width, self.height, flags = struct.unpack_from("<HHB", data, 6)
+        pos = 13
+        self._global_colors = None
+        if flags & 0x80:
+            count = 2 << (flags & 7)
+            self._global_colors = self._color_table(pos, count)
+            pos += 3 * count
+        self._start = pos
+        self._pos = pos
+        self.bitmap = backend.Bitmap(self.width, self.height, 65536)
+        # LZW tables and one row of indices, allocated once for every frame.
+        self._prefix = array("H", [0]) * 4096
+        self._suffix = bytearray(4096)
+        self._first = bytearray(4096)
+        self._stack = bytearray(4097)
+        self._row = bytearray(self.width)
+        self._dispose = None  # (method, rectangle, saved pixels) of the frame shown.
+        self.pixels_written = 0  # By the last next_frame().
+        delays = self._scan()
+        self.frame_count = len(delays)
+        self.duration = sum(delays)
+        self.min_delay = min(delays, default=0)
+        self.max_delay = max(delays, default=0)
+
+    def _color_table(self, pos, count):
+        data = self._data
+        return array("H", [rgb565_swapped((data[i] << 16) | (data[i + 1] << 8) | data[i + 2])
+                           for i in range(pos, pos + 3 * count, 3)])
+
+    def _skip_blocks(self, pos):
+        data = self._data
+        while data[pos]:
+            pos += data[pos] + 1
+        return pos + 1
+
+    def _scan(self):
+        # Walk the blocks once for the frame delays, decoding nothing.
+        data = self._data
+        pos = self._start
+        delays = []
+        delay = 0
+        while pos < len(data) and data[pos] != 0x3B:
+            if data[pos] == 0x21:
+                if data[pos + 1] == 0xF9:
+                    delay = struct.unpack_from("<H", data, pos + 4)[0] / 100
+                pos = self._skip_blocks(pos + 2)
+            elif data[pos] == 0x2C:
+                flags = data[pos + 9]
+                pos += 10
+                if flags & 0x80:
+                    pos += 3 * (2 << (flags & 7))
+                pos = self._skip_blocks(pos + 1)
+                delays.append(delay)
+                delay = 0
+            else:
+                raise ValueError("Bad GIF block")
+        return delays
+
+    def next_frame(self):
+        """Decode the next frame into bitmap and return how long to show it, in seconds."""
+        self._apply_disposal()
+        data = self._data
+        pos = self._pos
+        delay = 0
+        transparent = None
+        disposal = 0
+        while True:
+            if pos >= len(data) or data[pos] == 0x3B:
+                if not self.frame_count:
+                    raise ValueError("GIF has no frames")
+                pos = self._start  # Loop.
+                continue
+            if data[pos] == 0x21:
+                if data[pos + 1] == 0xF9:
+                    packed, centiseconds, index = struct.unpack_from("<BHB", data, pos + 3)
+                    delay = centiseconds / 100
+                    disposal = (packed >> 2) & 7
+                    transparent = index if packed & 1 else None
+                pos = self._skip_blocks(pos + 2)
+                continue
+            left, top, width, height, flags = struct.unpack_from("<HHHHB", data, pos + 1)
+            pos += 10
+            colors = self._global_colors
+            if flags & 0x80:
+                count = 2 << (flags & 7)
+                colors = self._color_table(pos, count)
+                pos += 3 * count
+            rect = (left, top, min(width, self.width - left), min(height, self.height - top))
+            saved = self._save(rect) if disposal == 3 else None
+            pos = self._decode(pos, rect, (width, height), bool(flags & 0x40), colors, transparent)
+            self._dispose = (disposal, rect, saved)
+            self._pos = pos
+            return delay
+
+    def _save(self, rect):
+        left, top, width, height = rect
+        bitmap = self.bitmap._data
+        saved = array("H")
+        for y in range(top, top + height):
+            base = y * self.width + left
+            saved.extend(bitmap[base:base + width])
+        return saved
+
+    def _apply_disposal(self):
+        if self._dispose is None:
+            return
+        method, (left, top, width, height), saved = self._dispose
+        bitmap = self.bitmap._data
+        if method == 2:
+            blank = array("H", [0]) * width
+            for y in range(top, top + height):
+                base = y * self.width + left
+                bitmap[base:base + width] = blank
+        elif method == 3:
+            for i, y in enumerate(range(top, top + height)):
+                base = y * self.width + left
+                bitmap[base:base + width] = saved[i * width:(i + 1) * width]
+        self._dispose = None
+
+    def _decode(self, pos, rect, image_size, interlaced, colors, transparent):
+        data = self._data
+        left, top, width, height = rect  # Clipped to the screen.
+        image_width, image_height = image_size
+        min_size = data[pos]
+        pos += 1
+        clear = 1 << min_size
+        end_code = clear + 1
+        prefix = self._prefix
+        suffix = self._suffix
+        first = self._first
+        stack = self._stack
+        for i in range(clear):
+            suffix[i] = i
+            first[i] = i
+        row = self._row
+        bitmap = self.bitmap._data
+        frame_width = self.width
+        passes = INTERLACE_PASSES if interlaced else ((0, 1),)
+        pass_number = 0
+        y, step = passes[0]
+        x = 0
+        finished = False  # Every row has been written.
+        written = 0
+
+        size = min_size + 1
+        next_code = clear + 2
+        previous = None
+        bits = 0
+        bit_count = 0
+        block_left = 0
+        while True:
+            # Gather the bits of the next code from the data sub-blocks.
+            while bit_count < size:
+                if block_left == 0:
+                    block_left = data[pos]
+                    pos += 1
+                    if block_left == 0:
+                        break
+                bits |= data[pos] << bit_count
+                pos += 1
+                block_left -= 1
+                bit_count += 8
+            if bit_count < size:
+                break  # Out of data without an end code.
+            code = bits & ((1 << size) - 1)
+            bits >>= size
+            bit_count -= size
+            if code == clear:
+                size = min_size + 1
+                next_code = clear + 2
+                previous = None
+                continue
+            if code == end_code:
+                pos = self._skip_blocks(pos + block_left)
+                break
+            # Unwind the code's string onto the stack, last index first.
+            depth = 0
+            if code < next_code:
+                walk = code
+            else:
+                stack[0] = first[previous]  # The code being defined: previous + its first index.
+                depth = 1
+                walk = previous
+            while walk >= clear:
+                stack[depth] = suffix[walk]
+                depth += 1
+                walk = prefix[walk]
+            stack[depth] = walk
+            depth += 1
+            if previous is not None and next_code < 4096:
+                prefix[next_code] = previous
+                suffix[next_code] = walk
+                first[next_code] = first[previous]
+                next_code += 1
+                if next_code == 1 << size and size < 12:
+                    size += 1
+            previous = code
+            if finished:
+                continue
+            # Emit the string into the row, writing each row as it fills.
+            while depth:
+                depth -= 1
+                if x < width:
+                    row[x] = stack[depth]
+                x += 1
+                if x == image_width:
+                    if y < height:
+                        base = (top + y) * frame_width + left
+                        for i in range(width):
+                            index = row[i]
+                            if index != transparent:
+                                bitmap[base + i] = colors[index]
+                                written += 1
+                    x = 0
+                    y += step
+                    while y >= image_height:
+                        pass_number += 1
+                        if pass_number == len(passes):
+                            finished = True
+                            break
+                        y, step = passes[pass_number]
+                    if finished:
+                        break
+        self.pixels_written = written
+        return pos
+
+    def deinit(self):
+        self._data.close()
+        self._file.close()
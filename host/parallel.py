@@ -0,0 +1,54 @@
+"""Composite large virtual panels in horizontal bands over a process pool.
+
+The stand-in ``FramebufferDisplay.refresh`` composites the whole root group
+in pure Python, which gets slow for chains of panels such as 128x64. A
+``BandRenderer`` splits the frame into horizontal bands and has a pool of
+worker processes composite one band each::
+
+    renderer = BandRenderer(processes=4)
+    scene.display.renderer = renderer
+    ...
+    renderer.close()
+
+The root group is pickled once per refresh and sent to every worker, so
+this only pays off when compositing costs more than that copy, which is the
+case for large panels and deep groups but not for a single 64x32 panel.
+"""
+
+import multiprocessing
+import pickle
+from array import array
+
+from host import backend
+
+
+def _render_band(job):
+    data, width, y0, y1 = job
+    band = array("I", (0,)) * ((y1 - y0) * width)
+    return backend.render_band(pickle.loads(data), band, width, y0, y1)
+
+
+class BandRenderer:
+    def __init__(self, processes=None, bands=None):
+        """Composite over ``processes`` workers (default: every core) in ``bands`` bands."""
+        self.processes = processes or multiprocessing.cpu_count()
+        self.bands = bands or self.processes
+        self.pool = multiprocessing.Pool(self.processes)
+
+    def render(self, root_group, frame, width, height):
+        """Composite root_group into frame (width x height) band by band."""
+        data = pickle.dumps(root_group, pickle.HIGHEST_PROTOCOL)
+        edges = [height * n // self.bands for n in range(self.bands + 1)]
+        jobs = [(data, width, y0, y1) for y0, y1 in zip(edges, edges[1:]) if y1 > y0]
+        for (_, _, y0, y1), band in zip(jobs, self.pool.map(_render_band, jobs)):
+            frame[y0 * width:y1 * width] = band
+
+    def close(self):
+        self.pool.close()
+        self.pool.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
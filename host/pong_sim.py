@@ -0,0 +1,144 @@
+"""Headless batch simulation of Pong.py for tuning the paddle AI.
+
+Runs many seeded matches without a panel, optionally over a process pool, and
+reports rally length, score distribution and matches per second for every
+combination of the tuning constants given on the command line::
+
+    python -m host.pong_sim --matches 2000 --processes 4 \\
+        --jitter 0.05 0.1 0.2 --max-speed 3.5 4.3 --speed-bonus 0.2
+
+Each match is seeded with ``seed + match number``, so a run is reproducible
+and does not depend on how matches are spread over the pool.
+"""
+
+import argparse
+import itertools
+import multiprocessing
+import random
+import time
+from collections import Counter
+
+from host import scripts
+
+pong = scripts.load("Pong.py")
+
+POINTS_TO_WIN = 11
+# A match that has not finished after this many frames is stopped. At 50 FPS
+# this is a little over half an hour of play.
+MAX_FRAMES = 100_000
+
+
+def play_match(seed, jitter, max_speed, speed_bonus, points=POINTS_TO_WIN, max_frames=MAX_FRAMES):
+    """Play one headless match and return ``(score1, score2, rallies, frames)``.
+
+    ``rallies`` holds the number of paddle hits of each point played.
+    """
+    game = pong.PongGame(headless=True, rng=random.Random(seed))
+    game.PADDLE_JITTER = jitter
+    game.MAX_PLAYER_SPEED = max_speed
+    game.HIT_SPEED_BONUS = speed_bonus
+
+    rallies = []
+    frames = 0
+    points_played = 0
+    while max(game.score1, game.score2) < points and frames < max_frames:
+        game.step()
+        frames += 1
+        if game.score1 + game.score2 != points_played:
+            points_played = game.score1 + game.score2
+            rallies.append(game.last_rally_hits)
+    return game.score1, game.score2, rallies, frames
+
+
+def _play_match_args(args):
+    return play_match(*args)
+
+
+def simulate(matches, seed, jitter, max_speed, speed_bonus, processes=1):
+    """Play ``matches`` matches with one set of tuning constants.
+
+    Returns a dict of summary statistics, including the wall time taken.
+    """
+    jobs = [(seed + n, jitter, max_speed, speed_bonus) for n in range(matches)]
+    start = time.perf_counter()
+    if processes > 1:
+        with multiprocessing.Pool(processes) as pool:
+            chunksize = max(1, matches // (processes * 8))
+            results = pool.map(_play_match_args, jobs, chunksize)
+    else:
+        results = [play_match(*job) for job in jobs]
+    elapsed = time.perf_counter() - start
+
+    rallies = []
+    scores = Counter()
+    wins = [0, 0]
+    unfinished = 0
+    frames = 0
+    for score1, score2, match_rallies, match_frames in results:
+        rallies.extend(match_rallies)
+        frames += match_frames
+        scores[(score1, score2)] += 1
+        if score1 >= POINTS_TO_WIN:
+            wins[0] += 1
+        elif score2 >= POINTS_TO_WIN:
+            wins[1] += 1
+        else:
+            unfinished += 1
+
+    rallies.sort()
+    return {
+        "matches": matches,
+        "seconds": elapsed,
+        "matches_per_second": matches / elapsed if elapsed else float("inf"),
+        "frames": frames,
+        "points": len(rallies),
+        "rally_mean": sum(rallies) / len(rallies) if rallies else 0.0,
+        "rally_median": rallies[len(rallies) // 2] if rallies else 0,
+        "rally_max": rallies[-1] if rallies else 0,
+        "wins": wins,
+        "unfinished": unfinished,
+        "scores": scores,
+    }
+
+
+def format_report(stats, jitter, max_speed, speed_bonus, top=5):
+    """Return a multi-line text report for one ``simulate`` result."""
+    matches = stats["matches"]
+    lines = [
+        "jitter=%g max_speed=%g speed_bonus=%g" % (jitter, max_speed, speed_bonus),
+        "  %d matches in %.2f s (%.0f matches/s, %.0f frames/s)" % (
+            matches, stats["seconds"], stats["matches_per_second"],
+            stats["frames"] / stats["seconds"] if stats["seconds"] else 0),
+        "  rally hits: mean %.2f, median %d, max %d over %d points" % (
+            stats["rally_mean"], stats["rally_median"], stats["rally_max"], stats["points"]),
+        "  wins: P1 %.1f%%, P2 %.1f%%, unfinished %d" % (
+            100 * stats["wins"][0] / matches, 100 * stats["wins"][1] / matches, stats["unfinished"]),
+    ]
+    common = ", ".join(
+        "%d-%d x%d" % (s1, s2, count) for (s1, s2), count in stats["scores"].most_common(top)
+    )
+    lines.append("  most common scores: " + common)
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--matches", type=int, default=1000, help="matches per parameter set")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first match")
+    parser.add_argument("--processes", type=int, default=1,
+                        help="worker processes (0 uses every core)")
+    parser.add_argument("--jitter", type=float, nargs="+", default=[0.1])
+    parser.add_argument("--max-speed", type=float, nargs="+", default=[4.3])
+    parser.add_argument("--speed-bonus", type=float, nargs="+", default=[0.2])
+    args = parser.parse_args()
+
+    processes = args.processes or multiprocessing.cpu_count()
+    for jitter, max_speed, speed_bonus in itertools.product(
+        args.jitter, args.max_speed, args.speed_bonus
+    ):
+        stats = simulate(args.matches, args.seed, jitter, max_speed, speed_bonus, processes)
+        print(format_report(stats, jitter, max_speed, speed_bonus))
+
+
+if __name__ == "__main__":
+    main()
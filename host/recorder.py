@@ -0,0 +1,149 @@
+"""Record a scene's frames into a frame stream for ``framestream.py``.
+
+    python -m host.recorder cube cube.frs --frames 300
+
+Each frame is the scene's own palette-indexed bitmap after one update. It is
+stored as the difference to the previous frame: unchanged pixels are
+skipped and changed ones run-length encoded. Palette entries that change are
+stored as separate events before the frame that first uses them. Copy the
+stream to the board and play it with ``Playback.py``.
+
+Scenes whose randomness comes from ``fastrand.shared`` are seeded first, so
+a recording is repeatable. Only scenes that draw into one bitmap can be
+recorded; the sprite scenes composite several TileGrids.
+"""
+
+import argparse
+import struct
+
+from host import backend, scripts
+
+backend.install()
+
+import fastrand  # noqa: E402
+from framestream import (  # noqa: E402
+    FRAME, HEADER, LITERAL, MAGIC, MAX_COUNT, PALETTE, RECORD, RUN, SKIP,
+)
+
+# name: (script, class, milliseconds per frame, update(scene, frame number))
+SCENES = {
+    "cube": ("3D_Cube.py", "RotatingCube", 20, lambda scene, n: scene.update()),
+    "odyssey": ("LineOdyssey.py", "LineOdyssey", 20, lambda scene, n: scene.update()),
+    "fire": ("FirePlace.py", "Fireplace", 50, lambda scene, n: scene.update()),
+    "ripple": ("Ripple.py", "WaterRipples", 20, lambda scene, n: scene.update()),
+    "fractal": ("Abstract .py", "AbstractFractalExplorer", 100, lambda scene, n: scene.update(n * 0.1)),
+}
+
+
+def encode_frame(previous, current, width):
+    """Return the frame ops that turn the pixels previous into current."""
+    ops = bytearray()
+    size = len(current)
+    skip = 0
+    i = 0
+    while i < size:
+        if current[i] == previous[i]:
+            skip += 1
+            i += 1
+            continue
+        while skip:
+            count = min(skip, MAX_COUNT)
+            ops.append(SKIP | (count - 1))
+            skip -= count
+        limit = min((i // width + 1) * width, i + MAX_COUNT)
+        value = current[i]
+        j = i + 1
+        while j < limit and current[j] == value:
+            j += 1
+        if j - i >= 2:
+            ops.append(RUN | (j - i - 1))
+            ops.append(value)
+            i = j
+            continue
+        # A literal ends at an unchanged pixel or where a run of three starts.
+        j = i + 1
+        while j < limit and current[j] != previous[j]:
+            if j + 2 < limit and current[j] == current[j + 1] == current[j + 2]:
+                break
+            j += 1
+        ops.append(LITERAL | (j - i - 1))
+        ops.extend(current[i:j])
+        i = j
+    return bytes(ops)
+
+
+class FrameRecorder:
+    def __init__(self, file, width, height, frame_ms):
+        """Write a frame stream of width x height frames to the binary file."""
+        self.file = file
+        self.width = width
+        self.height = height
+        self.previous = bytes(width * height)
+        self.colors = None
+        self.frames = 0
+        self.bytes = file.write(struct.pack(HEADER, MAGIC, width, height, frame_ms))
+
+    def write_record(self, kind, payload):
+        self.bytes += self.file.write(struct.pack(RECORD, kind, len(payload)) + payload)
+
+    def add_frame(self, pixels, colors):
+        """Add a frame of pixels (one palette index per byte) shown with colors (0xRRGGBB)."""
+        colors = list(colors)
+        if self.colors is None:
+            changed = range(len(colors))
+        else:
+            changed = [i for i, color in enumerate(colors) if color != self.colors[i]]
+        if changed:
+            first = changed[0]
+            payload = bytearray(struct.pack("<H", first))
+            for color in colors[first:changed[-1] + 1]:
+                payload += bytes(((color >> 16) & 0xFF, (color >> 8) & 0xFF, color & 0xFF))
+            self.write_record(PALETTE, payload)
+        self.colors = colors
+        pixels = bytes(pixels)
+        self.write_record(FRAME, encode_frame(self.previous, pixels, self.width))
+        self.previous = pixels
+        self.frames += 1
+
+    def add(self, bitmap, palette):
+        """Add the current contents of a stand-in bitmap and palette."""
+        if not isinstance(bitmap._data, bytearray):
+            raise ValueError("only bitmaps of up to 256 colors can be recorded")
+        self.add_frame(bitmap._data, palette._colors)
+
+
+def make_scene(name, seed=0):
+    """Create a scene by name from ``SCENES``, seeding the shared generator first."""
+    filename, class_name, frame_ms, update = SCENES[name]
+    fastrand.shared.seed(seed)
+    return getattr(scripts.load(filename), class_name)()
+
+
+def record(name, path, frames, seed=0):
+    """Record frames of the scene name into the file at path; return the recorder."""
+    frame_ms, update = SCENES[name][2:]
+    scene = make_scene(name, seed)
+    with open(path, "wb") as file:
+        recorder = FrameRecorder(file, scene.bitmap.width, scene.bitmap.height, frame_ms)
+        for n in range(frames):
+            update(scene, n)
+            recorder.add(scene.bitmap, scene.palette)
+    return recorder
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("scene", choices=sorted(SCENES))
+    parser.add_argument("output", help="frame stream file to write")
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    recorder = record(args.scene, args.output, args.frames, args.seed)
+    seconds = recorder.frames * SCENES[args.scene][2] / 1000
+    print("%s: %d frames, %d bytes (%.0f bytes per second of animation)" % (
+        args.output, recorder.frames, recorder.bytes, recorder.bytes / seconds))
+
+
+if __name__ == "__main__":
+    main()
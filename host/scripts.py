@@ -0,0 +1,28 @@
+"""Load the panel scripts as modules on the host.
+
+The scripts live at the repository root under names such as ``3D_Cube.py``
+and ``Abstract .py`` that cannot be imported with an ``import`` statement,
+so they are loaded from their file path instead.
+"""
+
+import importlib.util
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def load(filename):
+    """Import the root-level script ``filename`` and return the module.
+
+    The module is cached in ``sys.modules`` under its file name, so every
+    caller (and every fork of a process pool) shares one copy.
+    """
+    name = "script:" + filename
+    module = sys.modules.get(name)
+    if module is None:
+        spec = importlib.util.spec_from_file_location(name, os.path.join(ROOT, filename))
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        spec.loader.exec_module(module)
+    return module
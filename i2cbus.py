@@ -0,0 +1,200 @@
+# Shared I2C bus for the sensor scripts.
+# The MatrixPortal has one I2C bus, shared by the STEMMA QT port and the
+# on-board accelerometer, and busio.I2C can only be created once for its
+# pins, so scripts and modules take the one Bus from shared() instead of
+# creating their own.
+# Taking the bus waits with a timeout instead of spinning on try_lock(): it
+# sleeps a millisecond between tries, so background tasks keep running, and
+# gives up after timeout seconds, so a bus left locked can't hang a script.
+# The bus is scanned once, when the Bus is created, and the addresses found
+# are kept. Devices at addresses in DRIVERS are checked by their ID registers
+# (some chips share addresses: 0x18 is an MCP9808 or an LIS3DH) and get a
+# driver.
+# read_all() reads every device found in one lock window: one lock, then each
+# device's registers back to back. The Adafruit drivers take the lock for each
+# read themselves, so they can't be used inside that window; the drivers here
+# read the registers directly, through preallocated buffers.
+
+import struct
+import time
+import board
+import busio
+
+NS_PER_SECOND = 1000000000
+
+
+class Device:
+    NAME = "device"
+
+    def __init__(self, address):
+        self.address = address
+        self.command = bytearray(1)
+
+    def read_register(self, i2c, register, buffer):
+        """Read len(buffer) bytes from register into buffer (bus locked) and return it."""
+        self.command[0] = register
+        i2c.writeto_then_readfrom(self.address, self.command, buffer)
+        return buffer
+
+    def write_register(self, i2c, register, value):
+        """Write one byte to register (bus locked)."""
+        i2c.writeto(self.address, bytes((register, value)))
+
+    def probe(self, i2c):
+        """True if the device at address is this kind of device (bus locked)."""
+        return True
+
+    def setup(self, i2c):
+        """Configure the device after it is found (bus locked)."""
+
+
+class MCP9808(Device):
+    NAME = "MCP9808"
+
+    def __init__(self, address=0x18):
+        super().__init__(address)
+        self.buffer = bytearray(2)
+
+    def probe(self, i2c):
+        manufacturer = self.read_register(i2c, 0x06, self.buffer)
+        if manufacturer[0] != 0x00 or manufacturer[1] != 0x54:
+            return False
+        return self.read_register(i2c, 0x07, self.buffer)[0] == 0x04
+
+    def read(self, i2c):
+        """The temperature in degrees Celsius (bus locked)."""
+        data = self.read_register(i2c, 0x05, self.buffer)
+        # 13-bit two's complement, in sixteenths of a degree.
+        raw = ((data[0] << 8) | data[1]) & 0x1FFF
+        if raw & 0x1000:
+            raw -= 0x2000
+        return raw / 16
+
+
+class LIS3DH(Device):
+    NAME = "LIS3DH"
+
+    def __init__(self, address=0x19):
+        super().__init__(address)
+        self.buffer = bytearray(6)
+        self.id = bytearray(1)
+
+    def probe(self, i2c):
+        return self.read_register(i2c, 0x0F, self.id)[0] == 0x33
+
+    def setup(self, i2c):
+        self.write_register(i2c, 0x20, 0x57)  # 100 Hz, x, y and z on.
+        self.write_register(i2c, 0x23, 0x88)  # Block data update, high resolution, +-2 g.
+
+    def read(self, i2c):
+        """The acceleration (x, y, z) in g (bus locked)."""
+        # Setting the top bit of the register reads the six in one transfer.
+        x, y, z = struct.unpack("<hhh", self.read_register(i2c, 0x28 | 0x80, self.buffer))
+        return x / 16384, y / 16384, z / 16384
+
+
+# Address -> drivers to try there, in order.
+DRIVERS = {
+    0x18: (MCP9808, LIS3DH),
+    0x19: (LIS3DH, MCP9808),
+}
+for _address in range(0x1A, 0x20):
+    DRIVERS[_address] = (MCP9808,)
+
+
+class Bus:
+    def __init__(self, i2c=None, timeout=0.1, drivers=DRIVERS):
+        """The board's I2C bus (or i2c), scanned once; taking it gives up after timeout seconds."""
+        self.i2c = i2c if i2c is not None else busio.I2C(board.SCL, board.SDA)
+        self.timeout = timeout
+        self.addresses = []
+        self.devices = {}   # Address -> driver of each device recognised.
+        self.readings = {}  # Address -> what the last read_all() read there; failed reads are left out.
+        self.timeouts = 0
+        self.errors = 0
+        self.discover(drivers)
+
+    def lock(self, timeout=None):
+        """Take the bus, waiting up to timeout seconds (default self.timeout); False if it stayed busy."""
+        i2c = self.i2c
+        if i2c.try_lock():
+            return True
+        wait_ns = int((self.timeout if timeout is None else timeout) * NS_PER_SECOND)
+        deadline = time.monotonic_ns() + wait_ns
+        while True:
+            time.sleep(0.001)
+            if i2c.try_lock():
+                return True
+            if time.monotonic_ns() >= deadline:
+                self.timeouts += 1
+                return False
+
+    def unlock(self):
+        self.i2c.unlock()
+
+    def __enter__(self):
+        if not self.lock():
+            raise OSError("I2C bus busy")
+        return self.i2c
+
+    def __exit__(self, *exc):
+        self.unlock()
+
+    def discover(self, drivers):
+        """Scan the bus and set up a driver for each device drivers recognises."""
+        with self as i2c:
+            self.addresses = i2c.scan()
+            for address in self.addresses:
+                for driver in drivers.get(address, ()):
+                    device = driver(address)
+                    try:
+                        if device.probe(i2c):
+                            device.setup(i2c)
+                            self.devices[address] = device
+                            break
+                    except OSError:
+                        pass  # Not this kind of device.
+
+    def device(self, name):
+        """The first device found whose driver is called name, or None."""
+        for address in sorted(self.devices):
+            if self.devices[address].NAME == name:
+                return self.devices[address]
+        return None
+
+    def read_all(self):
+        """Read every device in one lock window into readings; False if the bus stayed busy."""
+        if not self.lock():
+            return False
+        i2c = self.i2c
+        try:
+            for address, device in self.devices.items():
+                try:
+                    self.readings[address] = device.read(i2c)
+                except OSError:
+                    self.errors += 1
+                    self.readings.pop(address, None)  # Never hand on a stale reading.
+        finally:
+            i2c.unlock()
+        return True
+
+    def read_every(self, scheduler, seconds, callback=None, start=0):
+        """
+        Schedule read_all() every seconds, then callback(readings) if the bus
+        was read. readings has only the devices read this time.
+        """
+        def task():
+            if self.read_all() and callback:
+                callback(self.readings)
+        return scheduler.every(seconds, task, start)
+
+
+_shared = None
+
+
+def shared():
+    """The Bus every script and module uses, created and scanned on first use."""
+    global _shared
+    if _shared is None:
+        _shared = Bus()
+    return _shared
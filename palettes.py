@@ -0,0 +1,98 @@
+# Precomputed color tables for the matrix scenes.
+# LEDs are linear: a channel at 10% of 255 looks far brighter than 10%, so
+# unless colors are gamma corrected the dark end of a ramp washes out on the
+# panel. Gamma correction here is an 8-bit lookup table per gamma value, and
+# the tables a scene animates through (hue wheels, ramps) are computed once,
+# corrected, and cached, so a time-varying palette is just a few table
+# lookups per frame: ColorCycle picks palette entries out of a cached table
+# at a moving offset instead of recomputing colors with float math.
+# Tables are cached by their parameters, so scenes asking for the same wheel
+# share it.
+
+from array import array
+
+GAMMA = 2.2  # Suits the MatrixPortal's 64x32 panels; 1.0 turns correction off.
+
+_tables = {}
+
+
+def gamma_table(gamma=GAMMA):
+    """Lookup table mapping each 8-bit channel value to its gamma-corrected value."""
+    key = ("gamma", gamma)
+    table = _tables.get(key)
+    if table is None:
+        table = bytes(int(255 * (i / 255) ** gamma + 0.5) for i in range(256))
+        _tables[key] = table
+    return table
+
+
+def correct(color, gamma=GAMMA):
+    """Gamma-correct a 0xRRGGBB color."""
+    table = gamma_table(gamma)
+    return (table[(color >> 16) & 0xFF] << 16) | (table[(color >> 8) & 0xFF] << 8) | table[color & 0xFF]
+
+
+def hsv(h, s=1.0, v=1.0):
+    """0xRRGGBB for hue h, saturation s and value v, each in 0 to 1."""
+    i = int(h * 6)
+    f = h * 6 - i
+    p = v * (1 - s)
+    q = v * (1 - f * s)
+    t = v * (1 - (1 - f) * s)
+    r, g, b = ((v, t, p), (q, v, p), (p, v, t), (p, q, v), (t, p, v), (v, p, q))[i % 6]
+    return (int(r * 255) << 16) | (int(g * 255) << 8) | int(b * 255)
+
+
+def hue_wheel(steps=256, s=1.0, v=1.0, gamma=GAMMA):
+    """steps gamma-corrected colors evenly spaced around the hue circle, starting at red."""
+    key = ("wheel", steps, s, v, gamma)
+    table = _tables.get(key)
+    if table is None:
+        table = array("I", [correct(hsv(i / steps, s, v), gamma) for i in range(steps)])
+        _tables[key] = table
+    return table
+
+
+def ramp(stops, count, gamma=GAMMA):
+    """
+    count gamma-corrected colors blended linearly through stops, a list of
+    (position, 0xRRGGBB) pairs with positions rising from 0 to 1.
+    """
+    key = ("ramp", tuple(stops), count, gamma)
+    table = _tables.get(key)
+    if table is None:
+        colors = []
+        for i in range(count):
+            f = i / (count - 1) if count > 1 else 0.0
+            k = 1
+            while k < len(stops) - 1 and f > stops[k][0]:
+                k += 1
+            (f0, c0), (f1, c1) = stops[k - 1], stops[k]
+            w = (f - f0) / (f1 - f0) if f1 > f0 else 1.0
+            color = 0
+            for shift in (16, 8, 0):
+                a = (c0 >> shift) & 0xFF
+                b = (c1 >> shift) & 0xFF
+                color |= int(a + (b - a) * w) << shift
+            colors.append(correct(color, gamma))
+        table = array("I", colors)
+        _tables[key] = table
+    return table
+
+
+class ColorCycle:
+    def __init__(self, table, count, span=None):
+        """
+        count palette entries taken from table, spread evenly over span table
+        entries (default: the whole table) and rotated with apply().
+        """
+        self.table = table
+        span = len(table) if span is None else span
+        self.steps = [k * span // (count - 1) if count > 1 else 0 for k in range(count)]
+
+    def apply(self, palette, offset, first=0):
+        """Set palette entries from first on to the cycle's colors rotated by offset table entries."""
+        table = self.table
+        size = len(table)
+        for i, step in enumerate(self.steps):
+            palette[first + i] = table[(offset + step) % size]
@@ -0,0 +1,165 @@
+# Shared display set-up for the matrix scenes on the MatrixPortal.
+# The scenes are drawn for one 64x32 panel but run on chains of them too:
+# panels chained side by side make a wider display, and rows of panels are
+# folded with rgbmatrix's tile option (serpentine when every other row is
+# mounted upside down, which keeps the ribbon cables short).
+# Scenes that redraw every pixel each frame can skip displayio altogether and
+# write the matrix's framebuffer directly with DirectFramebuffer.
+
+from array import array
+import board
+import displayio
+import framebufferio
+import rgbmatrix
+
+PANEL_WIDTH = 64
+PANEL_HEIGHT = 32
+
+# Display sizes of common chains of 64x32 panels.
+LAYOUTS = {
+    "64x32": (64, 32),    # One panel.
+    "128x32": (128, 32),  # Two panels side by side.
+    "64x64": (64, 64),    # Two panels, one above the other.
+    "128x64": (128, 64),  # Four panels in two rows of two.
+}
+
+
+def geometry_scale(width, height):
+    """Factor to scale sizes drawn for one 64x32 panel to a width x height display."""
+    return min(width / PANEL_WIDTH, height / PANEL_HEIGHT)
+
+
+def create_matrix(width=64, height=32, bit_depth=6, serpentine=True):
+    """
+    Release any displays in use and return the RGBMatrix for a width x height
+    chain of 64x32 panels. Panels are chained left to right, in height // 32 rows.
+    """
+    if width % PANEL_WIDTH or height % PANEL_HEIGHT:
+        raise ValueError("display size must be a whole number of 64x32 panels")
+    displayio.release_displays()
+    return rgbmatrix.RGBMatrix(
+        width=width,
+        height=height,
+        bit_depth=bit_depth,
+        rgb_pins=[
+            board.MTX_R1, board.MTX_G1, board.MTX_B1,
+            board.MTX_R2, board.MTX_G2, board.MTX_B2,
+        ],
+        addr_pins=[
+            board.MTX_ADDRA, board.MTX_ADDRB, board.MTX_ADDRC, board.MTX_ADDRD,
+        ],
+        clock_pin=board.MTX_CLK,
+        latch_pin=board.MTX_LAT,
+        output_enable_pin=board.MTX_OE,
+        tile=height // PANEL_HEIGHT,
+        serpentine=serpentine,
+        doublebuffer=True,
+    )
+
+
+def create_display(width=64, height=32, bit_depth=6, serpentine=True):
+    """Return (matrix, display) for a width x height chain of panels; see create_matrix."""
+    matrix = create_matrix(width, height, bit_depth, serpentine)
+    display = framebufferio.FramebufferDisplay(matrix, auto_refresh=False)
+    return matrix, display
+
+
+def rgb565(color):
+    """The matrix's native RGB565 value for a 0xRRGGBB color."""
+    return ((color >> 8) & 0xF800) | ((color >> 5) & 0x07E0) | ((color >> 3) & 0x001F)
+
+
+class DirectFramebuffer:
+    def __init__(self, width=64, height=32, color_count=256, bit_depth=6, serpentine=True):
+        """
+        Opt-in display path for scenes that redraw every pixel of every frame.
+        Instead of a Bitmap shown by a TileGrid, the scene hands draw() one
+        palette index per pixel and they are written straight into the matrix's
+        own RGB565 framebuffer, then refresh() sends it to the panel. No
+        displayio compositing happens at all.
+        It stands in for both the scene's palette (colors are converted to
+        native values once, when they are set) and its display, so a scene's
+        palette set-up and run loop work unchanged.
+        """
+        self.matrix = create_matrix(width, height, bit_depth, serpentine)
+        self.width = width
+        self.height = height
+        self.buffer = memoryview(self.matrix)
+        self.colors = array("H", (0,)) * color_count
+
+    def __len__(self):
+        return len(self.colors)
+
+    def __setitem__(self, index, color):
+        self.colors[index] = rgb565(color)
+
+    def draw(self, pixels, width, height):
+        """
+        Write pixels, one palette index per pixel of a width x height frame
+        row by row, stretching them to fill the panel like scaled_group does.
+        """
+        scale_x = self.width // width
+        scale_y = self.height // height
+        if scale_x * width != self.width or scale_y * height != self.height:
+            raise ValueError("render size must divide the display size")
+        colors = self.colors
+        buffer = self.buffer
+        out = 0
+        for y in range(height):
+            start = y * width
+            if scale_x == 1:
+                row = array("H", [colors[value] for value in pixels[start:start + width]])
+            else:
+                row = array("H", [colors[value] for value in pixels[start:start + width]
+                                  for _ in range(scale_x)])
+            for _ in range(scale_y):
+                buffer[out:out + self.width] = row
+                out += self.width
+
+    def refresh(self, minimum_frames_per_second=0):
+        self.matrix.refresh()
+        return True
+
+
+def scaled_group(bitmap, palette, width, height):
+    """
+    Show a reduced-resolution bitmap stretched over a width x height area.
+    Returns (tile_grid, group); append the group to the scene's root group.
+    Equal scales on both axes are done by the group's scale. Any extra stretch
+    along one axis uses one-pixel-wide tiles that repeat each source column
+    (or row), so displayio does all the upscaling and Python writes nothing.
+    """
+    scale_x = width // bitmap.width
+    scale_y = height // bitmap.height
+    if scale_x * bitmap.width != width or scale_y * bitmap.height != height:
+        raise ValueError("render size must divide the display size")
+    scale = min(scale_x, scale_y)
+    repeat_x = scale_x // scale
+    repeat_y = scale_y // scale
+    if repeat_x * scale != scale_x or repeat_y * scale != scale_y:
+        raise ValueError("one axis scale must be a multiple of the other")
+
+    if repeat_x > 1:
+        # One tile per source column, each shown repeat_x times.
+        tile_grid = displayio.TileGrid(
+            bitmap, pixel_shader=palette,
+            width=bitmap.width * repeat_x, height=1,
+            tile_width=1, tile_height=bitmap.height,
+        )
+        for x in range(bitmap.width * repeat_x):
+            tile_grid[x, 0] = x // repeat_x
+    elif repeat_y > 1:
+        # One tile per source row, each shown repeat_y times.
+        tile_grid = displayio.TileGrid(
+            bitmap, pixel_shader=palette,
+            width=1, height=bitmap.height * repeat_y,
+            tile_width=bitmap.width, tile_height=1,
+        )
+        for y in range(bitmap.height * repeat_y):
+            tile_grid[0, y] = y // repeat_y
+    else:
+        tile_grid = displayio.TileGrid(bitmap, pixel_shader=palette)
+
+    group = displayio.Group(scale=scale)
+    group.append(tile_grid)
+    return tile_grid, group
@@ -0,0 +1,191 @@
+# Frame timing overlay and serial telemetry for the matrix scenes.
+# PerfMonitor wraps a scene's display: the scene keeps calling
+# display.refresh() as before, and every call is timed with
+# time.monotonic_ns(). The time between two refreshes is the frame time the
+# viewer sees, so a stutter shows up however it was caused. Per frame the
+# monitor only subtracts a few integers and bumps preallocated counters; once
+# a second it turns them into
+#   * a one-line report printed to the serial console:
+#       perf fps=20 frame=50.1/61.3ms hist=0,0,19,1,0,0 miss=1 gc=2 refresh=3.1/4.0ms free=98304
+#     frame and refresh give the mean/longest time in milliseconds; hist
+#     counts frames shorter than 17, 33, 50, 67, 100 ms and the rest; miss
+#     counts frames longer than the deadline; gc counts garbage collections
+#   * a small overlay in the corner of the panel with the frames per second
+#     (F), the last frame time in ms (T) and the free heap in KB (H).
+# Both can be switched on and off while the scene runs. CircuitPython has no
+# hook for garbage collections, so they are counted as rises of
+# gc.mem_free() between frames (allocation only ever lowers it).
+
+import gc
+import time
+from array import array
+import displayio
+
+NS_PER_MS = 1000000
+NS_PER_SECOND = 1000000000
+BUCKETS_MS = (17, 33, 50, 67, 100)
+
+# 3x5 pixel glyphs, one 3-bit row per octal digit, top row first.
+GLYPHS = {
+    "0": 0o75557, "1": 0o26227, "2": 0o71747, "3": 0o71717, "4": 0o55711,
+    "5": 0o74717, "6": 0o74757, "7": 0o71111, "8": 0o75757, "9": 0o75717,
+    "F": 0o74644, "T": 0o72222, "H": 0o55755, "-": 0o00700, " ": 0o00000,
+}
+
+
+def _mem_free():
+    try:
+        return gc.mem_free()
+    except AttributeError:
+        return None  # Not CircuitPython.
+
+
+class PerfOverlay:
+    def __init__(self, x=0, y=0, color=0x00FF00):
+        """Three lines of four 3x5 characters, on black, with the top-left corner at (x, y)."""
+        self.bitmap = displayio.Bitmap(4 * 4 - 1, 3 * 6 - 1, 2)
+        self.palette = displayio.Palette(2)
+        self.palette[0] = 0x000000
+        self.palette[1] = color
+        self.group = displayio.Group(x=x, y=y)
+        self.group.append(displayio.TileGrid(self.bitmap, pixel_shader=self.palette))
+
+    def draw_line(self, line, text):
+        bitmap = self.bitmap
+        top = line * 6
+        for n, char in enumerate(text[:4]):
+            glyph = GLYPHS.get(char, 0)
+            left = n * 4
+            for row in range(5):
+                bits = glyph >> (3 * (4 - row))
+                for col in range(3):
+                    bitmap[left + col, top + row] = (bits >> (2 - col)) & 1
+
+    def show(self, fps, frame_ms, free):
+        """Draw the frames per second, last frame time in ms and free heap in bytes (or None)."""
+        self.draw_line(0, "F%3d" % min(fps, 999))
+        self.draw_line(1, "T%3d" % min(frame_ms, 999))
+        self.draw_line(2, "H  -" if free is None else "H%3d" % min(free // 1024, 999))
+
+
+class PerfMonitor:
+    def __init__(self, display, deadline_ms=50, hud=True, telemetry=True, clock=time.monotonic_ns):
+        """
+        Time the refreshes of display. Frames longer than deadline_ms count as
+        missed. hud shows the overlay in the top-left corner, telemetry prints
+        the per-second report.
+        """
+        self.display = display
+        self.clock = clock
+        self.deadline_ns = deadline_ms * NS_PER_MS
+        self.telemetry = telemetry
+        self.overlay = None
+        if hasattr(display, "root_group"):
+            # The scene's own root group goes under the overlay. Displays
+            # without groups (panel.DirectFramebuffer) only get telemetry.
+            self.overlay = PerfOverlay()
+            self.overlay.group.hidden = not hud
+            self.root = displayio.Group()
+            scene = display.root_group or displayio.Group()
+            # A group can only be in one place: the display lets go of the
+            # scene's group when the new root replaces it.
+            display.root_group = self.root
+            self.root.append(scene)
+            self.root.append(self.overlay.group)
+
+        self.buckets = array("L", [0] * (len(BUCKETS_MS) + 1))
+        self.bucket_limits = [limit * NS_PER_MS for limit in BUCKETS_MS]
+        self.last_ns = None       # End of the previous refresh.
+        self.window_ns = clock()  # Start of the current one-second window.
+        self.frame_ns = 0         # Last frame time.
+        self.reset()
+        self.free = _mem_free()
+        self.report = ""
+
+    def reset(self):
+        for i in range(len(self.buckets)):
+            self.buckets[i] = 0
+        self.frames = 0
+        self.frame_total = 0
+        self.frame_max = 0
+        self.missed = 0
+        self.collections = 0
+        self.refreshes = 0
+        self.refresh_total = 0
+        self.refresh_max = 0
+
+    @property
+    def root_group(self):
+        return self.root[0] if self.overlay else None
+
+    @root_group.setter
+    def root_group(self, group):
+        if self.overlay:
+            self.root[0] = group or displayio.Group()
+
+    @property
+    def hud(self):
+        """True while the overlay is shown."""
+        return self.overlay is not None and not self.overlay.group.hidden
+
+    @hud.setter
+    def hud(self, shown):
+        if self.overlay:
+            self.overlay.group.hidden = not shown
+
+    def __getattr__(self, name):
+        return getattr(self.display, name)
+
+    def refresh(self, *args, **kwargs):
+        """Refresh the display, timing the refresh and the frame it ends."""
+        start = self.clock()
+        result = self.display.refresh(*args, **kwargs)
+        now = self.clock()
+        took = now - start
+        self.refreshes += 1
+        self.refresh_total += took
+        if took > self.refresh_max:
+            self.refresh_max = took
+        if self.last_ns is not None:
+            frame = now - self.last_ns
+            self.frame_ns = frame
+            self.frames += 1
+            self.frame_total += frame
+            if frame > self.frame_max:
+                self.frame_max = frame
+            if frame > self.deadline_ns:
+                self.missed += 1
+            bucket = 0
+            for limit in self.bucket_limits:
+                if frame < limit:
+                    break
+                bucket += 1
+            self.buckets[bucket] += 1
+        self.last_ns = now
+        free = _mem_free()
+        if free is not None:
+            if self.free is not None and free > self.free:
+                self.collections += 1
+            self.free = free
+        if now - self.window_ns >= NS_PER_SECOND:
+            self.end_window(now)
+        return result
+
+    def end_window(self, now):
+        """Report the window that just ended and start the next one."""
+        seconds = (now - self.window_ns) / NS_PER_SECOND
+        fps = round(self.frames / seconds)
+        if self.hud:
+            self.overlay.show(fps, self.frame_ns // NS_PER_MS, self.free)
+        if self.telemetry:
+            unknown = self.free is None
+            self.report = "perf fps=%d frame=%.1f/%.1fms hist=%s miss=%d gc=%s refresh=%.1f/%.1fms free=%s" % (
+                fps,
+                self.frame_total / max(self.frames, 1) / NS_PER_MS, self.frame_max / NS_PER_MS,
+                ",".join(str(count) for count in self.buckets),
+                self.missed, "-" if unknown else self.collections,
+                self.refresh_total / max(self.refreshes, 1) / NS_PER_MS, self.refresh_max / NS_PER_MS,
+                "-" if unknown else self.free)
+            print(self.report)
+        self.window_ns = now
+        self.reset()
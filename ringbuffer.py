@@ -0,0 +1,70 @@
+# Fixed-size sample history backed by an array.
+# The buffer never grows: once full, each new sample overwrites the oldest.
+# A running sum gives the moving average in O(1); the minimum and maximum
+# are tracked as samples arrive and only rescanned when the sample that held
+# one of them is overwritten.
+
+from array import array
+
+
+class SampleRing:
+    def __init__(self, capacity, typecode="f"):
+        """Keep the last capacity samples in an array of the given typecode."""
+        self.capacity = capacity
+        self.samples = array(typecode, [0] * capacity)
+        self.count = 0
+        self.head = 0  # Index the next sample is written to.
+        self.total = 0
+        self.minimum = None
+        self.maximum = None
+        self.appends = 0
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        """Sample by age: 0 is the oldest kept, -1 the newest."""
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError("sample index out of range")
+        return self.samples[(self.head - self.count + index) % self.capacity]
+
+    def append(self, value):
+        """Add a sample, dropping the oldest once the buffer is full."""
+        rescan = False
+        if self.count == self.capacity:
+            old = self.samples[self.head]
+            self.total -= old
+            rescan = old == self.minimum or old == self.maximum
+        else:
+            self.count += 1
+        self.samples[self.head] = value
+        value = self.samples[self.head]  # As stored, e.g. rounded to a float32.
+        self.head = (self.head + 1) % self.capacity
+        self.total += value
+        self.appends += 1
+        if rescan or self.appends % self.capacity == 0:
+            # Also recompute the sum now and then so float error cannot build up.
+            self.rescan()
+        else:
+            if self.minimum is None or value < self.minimum:
+                self.minimum = value
+            if self.maximum is None or value > self.maximum:
+                self.maximum = value
+
+    def rescan(self):
+        """Recompute the sum, minimum and maximum from the kept samples."""
+        values = [self[i] for i in range(self.count)]
+        self.total = sum(values)
+        self.minimum = min(values) if values else None
+        self.maximum = max(values) if values else None
+
+    @property
+    def mean(self):
+        """Moving average of the kept samples, or None when empty."""
+        return self.total / self.count if self.count else None
+
+    @property
+    def latest(self):
+        return self[-1] if self.count else None
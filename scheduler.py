@@ -0,0 +1,75 @@
+# Cooperative tick scheduler for the matrix scripts.
+# Work such as sensor reads is registered as tasks and run from the main loop
+# when it falls due, so the loop never blocks in time.sleep() for one job and
+# the display can keep animating in between. Times are kept in integer
+# nanoseconds from time.monotonic_ns(), which unlike time.monotonic() does not
+# lose precision after the board has been running for hours.
+
+import time
+
+NS_PER_SECOND = 1000000000
+
+
+class Task:
+    def __init__(self, callback, interval_ns, due_ns):
+        self.callback = callback
+        self.interval_ns = interval_ns  # 0 for a one-shot task.
+        self.due_ns = due_ns
+        self.cancelled = False
+
+    def cancel(self):
+        """Stop the task from running again."""
+        self.cancelled = True
+
+
+class Scheduler:
+    def __init__(self, clock=time.monotonic_ns):
+        """clock returns the current time in nanoseconds; pass a fake one to simulate time."""
+        self.clock = clock
+        self.tasks = []
+
+    def every(self, seconds, callback, start=0):
+        """Run callback every seconds, the first time start seconds from now."""
+        task = Task(callback, int(seconds * NS_PER_SECOND), self.clock() + int(start * NS_PER_SECOND))
+        self.tasks.append(task)
+        return task
+
+    def after(self, seconds, callback):
+        """Run callback once, seconds from now."""
+        task = Task(callback, 0, self.clock() + int(seconds * NS_PER_SECOND))
+        self.tasks.append(task)
+        return task
+
+    def run_pending(self):
+        """Run every task that is due and return how many ran."""
+        now = self.clock()
+        ran = 0
+        for task in self.tasks:
+            if task.due_ns <= now and not task.cancelled:
+                task.callback()
+                ran += 1
+                if task.interval_ns:
+                    task.due_ns += task.interval_ns
+                    if task.due_ns <= now:
+                        # Fell more than a whole interval behind: skip the missed runs.
+                        task.due_ns = now + task.interval_ns
+                else:
+                    task.cancelled = True
+        if ran:
+            self.tasks = [task for task in self.tasks if not task.cancelled]
+        return ran
+
+    def seconds_until_next(self):
+        """Seconds until the next task is due (0 if one is due now, None if there are none)."""
+        if not self.tasks:
+            return None
+        due = min(task.due_ns for task in self.tasks)
+        return max(0, due - self.clock()) / NS_PER_SECOND
+
+    def sleep_until_next(self, longest=1.0):
+        """Sleep until the next task is due, but never longer than longest seconds."""
+        wait = self.seconds_until_next()
+        if wait is None or wait > longest:
+            wait = longest
+        if wait > 0:
+            time.sleep(wait)
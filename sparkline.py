@@ -0,0 +1,89 @@
+# Scrolling trend graph (sparkline) for the matrix panel.
+# The graph bitmap is used as a ring of columns: each new value is drawn into
+# one column and two TileGrids showing the same bitmap are shifted so that
+# column appears at the right-hand edge. Adding a value therefore costs one
+# column of drawing and two x updates, never a redraw of the whole graph.
+# The graph must span the panel's full width so the parts of the two
+# TileGrids that are scrolled out of view fall off the panel.
+# The whole graph is only redrawn when the value range has to be rescaled.
+
+import bitmaptools
+import displayio
+from ringbuffer import SampleRing
+
+
+class Sparkline:
+    def __init__(self, width, height, y=0, fill_color=0x202060, line_color=0xFFFFFF, margin=0.5):
+        """
+        A width x height graph with its top edge at y. Values are scaled to the
+        range of the values shown, padded by margin (in the values' units).
+        """
+        self.width = width
+        self.height = height
+        self.margin = margin
+        self.values = SampleRing(width)
+        self.low = None
+        self.high = None
+        self.newest = width - 1  # Bitmap column holding the newest value.
+        self.newest_row = None   # Row of the newest value's line pixel.
+        self.pushes = 0
+
+        self.bitmap = displayio.Bitmap(width, height, 4)
+        self.palette = displayio.Palette(4)
+        self.palette[0] = 0x000000
+        self.palette.make_transparent(0)
+        self.palette[1] = fill_color  # Area under the line.
+        self.palette[2] = line_color  # The line itself.
+        self.palette[3] = line_color  # The newest point, so it can be highlighted.
+        self.group = displayio.Group(y=y)
+        self.left = displayio.TileGrid(self.bitmap, pixel_shader=self.palette)
+        self.right = displayio.TileGrid(self.bitmap, pixel_shader=self.palette)
+        self.group.append(self.left)
+        self.group.append(self.right)
+        self.scroll()
+
+    def level(self, value):
+        """Row of the line for value, 0 at the top."""
+        span = self.high - self.low
+        top = self.height - 1
+        return top - int((value - self.low) * top / span + 0.5) if span else top // 2
+
+    def draw_column(self, column, value, line=2):
+        bitmaptools.fill_region(self.bitmap, column, 0, column + 1, self.height, 0)
+        row = self.level(value)
+        if row + 1 < self.height:
+            bitmaptools.fill_region(self.bitmap, column, row + 1, column + 1, self.height, 1)
+        self.bitmap[column, row] = line
+        return row
+
+    def scroll(self):
+        # The right TileGrid shows columns 0..newest ending at the right edge,
+        # the left one shows the older columns newest+1..width-1 before them.
+        self.right.x = self.width - 1 - self.newest
+        self.left.x = self.right.x - self.width
+
+    def rescale(self):
+        """Fit the value range to the values shown and redraw every column."""
+        self.low = self.values.minimum - self.margin
+        self.high = self.values.maximum + self.margin
+        self.bitmap.fill(0)
+        count = len(self.values)
+        for age in range(count - 1):
+            column = (self.newest - (count - 1 - age)) % self.width
+            self.draw_column(column, self.values[age])
+        self.newest_row = self.draw_column(self.newest, self.values[-1], 3)
+
+    def push(self, value):
+        """Add a value at the right-hand edge, scrolling the older ones left."""
+        self.values.append(value)
+        if self.newest_row is not None:
+            self.bitmap[self.newest, self.newest_row] = 2
+        self.newest = (self.newest + 1) % self.width
+        self.pushes += 1
+        if self.low is None or not self.low <= value <= self.high or self.pushes % self.width == 0:
+            # Out of range, or a full graph width since the last fit (so old peaks
+            # that have scrolled away stop stretching the scale).
+            self.rescale()
+        else:
+            self.newest_row = self.draw_column(self.newest, value, 3)
+        self.scroll()
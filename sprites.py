@@ -0,0 +1,72 @@
+# Sprites for the 64x32 matrix scenes.
+# Each movable object gets its own small bitmap inside its own TileGrid.
+# Moving a sprite only changes the TileGrid's x/y, so displayio composites
+# it at the new place and no bitmap pixels are rewritten from Python.
+# Static artwork (borders, a sun, text backgrounds) stays in a separate
+# full-screen bitmap layer that is drawn once and never touched again.
+
+import displayio
+
+
+class Sprite:
+    def __init__(self, palette, width=1, height=1, color_index=1, x=0, y=0, rows=None):
+        """
+        Create a sprite that draws with the shared scene palette.
+        A solid width x height block of color_index is drawn unless rows is given.
+        rows is a list of equal-length rows of palette indices for shaped sprites;
+        index 0 pixels only show through if the palette makes index 0 transparent.
+        """
+        if rows is not None:
+            height = len(rows)
+            width = len(rows[0])
+        self.bitmap = displayio.Bitmap(width, height, len(palette))
+        if rows is None:
+            self.bitmap.fill(color_index)
+        else:
+            for y, row in enumerate(rows):
+                for x, value in enumerate(row):
+                    self.bitmap[x, y] = value
+        self.width = width
+        self.height = height
+        self.x = int(x)
+        self.y = int(y)
+        self.tile_grid = displayio.TileGrid(self.bitmap, pixel_shader=palette, x=self.x, y=self.y)
+
+    def move_to(self, x, y):
+        """Move the sprite's top-left corner to (x, y). Unchanged positions cost nothing."""
+        x = int(x)
+        y = int(y)
+        if x != self.x:
+            self.x = x
+            self.tile_grid.x = x
+        if y != self.y:
+            self.y = y
+            self.tile_grid.y = y
+
+    @property
+    def hidden(self):
+        return self.tile_grid.hidden
+
+    @hidden.setter
+    def hidden(self, value):
+        if self.tile_grid.hidden != value:
+            self.tile_grid.hidden = value
+
+
+class SpriteLayer:
+    def __init__(self, group):
+        """A displayio.Group of sprites appended on top of everything already in group."""
+        self.group = displayio.Group()
+        self.sprites = []
+        group.append(self.group)
+
+    def add(self, sprite):
+        """Add a sprite on top of the others in this layer and return it."""
+        self.group.append(sprite.tile_grid)
+        self.sprites.append(sprite)
+        return sprite
+
+    def remove(self, sprite):
+        """Take a sprite out of the layer."""
+        self.group.remove(sprite.tile_grid)
+        self.sprites.remove(sprite)
@@ -0,0 +1,104 @@
+# Smooth scrolling text ticker for the matrix panel.
+# Like the trend graph in sparkline.py, the ticker bitmap is a ring of
+# columns shown by two TileGrids that are shifted one pixel per step. Each
+# step clears the column that just scrolled off and copies a single column
+# of the current glyph into it, so a step costs two small bitmaptools calls
+# and two x updates however long the message is, and no text is laid out
+# again. Messages are streamed a column at a time, so a new text (a fresh
+# sensor reading, say) only has to wait for the current one to finish
+# scrolling and never stalls the scroll.
+# The ticker must span the panel's full width so the parts of the two
+# TileGrids that are scrolled out of view fall off the panel.
+# Any font with get_glyph works: terminalio.FONT, adafruit_bitmap_font fonts
+# or a glyphatlas.AtlasFont.
+
+import bitmaptools
+import displayio
+
+
+class Ticker:
+    def __init__(self, font, width, y=0, color=0xFFFFFF, text="", gap=None):
+        """
+        A ticker width pixels wide with its top edge at y. gap blank columns
+        (default: the whole width) separate one pass of a message from the next.
+        """
+        self.font = font
+        self.width = width
+        self.gap = width if gap is None else gap
+        box = font.get_bounding_box()
+        self.height = box[1]
+        self.baseline = box[1] + (box[3] if len(box) > 3 else 0)  # Rows above the baseline.
+
+        self.bitmap = displayio.Bitmap(width, self.height, 2)
+        self.palette = displayio.Palette(2)
+        self.palette[0] = 0x000000
+        self.palette.make_transparent(0)
+        self.palette[1] = color
+        self.group = displayio.Group(y=y)
+        self.left = displayio.TileGrid(self.bitmap, pixel_shader=self.palette)
+        self.right = displayio.TileGrid(self.bitmap, pixel_shader=self.palette)
+        self.group.append(self.left)
+        self.group.append(self.right)
+        self.newest = width - 1  # Bitmap column shown at the right-hand edge.
+
+        self.text = text    # Message being streamed in.
+        self.pending = None  # Message to show once the current pass ends.
+        self.index = 0       # Character of text being streamed in,
+        self.column = 0      # and the column of its advance.
+        self.blank = self.gap  # Blank columns still to stream before the text.
+        self.glyph = None
+        self.scroll()
+
+    def set_text(self, text):
+        """Show text from the next pass on; the current pass scrolls on undisturbed."""
+        self.pending = text
+
+    def scroll(self):
+        # The right TileGrid shows columns 0..newest ending at the right edge,
+        # the left one shows the older columns newest+1..width-1 before them.
+        self.right.x = self.width - 1 - self.newest
+        self.left.x = self.right.x - self.width
+
+    def next_column(self, column):
+        """Stream the next column of the message into bitmap column column."""
+        bitmaptools.fill_region(self.bitmap, column, 0, column + 1, self.height, 0)
+        if self.blank:
+            self.blank -= 1
+            return
+        wrapped = False
+        while self.glyph is None:
+            if self.index >= len(self.text):
+                # End of a pass: take up a pending text, then leave a gap.
+                self.index = 0
+                if self.pending is not None:
+                    self.text = self.pending
+                    self.pending = None
+                # A second end of pass here means the font has no glyph for
+                # any character: leave the column blank rather than loop.
+                if self.gap or not self.text or wrapped:
+                    self.blank = max(0, self.gap - 1)  # This column is the gap's first.
+                    return
+                wrapped = True
+            self.glyph = self.font.get_glyph(ord(self.text[self.index]))
+            self.column = 0
+            if self.glyph is None:
+                self.index += 1
+        glyph = self.glyph
+        source = self.column - glyph.dx
+        if 0 <= source < glyph.width:
+            x1 = glyph.tile_index * glyph.width + source
+            top = self.baseline - glyph.height - glyph.dy
+            bitmaptools.blit(
+                self.bitmap, glyph.bitmap, column, top,
+                x1=x1, y1=0, x2=x1 + 1, y2=glyph.height, skip_source_index=0)
+        self.column += 1
+        if self.column >= glyph.shift_x:
+            self.glyph = None
+            self.index += 1
+
+    def step(self, pixels=1):
+        """Scroll the ticker left by pixels."""
+        for _ in range(pixels):
+            self.newest = (self.newest + 1) % self.width
+            self.next_column(self.newest)
+        self.scroll()
@@ -0,0 +1,127 @@
+# Drawing with 24-bit colors on the scenes' indexed bitmaps.
+# Scenes used to pick palette indices by hand: Wanderers gave every particle
+# its own palette entry, Solar hard-coded one per body. A ColorMap hands out
+# palette indices for 0xRRGGBB colors instead, filling the palette as new
+# colors turn up.
+# Lookups go through a 15-bit RGB table: the top 5 bits of each channel
+# select one of 32768 entries (32 KB) holding the palette index for that
+# color, or 0 for none yet. The panel shows at most 5 bits of red and blue
+# (6 of green), so colors that share a table entry look the same or all but
+# the same, and sharing their palette entry saves a slot. A hit is a few shifts
+# and one bytearray read, with no float math and no allocation.
+# The palette entries themselves are an LRU of exact colors: each remembers
+# the 24-bit color it was given and the frame it was last used in. When a
+# new color arrives and the palette is full, the least recently used entry
+# not used in the current frame is evicted and given the new color. When
+# every entry is in use this frame, the color is remapped to the nearest one
+# already in the palette, and its table entry points there until that entry
+# is evicted, so the search is not repeated for every pixel. Since an
+# evicted entry changes color wherever it is still drawn, a scene with more
+# colors than palette entries must look up every color it shows each frame
+# and call next_frame() between frames; a scene with enough entries never
+# evicts and can look colors up once.
+
+from array import array
+
+
+class ColorMap:
+    def __init__(self, palette, first=1):
+        """
+        Map colors to entries first to len(palette) - 1 of palette. Entries
+        below first (at least the background, 0) are left to the scene.
+        """
+        if not 1 <= first < len(palette) <= 256:
+            raise ValueError("need 1 <= first < len(palette) <= 256")
+        self.palette = palette
+        self.first = first
+        self.table = bytearray(32768)  # rgb555 key -> palette index, 0 for none.
+        count = len(palette)
+        self.colors = [None] * count     # Exact color in each entry.
+        self.keys = array("H", [0] * count)
+        self.aliases = {}  # Palette index -> keys of colors remapped to it.
+        self.last_use = array("L", [0] * count)
+        self.next_free = first
+        self.frame = 1
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.remaps = 0
+
+    def next_frame(self):
+        """Start a new frame: entries not used again may be evicted."""
+        self.frame += 1
+
+    def index(self, color):
+        """The palette index to draw color with."""
+        # Top 5 bits of red, green and blue.
+        key = ((color >> 9) & 0x7C00) | ((color >> 6) & 0x3E0) | ((color >> 3) & 0x1F)
+        slot = self.table[key]
+        if slot:
+            self.hits += 1
+            self.last_use[slot] = self.frame
+            return slot
+        self.misses += 1
+        slot = self.next_free
+        if slot < len(self.colors):
+            self.next_free += 1
+        else:
+            slot = self.evict()
+            if slot is None:
+                self.remaps += 1
+                slot = self.nearest(color)
+                self.table[key] = slot
+                self.aliases.setdefault(slot, []).append(key)
+                return slot
+        self.colors[slot] = color
+        self.keys[slot] = key
+        self.last_use[slot] = self.frame
+        self.table[key] = slot
+        self.palette[slot] = color
+        return slot
+
+    def evict(self):
+        """Free the least recently used entry not used this frame; None if there is none."""
+        last_use = self.last_use
+        oldest = None
+        for slot in range(self.first, len(self.colors)):
+            if last_use[slot] < self.frame and (oldest is None or last_use[slot] < last_use[oldest]):
+                oldest = slot
+        if oldest is not None:
+            table = self.table
+            table[self.keys[oldest]] = 0
+            for key in self.aliases.pop(oldest, ()):
+                table[key] = 0
+            self.evictions += 1
+        return oldest
+
+    def nearest(self, color):
+        """The entry whose color is closest to color."""
+        r, g, b = (color >> 16) & 0xFF, (color >> 8) & 0xFF, color & 0xFF
+        best = self.first
+        best_distance = None
+        for slot in range(self.first, len(self.colors)):
+            other = self.colors[slot]
+            dr = ((other >> 16) & 0xFF) - r
+            dg = ((other >> 8) & 0xFF) - g
+            db = (other & 0xFF) - b
+            distance = 2 * dr * dr + 4 * dg * dg + 3 * db * db  # Weighted toward green, as the eye is.
+            if best_distance is None or distance < best_distance:
+                best = slot
+                best_distance = distance
+        self.last_use[best] = self.frame
+        return best
+
+
+class Canvas:
+    def __init__(self, bitmap, colors):
+        """bitmap drawn with 0xRRGGBB colors, mapped to its palette by the ColorMap colors."""
+        self.bitmap = bitmap
+        self.colors = colors
+        self.width = bitmap.width
+        self.height = bitmap.height
+
+    def __setitem__(self, xy, color):
+        self.bitmap[xy] = self.colors.index(color)
+
+    def fill(self, color):
+        self.bitmap.fill(self.colors.index(color))
@@ -0,0 +1,184 @@
+# Warm-start snapshots of scene state.
+# After a brownout or a code reload every scene would start cold: Pong at
+# 0-0, the cube and the line grid at angle 0. A scene with a WarmStart saves a
+# compact binary snapshot of its state now and then, and restores it when it
+# starts, so it picks up where it was. (The fire needs none: it rebuilds every
+# row from a fresh bottom row each frame, so its first frame is already a
+# steady-state one.)
+# A snapshot goes into microcontroller.nvm when it fits and into a file on
+# the flash otherwise (CIRCUITPY is read-only to code unless boot.py
+# remounts it with storage.remount("/", readonly=False)). Flash wears out
+# after some 10,000 to 100,000 erases, and the scenes' state changes all the
+# time, so writes are kept rare and spread out:
+# - At most one save per interval seconds, three hours by default (about
+#   2,900 a year for a sign running day and night), and none while the
+#   state is unchanged since the last one.
+# - In nvm, each save goes to the next of many slots, aligned to SLOT_ALIGN
+#   bytes, wrapping around at the end, so each byte is written a fraction of
+#   the time: a Pong snapshot rotates through about 100 slots of the 8 KB,
+#   which comes to a few dozen writes a year per byte. The scenes share the
+#   nvm, so a save skips slots that overlap the newest snapshot of any other
+#   scene, and a sign that changes scenes keeps each one's warm start. (On the ESP32-S3,
+#   CircuitPython keeps nvm in ESP-IDF's NVS, which spreads writes as well;
+#   on other boards nvm is a plain flash page.)
+# A snapshot is a header (magic, scene name, save count, payload length,
+# CRC-32 of the payload) followed by the payload. The newest valid snapshot
+# wins. The payload is written before the header, so a write cut short by
+# power loss fails the CRC check and the previous snapshot is used, or the
+# scene starts cold.
+
+import binascii
+import struct
+import time
+
+try:
+    import microcontroller
+    NVM = microcontroller.nvm
+except (ImportError, AttributeError):
+    NVM = None  # Not CircuitPython, or a board without nvm.
+
+MAGIC = b"WS"
+HEADER = "<2s8sIHI"  # Magic, scene name (padded), save count, payload length, CRC-32.
+HEADER_SIZE = struct.calcsize(HEADER)
+INTERVAL = 3 * 60 * 60
+SLOT_ALIGN = 16
+
+
+class WarmStart:
+    def __init__(self, name, interval=INTERVAL, path=None, nvm=NVM, clock=time.monotonic):
+        """
+        Snapshots for the scene called name (up to 8 characters), written at
+        most every interval seconds to nvm, or to the file at path (default
+        /warmstart_<name>.bin) when they do not fit.
+        """
+        self.name = name.encode()[:8]
+        self.interval = interval
+        self.path = path or "/warmstart_%s.bin" % name
+        self.nvm = nvm
+        self.clock = clock
+        # The first save waits a whole interval too, so a board stuck in a
+        # reset loop does not write on every boot.
+        self.last_save = clock()
+        self.last_crc = None
+        self.count = 0      # Save count of the newest snapshot.
+        self.slot = None    # nvm offset of the newest snapshot.
+        self.writes = 0
+        self.skipped = 0  # Due saves that found the state unchanged.
+        self.failed = False  # Set when the flash is read-only; saving stops.
+
+    def scan(self):
+        """Scene name -> (nvm offset, save count, end) of its newest valid snapshot in nvm."""
+        nvm = self.nvm
+        newest = {}
+        if nvm is None:
+            return newest
+        for offset in range(0, len(nvm) - HEADER_SIZE + 1, SLOT_ALIGN):
+            if nvm[offset] != MAGIC[0]:
+                continue
+            start = offset + HEADER_SIZE
+            magic, name, count, length, crc = struct.unpack(HEADER, bytes(nvm[offset:start]))
+            end = start + length
+            if magic != MAGIC or end > len(nvm) or binascii.crc32(bytes(nvm[start:end])) != crc:
+                continue
+            name = name.rstrip(b"\0")
+            if name not in newest or count > newest[name][1]:
+                newest[name] = (offset, count, end)
+        return newest
+
+    def read_file(self):
+        """(save count, payload) of this scene's snapshot file, or None."""
+        try:
+            with open(self.path, "rb") as file:
+                header = file.read(HEADER_SIZE)
+                if len(header) != HEADER_SIZE:
+                    return None
+                magic, name, count, length, crc = struct.unpack(HEADER, header)
+                payload = file.read(length)
+        except OSError:
+            return None
+        if magic != MAGIC or name.rstrip(b"\0") != self.name:
+            return None
+        if len(payload) != length or binascii.crc32(payload) != crc:
+            return None
+        return count, payload
+
+    def load(self):
+        """The newest snapshot saved for this scene, in nvm or its file, or None."""
+        payload = None
+        own = self.scan().get(self.name)
+        if own is not None:
+            self.slot, self.count, end = own
+            payload = bytes(self.nvm[self.slot + HEADER_SIZE:end])
+        stored = self.read_file()
+        if stored is not None and (payload is None or stored[0] > self.count):
+            self.count, payload = stored
+        if payload is not None:
+            self.last_crc = binascii.crc32(payload)
+        return payload
+
+    def next_slot(self, size):
+        """
+        nvm offset for the next snapshot of size bytes: the first slot after
+        this scene's newest that overlaps no other scene's newest, or None if
+        there is none.
+        """
+        snapshots = self.scan()
+        # Carry on from this scene's newest snapshot even if load() was not called.
+        own = snapshots.pop(self.name, None)
+        if own is not None and own[1] >= self.count:
+            self.slot, self.count = own[0], own[1]
+        taken = [(start, end) for start, count, end in snapshots.values()]
+        if self.slot is None:
+            offset = 0
+        else:
+            offset = self.slot + (size + SLOT_ALIGN - 1) // SLOT_ALIGN * SLOT_ALIGN
+        for _ in range(len(self.nvm) // SLOT_ALIGN + 1):
+            if offset + size > len(self.nvm):
+                offset = 0
+            if all(offset + size <= start or end <= offset for start, end in taken):
+                return offset
+            offset += SLOT_ALIGN
+        return None
+
+    def due(self):
+        """True once interval seconds have passed since the last save."""
+        if self.failed:
+            return False
+        return self.clock() - self.last_save >= self.interval
+
+    def save_due(self, state):
+        """Save state(), a scene's snapshot method, if a save is due; True if written."""
+        return self.due() and self.save(state())
+
+    def save(self, payload):
+        """Write payload as this scene's snapshot unless it is unchanged; True if written."""
+        self.last_save = self.clock()
+        crc = binascii.crc32(payload)
+        if crc == self.last_crc:
+            self.skipped += 1
+            return False
+        nvm = self.nvm
+        size = HEADER_SIZE + len(payload)
+        offset = self.next_slot(size) if nvm is not None and size <= len(nvm) else None
+        count = self.count + 1
+        header = struct.pack(HEADER, MAGIC, self.name, count, len(payload), crc)
+        try:
+            if offset is not None:
+                nvm[offset + HEADER_SIZE:offset + size] = payload
+                nvm[offset:offset + HEADER_SIZE] = header
+                self.slot = offset
+            else:
+                with open(self.path, "wb") as file:
+                    file.write(bytes(HEADER_SIZE))
+                    file.write(payload)
+                    file.flush()
+                    file.seek(0)
+                    file.write(header)
+        except OSError as e:
+            print("Warm start snapshots disabled:", e)
+            self.failed = True
+            return False
+        self.last_crc = crc
+        self.count = count
+        self.writes += 1
+        return True